@@ -0,0 +1,60 @@
+import hashlib
+import os
+import pygame
+
+
+class AssetManager:
+    """Loads each image once and converts it to the display format.
+
+    Scaled images are also written to an on-disk cache as raw pixels, keyed by
+    the source file's hash and the target size, so later startups skip decoding
+    and scaling the originals. convert() needs a display mode, so create the
+    manager after pygame.display.set_mode().
+    """
+    def __init__(self, asset_dir="assets", cache_dir=os.path.join(".cache", "assets")):
+        self.asset_dir = asset_dir
+        self.cache_dir = cache_dir
+        self.images = {}
+        self.hashes = {}
+
+    def image(self, name, size=None, alpha=True):
+        """Get an asset image, optionally scaled to size, converted for fast blits"""
+        key = (name, size, alpha)
+        surface = self.images.get(key)
+        if surface is None:
+            if size is None:
+                surface = pygame.image.load(os.path.join(self.asset_dir, name))
+            else:
+                surface = self._load_scaled(name, size, alpha)
+            surface = surface.convert_alpha() if alpha else surface.convert()
+            self.images[key] = surface
+        return surface
+
+    def _source_hash(self, name):
+        digest = self.hashes.get(name)
+        if digest is None:
+            with open(os.path.join(self.asset_dir, name), "rb") as f:
+                digest = hashlib.sha1(f.read()).hexdigest()[:16]
+            self.hashes[name] = digest
+        return digest
+
+    def _load_scaled(self, name, size, alpha):
+        fmt = "RGBA" if alpha else "RGB"
+        cache_path = os.path.join(self.cache_dir, f"{self._source_hash(name)}_{size[0]}x{size[1]}_{fmt}.raw")
+        try:
+            with open(cache_path, "rb") as f:
+                return pygame.image.frombytes(f.read(), size, fmt)
+        except (OSError, ValueError):
+            pass
+
+        surface = pygame.image.load(os.path.join(self.asset_dir, name))
+        surface = pygame.transform.scale(surface, size)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = cache_path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(pygame.image.tobytes(surface, fmt))
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass  # The cache is only an optimisation
+        return surface
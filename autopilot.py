@@ -0,0 +1,320 @@
+from collections import deque
+from heapq import heappop, heappush
+
+from controllers import Controller
+from engine import DIRECTIONS, OPPOSITE
+from game_settings import GameMode
+
+BLOCKED = 1 << 60  # serial for obstacle cells: never free
+EMPTY = -(1 << 60)  # serial for cells nothing has been on
+SEARCH_LIMIT = 4000  # cells a path search expands before giving up (the snake falls back to its tail)
+ROOM_MARGIN = 64  # open cells beyond the snake's length that count as "enough room"
+
+_neighbour_cache = {}
+
+
+def neighbours(cols, rows, wrap):
+    """Per cell, the (direction, cell, wrapped) moves that stay on the board (or wrap around it)"""
+    key = (cols, rows, wrap)
+    table = _neighbour_cache.get(key)
+    if table is None:
+        table = []
+        for cell in range(cols * rows):
+            row, col = divmod(cell, cols)
+            moves = []
+            for direction, (dc, dr) in zip(DIRECTIONS, ((0, -1), (0, 1), (-1, 0), (1, 0))):
+                c, r = col + dc, row + dr
+                wrapped = not (0 <= c < cols and 0 <= r < rows)
+                if wrapped and not wrap:
+                    continue
+                moves.append((direction, (r % rows) * cols + c % cols, wrapped))
+            table.append(moves)
+        _neighbour_cache[key] = table
+    return table
+
+
+class Autopilot(Controller):
+    """Steers the snake with A* searches over the board's cells.
+
+    A planned path to the food (or the open portal) is kept and followed
+    tick by tick; it is only searched again when the target moves, the level
+    changes, the snake is not where the plan expected, or the next cell is
+    unexpectedly taken. The search knows when each body cell frees up, so a
+    planned path stays valid while the snake follows it. A path is only
+    taken if, once the snake has eaten, its new head can still reach its
+    tail (or has room to spare); otherwise the snake follows its own tail
+    (or, failing that, moves towards the most open space) and plans again
+    next tick.
+
+    The cost of a decision doesn't depend on the board's area: body cells are
+    tracked in a per-board array updated by one write per tick, searches head
+    straight for their goal and stop after SEARCH_LIMIT cells, and room is
+    only counted up to the snake's length plus ROOM_MARGIN. prepare() sets up
+    the per-board tables, which does take time proportional to the area.
+    """
+    def __init__(self, rng=None, reaction_time=0.0):
+        super().__init__(rng, reaction_time)
+        self.path = deque()  # planned (direction, cell) moves
+        self.plan_key = None
+        self.expected_head = None
+        self.replans = 0
+        # serial[cell]: when the body last entered the cell, counted in head moves. The
+        # segment that entered at serial s frees its cell in s + len(body) - head_serial moves.
+        self.board_key = None
+        self.table = None
+        self.serial = None
+        self.head_serial = 0
+        self.obstacle_key = None
+        self.obstacle_cells = []
+        self.last_head = None
+        self.last_length = 0
+
+    def reset(self):
+        self.path.clear()
+        self.plan_key = None
+        self.expected_head = None
+        self.last_head = None
+
+    def prepare(self, engine):
+        """Build the neighbour table and body array for the engine's board (if not built already)"""
+        size = engine.snake_size
+        cols, rows = engine.width // size, engine.height // size
+        key = (cols, rows, engine.gamemode != GameMode.MODERN)
+        if key != self.board_key:
+            self.board_key = key
+            self.table = neighbours(*key)
+            self.serial = [EMPTY] * (cols * rows)
+            self.obstacle_key = None
+            self.obstacle_cells = []
+            self.last_head = None
+
+    def _sync(self, engine, cols):
+        """Bring serial up to date with the snake's body and the level's obstacles"""
+        self.prepare(engine)
+        serial = self.serial
+        level_manager = engine.level_manager
+        obstacle_key = (id(level_manager), level_manager.current_level) if level_manager else None
+        if obstacle_key != self.obstacle_key:
+            for cell in self.obstacle_cells:
+                serial[cell] = EMPTY
+            self.obstacle_cells = list(level_manager.cell_obstacles) if level_manager else []
+            for cell in self.obstacle_cells:
+                serial[cell] = BLOCKED
+            self.obstacle_key = obstacle_key
+            self.last_head = None
+
+        body = engine.snake.body
+        size = engine.snake_size
+        width, height = engine.width, engine.height
+        x, y = body[0]
+        head = (y // size) * cols + x // size if 0 <= x < width and 0 <= y < height else None
+        length = len(body)
+        if (self.last_head is not None and head is not None and length > 1
+                and length - self.last_length in (0, 1)
+                and (body[1][1] // size) * cols + body[1][0] // size == self.last_head):
+            # One move since the last call: only the new head cell changes (a cell the tail
+            # left is free by the arithmetic above)
+            self.head_serial += 1
+            serial[head] = self.head_serial
+        else:
+            # Start again: a jump of a whole board's worth of serials frees every old body cell
+            self.head_serial += len(serial) + length
+            top = self.head_serial
+            for k in range(length - 1, -1, -1):
+                x, y = body[k]
+                if 0 <= x < width and 0 <= y < height:
+                    serial[(y // size) * cols + x // size] = top - k
+        self.last_head = head
+        self.last_length = length
+
+    def choose(self, engine):
+        if engine.world:
+            raise ValueError("the autopilot searches a bounded board; ENDLESS games have none")
+        snake = engine.snake
+        body = snake.body
+        size = engine.snake_size
+        cols = engine.width // size
+        self._sync(engine, cols)
+        head = (snake.pos[1] // size) * cols + snake.pos[0] // size
+        level_manager = engine.level_manager
+        portal = level_manager.portal if level_manager else None
+        key = (tuple(engine.food.pos), portal.rect.topleft if portal else None,
+               id(level_manager), level_manager.current_level if level_manager else None)
+
+        if self.path and key == self.plan_key and head == self.expected_head:
+            direction, cell = self.path[0]
+            row, col = divmod(cell, cols)
+            occupied = body.count(col * size, row * size)
+            tail = body[-1]
+            # The tail cell frees up this tick as long as the snake isn't growing
+            if not occupied or (occupied == 1 and tail == [col * size, row * size]):
+                self.path.popleft()
+                self.expected_head = cell
+                return direction
+
+        self.path.clear()
+        self.plan_key = key
+        self.replans += 1
+        direction, path = self._plan(engine, head, cols)
+        if path:
+            self.path.extend(path)
+            direction, cell = self.path.popleft()
+            self.expected_head = cell
+        else:
+            self.plan_key = None  # fallback move only; plan again next tick
+        return direction
+
+    def _plan(self, engine, head, cols):
+        """(next direction, full path or None)"""
+        snake = engine.snake
+        size = engine.snake_size
+        rows = engine.height // size
+        wrap = self.board_key[2]
+        table, serial = self.table, self.serial
+        # A cell is taken for free_at = serial + offset more moves (nothing: <= 0)
+        offset = len(snake.body) - self.head_serial
+        segments = [(y // size) * cols + x // size for x, y in snake.body
+                    if 0 <= x < engine.width and 0 <= y < engine.height]
+        room = len(segments) + ROOM_MARGIN
+
+        # Target cells: the food's footprint (eaten only when entered without wrapping) or the portal
+        level_manager = engine.level_manager
+        goals = set()
+        portal = level_manager.portal if level_manager else None
+        if portal:
+            eats_on_wrap = True
+            target = portal.rect
+        else:
+            eats_on_wrap = False
+            target = (engine.food.pos[0], engine.food.pos[1], engine.food_size, engine.food_size)
+        x, y, w, h = target
+        for row in range(y // size, (y + h - 1) // size + 1):
+            for col in range(x // size, (x + w - 1) // size + 1):
+                if 0 <= col < cols and 0 <= row < rows:
+                    goals.add(row * cols + col)
+        grows = not portal
+        goals = {cell for cell in goals if serial[cell] != BLOCKED}
+
+        reverse = OPPOSITE[snake.direction]
+        path = None
+        if goals:
+            path = self._search(table, head, reverse, serial, offset, goals, eats_on_wrap, grows,
+                                _distances_to(goals, cols, rows, wrap))
+        # Entering the portal restarts the snake on the next level, so only food needs the check
+        if path is not None and (portal or self._safe_after(table, segments, path, grows, serial, room)):
+            return path[0][0], path
+        # Too risky (or unreachable): chase the tail, which keeps the most room
+        if len(segments) > 1:
+            tail = segments[-1]
+            tail_path = self._search(table, head, reverse, serial, offset, {tail}, True, False,
+                                     _distances_to({tail}, cols, rows, wrap))
+            if tail_path is not None:
+                return tail_path[0][0], None
+        return self._most_room(table, head, reverse, serial, offset, room), None
+
+    @staticmethod
+    def _search(table, start, reverse, serial, offset, goals, eats_on_wrap, grows, distances):
+        """Shortest [(direction, cell)] path from start into goals, or None (also past SEARCH_LIMIT)"""
+        row_distance, col_distance = distances
+        cols = len(col_distance)
+        reached = {start: (0, None, None)}  # cell -> (moves, previous cell, direction)
+        reached_get = reached.get
+        goal_parent = {}  # goal cell -> (moves, cell, direction) of the shortest entry that eats it
+        heap = [(row_distance[start // cols] + col_distance[start % cols], 0, start, False)]
+        push = heappush
+        first_moves = [move for move in table[start] if move[0] != reverse]
+        expanded = 0
+        while heap:
+            _, neg_g, cell, is_goal = heappop(heap)
+            g = -neg_g
+            if is_goal:
+                moves, prev, move = goal_parent[cell]
+                if g > moves:
+                    continue
+                path = [(move, cell)]
+                while prev != start:
+                    _, before, move = reached[prev]
+                    path.append((move, prev))
+                    prev = before
+                path.reverse()
+                return path
+            if g > reached[cell][0]:
+                continue  # a shorter way here was found after this entry was queued
+            expanded += 1
+            if expanded > SEARCH_LIMIT:
+                return None
+            step = g + 1
+            limit = step - offset
+            for direction, nxt, wrapped in (table[cell] if cell != start else first_moves):
+                if nxt in goals and (eats_on_wrap or not wrapped):
+                    # Eating doesn't drop the tail, so a goal cell must be free a move earlier
+                    if serial[nxt] <= limit - grows and step < goal_parent.get(nxt, (step + 1,))[0]:
+                        goal_parent[nxt] = (step, cell, direction)
+                        push(heap, (step, -step, nxt, True))
+                    continue
+                if serial[nxt] > limit or step >= reached_get(nxt, (step + 1,))[0]:
+                    continue
+                reached[nxt] = (step, cell, direction)
+                push(heap, (step + row_distance[nxt // cols] + col_distance[nxt % cols], -step, nxt, False))
+        return None
+
+    @staticmethod
+    def _safe_after(table, segments, path, grows, serial, room):
+        """Whether, after following path, the new head can still reach the new tail or has room cells open"""
+        length = len(segments) + (1 if grows else 0)
+        new_body = [cell for _, cell in reversed(path)] + segments
+        new_body = new_body[:length]
+        if len(new_body) < 2:
+            return True
+        tail = new_body[-1]
+        blocked = set(new_body[:-1])
+        seen = {new_body[0]}
+        frontier = [new_body[0]]
+        while frontier:
+            next_frontier = []
+            for cell in frontier:
+                for _, nxt, _ in table[cell]:
+                    if nxt == tail:
+                        return True
+                    if nxt in seen or nxt in blocked or serial[nxt] == BLOCKED:
+                        continue
+                    seen.add(nxt)
+                    next_frontier.append(nxt)
+            if len(seen) > room:
+                return True
+            frontier = next_frontier
+        return False
+
+    @staticmethod
+    def _most_room(table, head, reverse, serial, offset, room):
+        """The first move whose reachable area (counted up to room) is largest (None: nothing is safe)"""
+        best, best_room = None, -1
+        for direction, start, _ in table[head]:
+            if direction == reverse or serial[start] + offset > 1:
+                continue
+            seen = {start}
+            frontier = [start]
+            while frontier and len(seen) < room:
+                next_frontier = []
+                for cell in frontier:
+                    for _, nxt, _ in table[cell]:
+                        if nxt not in seen and serial[nxt] + offset <= 0:
+                            seen.add(nxt)
+                            next_frontier.append(nxt)
+                frontier = next_frontier
+            if len(seen) > best_room:
+                best, best_room = direction, len(seen)
+        return best
+
+
+def _distances_to(goals, cols, rows, wrap):
+    """A* heuristic tables: moves from each row and each column to the goals' bounding box,
+    ignoring everything in the way (a cell's estimate is its row's plus its column's)"""
+    goal_rows = [cell // cols for cell in goals]
+    goal_cols = [cell % cols for cell in goals]
+
+    def axis(count, low, high):
+        if wrap:
+            return [0 if low <= i <= high else min((low - i) % count, (i - high) % count) for i in range(count)]
+        return [low - i if i < low else i - high if i > high else 0 for i in range(count)]
+    return axis(rows, min(goal_rows), max(goal_rows)), axis(cols, min(goal_cols), max(goal_cols))
@@ -0,0 +1,286 @@
+# Vectorized simulator for running many games at once (balancing, bots).
+# Needs NumPy; the game itself does not.
+import numpy as np
+import pygame
+
+from engine import BOARD_WIDTH, BOARD_HEIGHT, SNAKE_SIZE, FOOD_SIZE, START_POS, DIRECTIONS
+from food import Food
+from game_settings import GameMode
+from obstacles import LevelManager
+
+# Direction codes follow engine.DIRECTIONS: UP, DOWN, LEFT, RIGHT
+NO_ACTION = -1
+ROW_STEP = np.array([-1, 1, 0, 0], dtype=np.int32)
+COL_STEP = np.array([0, 0, -1, 1], dtype=np.int32)
+OPPOSITE_CODE = np.array([1, 0, 3, 2], dtype=np.int8)
+
+# death_cause codes; 0 means still running
+CAUSES = (None, "self", "wall", "obstacle", "campaign_complete", "board_full")
+SELF, WALL, OBSTACLE, CAMPAIGN_COMPLETE, BOARD_FULL = range(1, 6)
+
+
+class BatchEngine:
+    """N independent games of one mode stepped together with NumPy.
+
+    Each game keeps an occupancy count per cell, a ring buffer of body cells
+    (head first), its food slot and, in CAMPAIGN, its level and portal. The
+    obstacle layouts are compiled once from LevelManager into per-level cell
+    and food-slot masks. step() applies GameEngine.step's rules to every
+    running game in the same order: turn, move, eat or drop the tail, wall
+    death or wrap, respawn food, obstacle/portal, self collision.
+
+    Random choices (food and portal placement) use the same distributions as
+    GameEngine but a NumPy generator, so a batch game is not a replay of an
+    engine game with the same seed.
+    """
+    def __init__(self, n, gamemode=GameMode.CLASSIC, width=BOARD_WIDTH, height=BOARD_HEIGHT,
+                 snake_size=SNAKE_SIZE, food_size=FOOD_SIZE, seed=None):
+        if gamemode == GameMode.ENDLESS:
+            raise ValueError("the batch engine only runs bounded boards, not ENDLESS")
+        if width % snake_size or height % snake_size or food_size % snake_size \
+                or START_POS[0] % snake_size or START_POS[1] % snake_size:
+            raise ValueError("board, food and start position must line up with the snake's cells")
+        self.n = n
+        self.gamemode = gamemode
+        self.snake_size = snake_size
+        self.cols = width // snake_size
+        self.rows = height // snake_size
+        self.cells = self.cols * self.rows
+        self.capacity = self.cells + 1
+        self.food_cells = food_size // snake_size  # food footprint is food_cells x food_cells
+        self.slot_cols = (width - food_size) // snake_size
+        self.slot_rows = (height - food_size) // snake_size
+        self.start_row = START_POS[1] // snake_size
+        self.start_col = START_POS[0] // snake_size
+        self.rng = np.random.default_rng(seed)
+        self._compile_levels(width, height, snake_size, food_size)
+
+        self.occupancy = np.zeros((n, self.cells), dtype=np.uint8)
+        self.body = np.zeros((n, self.capacity), dtype=np.int32)  # ring buffers of cell indices
+        self.head_slot = np.zeros(n, dtype=np.int32)
+        self.length = np.zeros(n, dtype=np.int32)
+        self.head_row = np.zeros(n, dtype=np.int32)
+        self.head_col = np.zeros(n, dtype=np.int32)
+        self.direction = np.zeros(n, dtype=np.int8)
+        self.food_row = np.zeros(n, dtype=np.int32)
+        self.food_col = np.zeros(n, dtype=np.int32)
+        self.level = np.zeros(n, dtype=np.int32)  # 0 outside CAMPAIGN
+        self.food_eaten_this_level = np.zeros(n, dtype=np.int32)
+        self.portal_active = np.zeros(n, dtype=bool)
+        self.portal_row = np.zeros(n, dtype=np.int32)
+        self.portal_col = np.zeros(n, dtype=np.int32)
+        self.score = np.zeros(n, dtype=np.int32)
+        self.tick = np.zeros(n, dtype=np.int32)
+        self.game_over = np.zeros(n, dtype=bool)
+        self.won = np.zeros(n, dtype=bool)
+        self.death_cause = np.zeros(n, dtype=np.int8)
+        # Per-step events, like GameState's
+        self.ate_food = np.zeros(n, dtype=bool)
+        self.level_advanced = np.zeros(n, dtype=bool)
+        self.reset()
+
+    def _compile_levels(self, width, height, snake_size, food_size):
+        """Per-level obstacle cell masks, blocked food slots and portal slots (index 0: no obstacles)"""
+        levels = [None]
+        self.food_required_for_portal = None
+        if self.gamemode == GameMode.CAMPAIGN:
+            manager = LevelManager(width, height, snake_size)
+            levels += range(1, manager.max_levels + 1)
+            self.food_required_for_portal = manager.food_required_for_portal
+        self.max_level = len(levels) - 1
+        self.obstacle_cells = np.zeros((len(levels), self.cells), dtype=bool)
+        self.obstacle_slots = np.zeros((len(levels), self.slot_rows, self.slot_cols), dtype=bool)
+        self.portal_slots = [np.zeros((0, 2), dtype=np.int32)]
+        for level in levels[1:]:
+            manager.start_level(level)
+            # A head cell hits an obstacle exactly when LevelManager says its rect does
+            for row in range(self.rows):
+                for col in range(self.cols):
+                    rect = pygame.Rect(col * snake_size, row * snake_size, snake_size, snake_size)
+                    self.obstacle_cells[level, row * self.cols + col] = manager.check_obstacle_collision(rect)
+            # Food slots an obstacle overlaps, as the engine's Food index blocks them
+            food = Food(width, height, snake_size, food_size, None)
+            for obs in manager.obstacles:
+                food.block(obs.rect.x, obs.rect.y, obs.rect.width, obs.rect.height)
+            self.obstacle_slots[level] = np.array(food.blocked).reshape(self.slot_rows, self.slot_cols) > 0
+            self.portal_slots.append(np.array([(y // snake_size, x // snake_size) for x, y in manager.portal_slots],
+                                              dtype=np.int32).reshape(-1, 2))
+
+    def reset(self, games=None):
+        """Start new games (all of them, or the given indices / boolean mask)"""
+        if games is None:
+            games = np.arange(self.n)
+        else:
+            games = np.asarray(games)
+            if games.dtype == bool:
+                games = np.flatnonzero(games)
+        if not len(games):
+            return
+        self.occupancy[games] = 0
+        self.head_slot[games] = 0
+        self.length[games] = 0
+        self.level[games] = 1 if self.gamemode == GameMode.CAMPAIGN else 0
+        self.food_eaten_this_level[games] = 0
+        self.portal_active[games] = False
+        self.score[games] = 0
+        self.tick[games] = 0
+        self.game_over[games] = False
+        self.won[games] = False
+        self.death_cause[games] = 0
+        self.ate_food[games] = False
+        self.level_advanced[games] = False
+        # Three segments ending at the start cell, heading right
+        for i in (2, 1, 0):
+            self._push_head(games, np.full(len(games), self.start_row), np.full(len(games), self.start_col - i))
+        self.direction[games] = DIRECTIONS.index("RIGHT")
+        full = self._respawn_food(games)
+        self._end(games[full], BOARD_FULL, won=True)
+
+    def _push_head(self, games, rows, cols):
+        cells = rows * self.cols + cols
+        self.head_slot[games] = (self.head_slot[games] - 1) % self.capacity
+        self.body[games, self.head_slot[games]] = cells
+        self.length[games] += 1
+        self.occupancy[games, cells] += 1
+        self.head_row[games] = rows
+        self.head_col[games] = cols
+
+    def _pop_tail(self, games):
+        slots = (self.head_slot[games] + self.length[games] - 1) % self.capacity
+        self.occupancy[games, self.body[games, slots]] -= 1
+        self.length[games] -= 1
+
+    def _free_slots(self, games):
+        """Boolean (len(games), slot_rows, slot_cols): food slots no segment or obstacle overlaps"""
+        grid = self.occupancy[games].reshape(-1, self.rows, self.cols)
+        k, sr, sc = self.food_cells, self.slot_rows, self.slot_cols
+        covered = np.zeros((len(games), sr, sc), dtype=np.int32)
+        for dr in range(k):
+            for dc in range(k):
+                covered += grid[:, dr:dr + sr, dc:dc + sc]
+        return (covered == 0) & ~self.obstacle_slots[self.level[games]]
+
+    def _respawn_food(self, games):
+        """Move the food to a random free slot; returns a mask of games with none left"""
+        if not len(games):
+            return np.zeros(0, dtype=bool)
+        free = self._free_slots(games).reshape(len(games), -1)
+        counts = free.sum(axis=1)
+        full = counts == 0
+        # Uniform pick: the k-th free slot for k in [0, count)
+        picks = (self.rng.random(len(games)) * counts).astype(np.int64)
+        slots = np.argmax(np.cumsum(free, axis=1) > picks[:, None], axis=1)
+        placed = games[~full]
+        self.food_row[placed] = slots[~full] // self.slot_cols
+        self.food_col[placed] = slots[~full] % self.slot_cols
+        return full
+
+    def _spawn_portals(self, games):
+        for level in np.unique(self.level[games]):
+            slots = self.portal_slots[level]
+            at_level = games[self.level[games] == level]
+            if not len(slots):
+                continue
+            picks = slots[self.rng.integers(len(slots), size=len(at_level))]
+            self.portal_row[at_level] = picks[:, 0]
+            self.portal_col[at_level] = picks[:, 1]
+            self.portal_active[at_level] = True
+
+    def _end(self, games, cause, won=False):
+        self.game_over[games] = True
+        self.won[games] = won
+        self.death_cause[games] = cause
+
+    def step(self, actions=None):
+        """Advance every running game by one tick.
+
+        actions holds a direction code per game (an index into
+        engine.DIRECTIONS) or NO_ACTION to keep going straight; None means no
+        game turns. Finished games are left as they are until reset().
+        """
+        self.ate_food[:] = False
+        self.level_advanced[:] = False
+        games = np.flatnonzero(~self.game_over)
+        if not len(games):
+            return self.game_over
+
+        # Turn, ignoring reversals onto the neck
+        direction = self.direction[games]
+        if actions is not None:
+            action = np.asarray(actions, dtype=np.int8)[games]
+            turn = (action != NO_ACTION) & (action != OPPOSITE_CODE[direction])
+            direction = np.where(turn, action, direction).astype(np.int8)
+            self.direction[games] = direction
+        self.tick[games] += 1
+
+        rows = self.head_row[games] + ROW_STEP[direction]
+        cols = self.head_col[games] + COL_STEP[direction]
+
+        # Food is checked before wrapping, like the engine
+        on_board = (rows >= 0) & (rows < self.rows) & (cols >= 0) & (cols < self.cols)
+        food_row, food_col = self.food_row[games], self.food_col[games]
+        ate = (on_board & (rows >= food_row) & (rows < food_row + self.food_cells)
+               & (cols >= food_col) & (cols < food_col + self.food_cells))
+        self.score[games[ate]] += 1
+        self.ate_food[games[ate]] = True
+        self._pop_tail(games[~ate])
+        if self.gamemode == GameMode.CAMPAIGN:
+            eaters = games[ate]
+            self.food_eaten_this_level[eaters] += 1
+            due = self.food_eaten_this_level[eaters] >= self.food_required_for_portal
+            self._spawn_portals(eaters[due & ~self.portal_active[eaters]])
+
+        if self.gamemode == GameMode.MODERN:
+            self._end(games[~on_board], WALL)
+            games, rows, cols, ate = games[on_board], rows[on_board], cols[on_board], ate[on_board]
+        else:
+            rows %= self.rows
+            cols %= self.cols
+        self._push_head(games, rows, cols)
+
+        # Respawn eaten food; a full board ends the game before any other check
+        eaters = games[ate]
+        full = self._respawn_food(eaters)
+        self._end(eaters[full], BOARD_FULL, won=True)
+        keep = ~np.isin(games, eaters[full])
+        games, rows, cols = games[keep], rows[keep], cols[keep]
+
+        if self.gamemode == GameMode.CAMPAIGN:
+            level = self.level[games]
+            hit = self.obstacle_cells[level, rows * self.cols + cols]
+            self._end(games[hit], OBSTACLE)
+            portal_row, portal_col = self.portal_row[games], self.portal_col[games]
+            entered = (~hit & self.portal_active[games]
+                       & (rows >= portal_row) & (rows < portal_row + 2)
+                       & (cols >= portal_col) & (cols < portal_col + 2))
+            self._end(games[entered & (level >= self.max_level)], CAMPAIGN_COMPLETE, won=True)
+            advancing = games[entered & (level < self.max_level)]
+            if len(advancing):
+                self.level[advancing] += 1
+                self.food_eaten_this_level[advancing] = 0
+                self.portal_active[advancing] = False
+                self.occupancy[advancing] = 0
+                self.length[advancing] = 0
+                self._push_head(advancing, np.full(len(advancing), self.start_row),
+                                np.full(len(advancing), self.start_col))
+                self.direction[advancing] = DIRECTIONS.index("RIGHT")
+                self.level_advanced[advancing] = True
+                # Food left under one of the new level's walls could never be eaten
+                free = self._free_slots(advancing)
+                self._respawn_food(advancing[~free[np.arange(len(advancing)), self.food_row[advancing],
+                                                   self.food_col[advancing]]])
+            keep = ~(hit | entered)
+            games, rows, cols = games[keep], rows[keep], cols[keep]
+
+        self._end(games[self.occupancy[games, rows * self.cols + cols] > 1], SELF)
+        return self.game_over
+
+    def body_cells(self, game):
+        """(row, col) of each segment of one game, head first"""
+        slots = (self.head_slot[game] + np.arange(self.length[game])) % self.capacity
+        cells = self.body[game, slots]
+        return list(zip((cells // self.cols).tolist(), (cells % self.cols).tolist()))
+
+    def causes(self):
+        """death_cause of every game as the engine's strings (None while running)"""
+        return [CAUSES[code] for code in self.death_cause]
@@ -0,0 +1,170 @@
+"""Play many headless games in parallel and summarise how they went.
+
+    python batch_runner.py --games 200 --controller greedy --reaction-time 0.15
+
+Every (game mode, difficulty, campaign level) combination gets --games
+games, split into chunks that run on a process pool. Each finished game is
+appended to the results file as one JSON line as soon as its chunk returns,
+and per-combination distributions are printed (and saved next to the
+results) at the end. Game seeds are derived from --seed and the game's
+position in the sweep, so a run is reproducible whatever the worker count.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from controllers import make_controller
+from engine import GameEngine
+from game_settings import Difficulty, GameMode
+
+CHUNK_SIZE = 25  # games per pool task
+
+
+def game_seed(base_seed, gamemode, difficulty, level, index):
+    return random.Random(f"{base_seed}:{gamemode.name}:{difficulty.name}:{level}:{index}").getrandbits(32)
+
+
+def play_game(gamemode, difficulty, level, seed, controller_spec, reaction_time, max_ticks):
+    """Play one game to the end (or max_ticks) and describe the result"""
+    engine = GameEngine(difficulty, gamemode, seed=seed)
+    if level is not None:
+        engine.reset(level=level, seed=seed)
+    controller = make_controller(controller_spec, random.Random(seed ^ 0x5EED), reaction_time)
+    state = engine.state
+    while not state.game_over and state.tick < max_ticks:
+        state = engine.step(controller.act(engine))
+    return {
+        "gamemode": gamemode.name,
+        "difficulty": difficulty.name,
+        "start_level": level,
+        "seed": seed,
+        "score": state.score,
+        "ticks": state.tick,
+        "seconds": round(state.tick / engine.tick_rate, 2),
+        "death_cause": state.death_cause if state.game_over else "timeout",
+        "won": state.won,
+        "level_reached": engine.level_manager.current_level if engine.level_manager else None,
+    }
+
+
+def play_chunk(games, controller_spec, reaction_time, max_ticks):
+    """Pool task: play a list of (gamemode, difficulty, level, seed) games"""
+    return [play_game(gamemode, difficulty, level, seed, controller_spec, reaction_time, max_ticks)
+            for gamemode, difficulty, level, seed in games]
+
+
+def build_sweep(gamemodes, difficulties, levels, games_per_config, base_seed):
+    """Every game to play, grouped in CHUNK_SIZE chunks"""
+    chunks = []
+    for gamemode in gamemodes:
+        for difficulty in difficulties:
+            for level in (levels if gamemode == GameMode.CAMPAIGN else [None]):
+                games = [(gamemode, difficulty, level, game_seed(base_seed, gamemode, difficulty, level, i))
+                         for i in range(games_per_config)]
+                chunks += [games[i:i + CHUNK_SIZE] for i in range(0, len(games), CHUNK_SIZE)]
+    return chunks
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def summarise(results):
+    """Score/survival distributions per (mode, difficulty, start level)"""
+    groups = {}
+    for result in results:
+        key = (result["gamemode"], result["difficulty"], result["start_level"])
+        groups.setdefault(key, []).append(result)
+    summary = []
+    for (gamemode, difficulty, level), games in sorted(groups.items(), key=lambda item: str(item[0])):
+        scores = [g["score"] for g in games]
+        ticks = [g["ticks"] for g in games]
+        summary.append({
+            "gamemode": gamemode,
+            "difficulty": difficulty,
+            "start_level": level,
+            "games": len(games),
+            "score_mean": round(statistics.fmean(scores), 2),
+            "score_p10": percentile(scores, 0.1),
+            "score_median": statistics.median(scores),
+            "score_p90": percentile(scores, 0.9),
+            "score_max": max(scores),
+            "ticks_mean": round(statistics.fmean(ticks), 1),
+            "seconds_mean": round(statistics.fmean(g["seconds"] for g in games), 2),
+            "win_rate": round(sum(g["won"] for g in games) / len(games), 3),
+            "death_causes": dict(Counter(g["death_cause"] for g in games)),
+            "levels_reached": dict(Counter(g["level_reached"] for g in games)) if level is not None else None,
+        })
+    return summary
+
+
+def print_summary(summary):
+    print(f"{'mode':<9}{'difficulty':<10}{'lvl':>4}{'games':>7}{'mean':>8}{'p10':>6}{'med':>7}{'p90':>6}"
+          f"{'max':>6}{'secs':>8}  deaths")
+    for row in summary:
+        deaths = ", ".join(f"{cause} {count}" for cause, count in sorted(row["death_causes"].items()))
+        level = row["start_level"] if row["start_level"] is not None else "-"
+        print(f"{row['gamemode']:<9}{row['difficulty']:<10}{level:>4}{row['games']:>7}{row['score_mean']:>8}"
+              f"{row['score_p10']:>6}{row['score_median']:>7}{row['score_p90']:>6}{row['score_max']:>6}"
+              f"{row['seconds_mean']:>8}  {deaths}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Play headless snake games in parallel and summarise them")
+    parser.add_argument("--games", type=int, default=100, help="games per mode/difficulty/level combination")
+    # ENDLESS games only end in a crash (or at --max-ticks), so they are opt-in
+    parser.add_argument("--modes", nargs="+", default=[m.name for m in GameMode if m != GameMode.ENDLESS],
+                        choices=[m.name for m in GameMode])
+    parser.add_argument("--difficulties", nargs="+", default=[d.name for d in Difficulty],
+                        choices=[d.name for d in Difficulty])
+    parser.add_argument("--levels", nargs="+", type=int, default=[1, 2, 3, 4, 5],
+                        help="campaign levels to start from")
+    parser.add_argument("--controller", default="greedy", help="registered controller name or module:Class")
+    parser.add_argument("--reaction-time", type=float, default=0.0,
+                        help="seconds the controller needs between turns")
+    parser.add_argument("--max-ticks", type=int, default=20000, help="stop a game after this many ticks")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="base seed for the whole sweep")
+    parser.add_argument("--out", default=os.path.join("results", "batch.jsonl"), help="per-game results (JSON lines)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    chunks = build_sweep([GameMode[m] for m in args.modes], [Difficulty[d] for d in args.difficulties],
+                         args.levels, args.games, args.seed)
+    total = sum(len(chunk) for chunk in chunks)
+    if os.path.dirname(args.out):
+        os.makedirs(os.path.dirname(args.out), exist_ok=True)
+
+    results = []
+    start = time.perf_counter()
+    with open(args.out, "w") as out, ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(play_chunk, chunk, args.controller, args.reaction_time, args.max_ticks)
+                   for chunk in chunks]
+        for future in as_completed(futures):
+            for result in future.result():
+                out.write(json.dumps(result) + "\n")
+                results.append(result)
+            out.flush()
+            print(f"\r{len(results)}/{total} games", end="", file=sys.stderr, flush=True)
+    elapsed = time.perf_counter() - start
+    ticks = sum(r["ticks"] for r in results)
+    print(f"\r{total} games, {ticks} ticks in {elapsed:.1f}s ({ticks / elapsed:.0f} ticks/s, "
+          f"{args.workers} workers)", file=sys.stderr)
+
+    summary = summarise(results)
+    with open(os.path.splitext(args.out)[0] + ".summary.json", "w") as f:
+        json.dump(summary, f, indent=2)
+    print_summary(summary)
+
+
+if __name__ == "__main__":
+    main()
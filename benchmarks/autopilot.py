@@ -0,0 +1,73 @@
+"""Autopilot decision cost against snake length.
+
+    python -m benchmarks.autopilot [--board 400x600] [--lengths 3 50 200] [--ticks 2000]
+
+For each length the snake is laid out as a zigzag from the top-left corner
+and the autopilot plays --ticks ticks from there (re-laying the snake if the
+game ends). Only the time spent in Autopilot.act() is counted.
+"""
+import argparse
+import time
+
+from autopilot import Autopilot
+from engine import GameEngine
+from game_settings import Difficulty, GameMode
+
+TICK_BUDGET_MS = 1000 / Difficulty.LEVEL_8.value
+
+
+def lay_out_snake(engine, length, cells=None):
+    """Replace the snake with one of the given length, zigzagging along the top rows
+
+    cells, if given, is the path to lay it on instead (tail first, adjacent cells).
+    """
+    size = engine.snake_size
+    cols = engine.width // size
+    if cells is None:
+        cells = []
+        for i in range(length):
+            row, col = divmod(i, cols)
+            cells.append(((col if row % 2 == 0 else cols - 1 - col) * size, row * size))
+    engine.set_body(cells[length - 1::-1])
+
+
+def bench_length(width, height, gamemode, length, ticks, seed):
+    engine = GameEngine(Difficulty.LEVEL_8, gamemode, width, height, seed=seed)
+    lay_out_snake(engine, length)
+    autopilot = Autopilot()
+    autopilot.prepare(engine)  # per-board tables, built once rather than inside the first timed decision
+    elapsed = worst = 0.0
+    for _ in range(ticks):
+        if engine.state.game_over:
+            engine.reset(seed=engine.seed + 1)
+            lay_out_snake(engine, length)
+            autopilot.reset()
+        start = time.perf_counter()
+        action = autopilot.act(engine)
+        spent = time.perf_counter() - start
+        elapsed += spent
+        worst = max(worst, spent)
+        engine.step(action)
+    return ticks / elapsed, elapsed / ticks * 1e6, worst * 1e3, autopilot.replans / ticks
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--board", default="400x600", help="board size in pixels, WIDTHxHEIGHT")
+    parser.add_argument("--mode", default="CLASSIC", choices=[m.name for m in GameMode if m != GameMode.ENDLESS])
+    parser.add_argument("--lengths", nargs="+", type=int, default=[3, 25, 50, 100, 200, 400])
+    parser.add_argument("--ticks", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    width, height = (int(v) for v in args.board.lower().split("x"))
+
+    print(f"board {width}x{height} {args.mode}, tick budget at LEVEL_8: {TICK_BUDGET_MS:.0f} ms")
+    print(f"{'length':>7}{'decisions/s':>13}{'mean us':>10}{'worst ms':>10}{'replans':>9}")
+    for length in args.lengths:
+        rate, mean_us, worst_ms, replans = bench_length(width, height, GameMode[args.mode], length,
+                                                        args.ticks, args.seed)
+        print(f"{length:>7}{rate:>13.0f}{mean_us:>10.1f}{worst_ms:>10.2f}{replans:>9.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Worst-case load test: let the Hamiltonian controller fill the board.
+
+    python -m benchmarks.fill_board [--mode CLASSIC] [--board 400x600] [--seed 0]
+
+Reports engine.step() cost (body update, collisions, food respawn) per
+snake-length bucket as the snake grows to fill the board, with the
+controller's time counted separately.
+"""
+import argparse
+import time
+
+from engine import GameEngine
+from game_settings import Difficulty, GameMode
+from hamiltonian import HamiltonianController
+
+BUCKETS = 8
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--board", default="400x600", help="board size in pixels, WIDTHxHEIGHT")
+    parser.add_argument("--mode", default="CLASSIC", choices=[m.name for m in GameMode if m != GameMode.ENDLESS])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-ticks", type=int, default=2_000_000)
+    args = parser.parse_args(argv)
+    width, height = (int(v) for v in args.board.lower().split("x"))
+
+    engine = GameEngine(Difficulty.LEVEL_8, GameMode[args.mode], width, height, seed=args.seed)
+    controller = HamiltonianController()
+    cells = (width // engine.snake_size) * (height // engine.snake_size)
+    bucket_size = -(-cells // BUCKETS)
+    step_time = [0.0] * BUCKETS
+    control_time = [0.0] * BUCKETS
+    ticks = [0] * BUCKETS
+
+    state = engine.state
+    while not state.game_over and state.tick < args.max_ticks:
+        bucket = min(BUCKETS - 1, len(engine.snake.body) // bucket_size)
+        start = time.perf_counter()
+        action = controller.act(engine)
+        chosen = time.perf_counter()
+        state = engine.step(action)
+        control_time[bucket] += chosen - start
+        step_time[bucket] += time.perf_counter() - chosen
+        ticks[bucket] += 1
+
+    print(f"{args.mode} {width}x{height}: {state.death_cause or 'stopped'} at length {len(engine.snake.body)}"
+          f" of {cells} cells, score {state.score}, {state.tick} ticks")
+    print(f"{'length':>12}{'ticks':>9}{'step us':>9}{'control us':>12}")
+    for i in range(BUCKETS):
+        if ticks[i]:
+            lengths = f"{i * bucket_size}-{(i + 1) * bucket_size - 1}"
+            print(f"{lengths:>12}{ticks[i]:>9}{step_time[i] / ticks[i] * 1e6:>9.1f}"
+                  f"{control_time[i] / ticks[i] * 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,429 @@
+"""Micro and macro benchmarks for the game's hot paths.
+
+    python -m benchmarks.suite run [--quick] [--filter food.] [--out results/bench.json]
+    python -m benchmarks.suite compare BASE.json NEW.json [--threshold 0.10]
+
+run times every benchmark (or those whose name contains a --filter string)
+and writes the per-operation times, plus a description of the machine, as
+JSON. Each benchmark repeats a batch of operations sized to take at least
+--min-time seconds; the median of the repeats is the headline number.
+Inputs are fixed (seeded games, laid-out snakes) and drawing goes to the SDL
+dummy video driver, so runs on one machine are comparable.
+
+compare matches benchmarks by name and flags any that got slower than the
+threshold; it exits with status 1 if there is a regression.
+"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # before pygame is imported
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import gc
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import pygame
+
+from benchmarks.autopilot import lay_out_snake
+from controllers import GreedyController
+from engine import GameEngine, START_POS
+from game_settings import Difficulty, GameMode
+from obstacles import LevelManager
+from snake import Snake
+
+SCREEN_WIDTH, SCREEN_HEIGHT, GAME_AREA_HEIGHT = 400, 700, 600
+FONT_PATH = os.path.join("assets", "font.ttf")
+FILL_RATIOS = (0.10, 0.25, 0.50, 0.75, 0.90, 0.95)
+SELF_COLLISION_LENGTHS = (3, 150, 450)
+TICK_GAMES_TICKS = 20_000  # ticks of recorded play replayed by the tick benchmarks
+
+BENCHMARKS = {}  # name -> function(n) returning the seconds n operations took
+
+
+def benchmark(name):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def _loop(op):
+    """Time function for a benchmark whose operation is a plain call"""
+    def run(n):
+        start = time.perf_counter()
+        for _ in range(n):
+            op()
+        return time.perf_counter() - start
+    return run
+
+
+# Simulation
+
+@benchmark("snake.move_shrink")
+def bench_snake_move():
+    snake = Snake(list(START_POS), 20, 20, None, None)
+    # A 5x5 square circuit keeps the snake on the board
+    directions = ["RIGHT"] * 5 + ["DOWN"] * 5 + ["LEFT"] * 5 + ["UP"] * 5
+    state = [0]
+
+    def op():
+        snake.direction = directions[state[0] % 20]
+        state[0] += 1
+        snake.move()
+        snake.shrink_tail()
+    return _loop(op)
+
+
+def _bench_self_collision(length):
+    def setup():
+        engine = GameEngine(Difficulty.LEVEL_3, GameMode.CLASSIC, seed=0)
+        lay_out_snake(engine, length)
+        return _loop(engine.snake.check_self_collision)
+    return setup
+
+
+for _length in SELF_COLLISION_LENGTHS:
+    benchmark(f"snake.check_self_collision[len={_length}]")(_bench_self_collision(_length))
+
+
+def _fill_path(cols, rows, size):
+    """Every cell of the board as one snake path: a zigzag up from the bottom row
+    that covers the top two rows a column at a time. Whatever is left uncovered
+    at the end is then a strip two rows high at the top, so food still fits even
+    on a nearly full board. (Food slots don't reach the last row or column.)"""
+    cells = []
+    for i, row in enumerate(range(rows - 1, 1, -1)):
+        for col in range(cols) if i % 2 == 0 else range(cols - 1, -1, -1):
+            cells.append((col * size, row * size))
+    # The zigzag ended at the left edge if it covered an even number of rows, else at the right
+    columns = range(cols) if (rows - 2) % 2 == 0 else range(cols - 1, -1, -1)
+    for i, col in enumerate(columns):
+        pair = (1, 0) if i % 2 == 0 else (0, 1)
+        cells.extend((col * size, row * size) for row in pair)
+    return cells
+
+
+def _bench_respawn(ratio):
+    def setup():
+        engine = GameEngine(Difficulty.LEVEL_3, GameMode.CLASSIC, seed=0)
+        size = engine.snake_size
+        cols, rows = engine.width // size, engine.height // size
+        lay_out_snake(engine, int(cols * rows * ratio), _fill_path(cols, rows, size))
+        # Time spawns on a board this full, not the board-full early return
+        assert engine.food.free, f"no free food slot at {ratio:.0%}"
+        return _loop(engine.food.respawn)
+    return setup
+
+
+for _ratio in FILL_RATIOS:
+    benchmark(f"food.respawn[fill={_ratio:.0%}]")(_bench_respawn(_ratio))
+
+
+def _bench_obstacle_collision(level):
+    def setup():
+        level_manager = LevelManager(SCREEN_WIDTH, GAME_AREA_HEIGHT, 20, random.Random(0))
+        level_manager.start_level(level)
+        # Every cell of the board in turn, hits and misses alike
+        rects = [pygame.Rect(x, y, 20, 20) for y in range(0, GAME_AREA_HEIGHT, 20) for x in range(0, SCREEN_WIDTH, 20)]
+        check = level_manager.check_obstacle_collision
+        count = len(rects)
+        state = [0]
+
+        def op():
+            check(rects[state[0] % count])
+            state[0] += 1
+        return _loop(op)
+    return setup
+
+
+for _level in range(1, 6):
+    benchmark(f"levels.check_obstacle_collision[level={_level}]")(_bench_obstacle_collision(_level))
+
+
+def record_games(gamemode, ticks, seed=0):
+    """Play seeded games with the greedy controller until `ticks` ticks were played: [(seed, actions)]"""
+    games, played = [], 0
+    while played < ticks:
+        engine = GameEngine(Difficulty.LEVEL_3, gamemode, seed=seed)
+        controller = GreedyController(random.Random(seed))
+        actions = []
+        while not engine.state.game_over and played < ticks:
+            action = controller.act(engine)
+            actions.append(action)
+            engine.step(action)
+            played += 1
+        games.append((seed, actions))
+        seed += 1
+    return games
+
+
+def _bench_tick(gamemode):
+    def setup():
+        games = record_games(gamemode, TICK_GAMES_TICKS)
+        engine = GameEngine(Difficulty.LEVEL_3, gamemode, seed=0)
+
+        def run(n):
+            # Replays the recorded games, restarting from the first when they run out;
+            # engine.reset() is left out of the timing
+            elapsed = 0.0
+            game = 0
+            while n > 0:
+                seed, actions = games[game % len(games)]
+                game += 1
+                engine.reset(seed=seed)
+                actions = actions[:n]
+                step = engine.step
+                start = time.perf_counter()
+                for action in actions:
+                    step(action)
+                elapsed += time.perf_counter() - start
+                n -= len(actions)
+            return elapsed
+        return run
+    return setup
+
+
+for _gamemode in GameMode:
+    benchmark(f"engine.step[{_gamemode.name}]")(_bench_tick(_gamemode))
+
+
+# Drawing (offscreen, SDL dummy driver)
+
+_display = None
+
+
+def display_surface():
+    global _display
+    if _display is None:
+        pygame.init()
+        _display = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    return _display
+
+
+@benchmark("ui.ScoreRenderer.draw")
+def bench_score_renderer():
+    from score import ScoreRenderer
+    surface = display_surface()
+    score_renderer = ScoreRenderer(FONT_PATH)
+    return _loop(lambda: score_renderer.draw(surface, "Score: 42", 27, SCREEN_WIDTH // 2, 300))
+
+
+def _bench_scoreboard(campaign):
+    def setup():
+        from scoreboard import ScoreBoard
+        surface = display_surface()
+        scoreboard = ScoreBoard(0, GAME_AREA_HEIGHT, SCREEN_WIDTH, SCREEN_HEIGHT - GAME_AREA_HEIGHT, FONT_PATH, 25)
+        level_manager = None
+        if campaign:
+            level_manager = LevelManager(SCREEN_WIDTH, GAME_AREA_HEIGHT, 20, random.Random(0))
+            level_manager.start_level(3)
+        return _loop(lambda: scoreboard.draw(surface, 42, level_manager))
+    return setup
+
+
+benchmark("ui.ScoreBoard.draw")(_bench_scoreboard(False))
+benchmark("ui.ScoreBoard.draw[campaign]")(_bench_scoreboard(True))
+
+MENU_SCREENS = ("main_menu", "play_submenu", "difficulty_submenu", "gamemode_submenu",
+                "records_submenu", "pause_menu", "gameover_menu")
+_menu = None
+
+
+def shared_menu():
+    """One Menu (and a scratch leaderboard with ten scores) for all menu benchmarks"""
+    global _menu
+    if _menu is None:
+        from assets import AssetManager
+        from leaderboard import Leaderboard
+        from menu import Menu
+        display_surface()
+        background = AssetManager().image(
+            "Pixel_Art_Forest_Trees_And_Sky_Landscape_high_resolution_preview_3293114.jpg",
+            (SCREEN_WIDTH, SCREEN_HEIGHT), alpha=False)
+        scratch = tempfile.mkdtemp(prefix="snake-bench-")
+        leaderboard = Leaderboard(os.path.join(scratch, "scores.db"), os.path.join(scratch, "leaderboard.json"))
+        leaderboard.add_scores([(10 * i, Difficulty.LEVEL_3, GameMode.CLASSIC) for i in range(10)])
+        _menu = (Menu(SCREEN_WIDTH, SCREEN_HEIGHT, FONT_PATH, background, GAME_AREA_HEIGHT), leaderboard)
+    return _menu
+
+
+def _bench_menu(screen, cold):
+    def setup():
+        menu, leaderboard = shared_menu()
+        surface = display_surface()
+        draw = getattr(menu, f"draw_{screen}")
+        args = {"records_submenu": (leaderboard,), "gameover_menu": (42,)}.get(screen, ())
+        if not cold:
+            return _loop(lambda: draw(surface, *args))
+
+        def op():
+            # Composing the screen from scratch, as on the first frame after a change
+            menu.invalidate()
+            draw(surface, *args)
+        return _loop(op)
+    return setup
+
+
+for _screen in MENU_SCREENS:
+    benchmark(f"ui.Menu.draw_{_screen}")(_bench_menu(_screen, False))
+    benchmark(f"ui.Menu.draw_{_screen}[cold]")(_bench_menu(_screen, True))
+
+
+# Running and comparing
+
+def measure(run, min_time, repeats):
+    """Seconds per operation for each of `repeats` batches of at least min_time seconds"""
+    run(1)  # warm up (caches, lazy imports)
+    n = 1
+    while True:
+        elapsed = run(n)
+        if elapsed >= min_time:
+            break
+        n = n * 10 if elapsed < min_time / 10 else int(n * min_time / max(elapsed, 1e-9) * 1.2) + 1
+    timings = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            timings.append(run(n) / n)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return n, timings
+
+
+def machine_metadata():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "host": platform.node(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "pygame": pygame.version.ver,
+        "sdl": ".".join(map(str, pygame.get_sdl_version())),
+        "video_driver": os.environ.get("SDL_VIDEODRIVER"),
+        "commit": commit,
+    }
+
+
+def run_suite(args):
+    names = [name for name in BENCHMARKS if not args.filter or any(f in name for f in args.filter)]
+    if not names:
+        sys.exit(f"no benchmark matches {args.filter}")
+    min_time = args.min_time if args.min_time is not None else (0.02 if args.quick else 0.2)
+    repeats = args.repeats if args.repeats is not None else (3 if args.quick else 7)
+
+    results = {}
+    print(f"{'benchmark':<48}{'median':>12}{'min':>12}{'stdev':>8}")
+    for name in names:
+        n, timings = measure(BENCHMARKS[name](), min_time, repeats)
+        median = statistics.median(timings)
+        results[name] = {
+            "unit": "s/op",
+            "median": median,
+            "mean": statistics.fmean(timings),
+            "min": min(timings),
+            "max": max(timings),
+            "stdev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+            "ops_per_repeat": n,
+            "timings": timings,
+        }
+        spread = results[name]["stdev"] / median if median else 0.0
+        print(f"{name:<48}{format_time(median):>12}{format_time(min(timings)):>12}{spread:>8.1%}")
+
+    metadata = machine_metadata()
+    metadata.update(min_time=min_time, repeats=repeats)
+    out = args.out or os.path.join("results", f"bench_{datetime.now():%Y%m%d-%H%M%S}.json")
+    if os.path.dirname(out):
+        os.makedirs(os.path.dirname(out), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump({"metadata": metadata, "results": results}, f, indent=2)
+    print(f"wrote {out}")
+
+
+def format_time(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def compare(args):
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+    for key in ("host", "machine", "processor", "python", "implementation", "pygame"):
+        if base["metadata"].get(key) != new["metadata"].get(key):
+            print(f"warning: {key} differs ({base['metadata'].get(key)} -> {new['metadata'].get(key)});"
+                  " times may not be comparable")
+
+    regressions = []
+    print(f"{'benchmark':<48}{'base':>12}{'new':>12}{'change':>9}")
+    for name, result in new["results"].items():
+        if name not in base["results"]:
+            print(f"{name:<48}{'-':>12}{format_time(result['median']):>12}{'new':>9}")
+            continue
+        before, after = base["results"][name]["median"], result["median"]
+        change = after / before - 1
+        flag = ""
+        if change > args.threshold:
+            flag = "  SLOWER"
+            regressions.append(name)
+        elif change < -args.threshold:
+            flag = "  faster"
+        print(f"{name:<48}{format_time(before):>12}{format_time(after):>12}{change:>+9.1%}{flag}")
+    for name in base["results"]:
+        if name not in new["results"]:
+            print(f"{name:<48}{format_time(base['results'][name]['median']):>12}{'-':>12}{'gone':>9}")
+
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    print(f"no regressions over {args.threshold:.0%}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="run the benchmarks and write a JSON result file")
+    run_parser.add_argument("--filter", nargs="+", help="only benchmarks whose name contains one of these")
+    run_parser.add_argument("--quick", action="store_true", help="fewer, shorter repeats (noisier)")
+    run_parser.add_argument("--min-time", type=float, help="seconds per repeat (default 0.2, --quick 0.02)")
+    run_parser.add_argument("--repeats", type=int, help="repeats per benchmark (default 7, --quick 3)")
+    run_parser.add_argument("--out", help="result file (default results/bench_<date>.json)")
+    commands.add_parser("list", help="list the benchmark names")
+    compare_parser = commands.add_parser("compare", help="flag regressions between two result files")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--threshold", type=float, default=0.10,
+                                help="relative slowdown of the median that counts as a regression")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        run_suite(args)
+    elif args.command == "list":
+        print("\n".join(BENCHMARKS))
+    else:
+        sys.exit(compare(args))
+
+
+if __name__ == "__main__":
+    main()
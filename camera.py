@@ -0,0 +1,48 @@
+import pygame
+
+
+class Camera:
+    """The part of the world shown in the game area.
+
+    follow() centres the view on a world position, clamped so the view never
+    leaves the world; along an axis where the world is smaller than the view
+    the world is centred instead. A world size of None is unbounded. offset
+    is what to add to world coordinates to get screen coordinates.
+    """
+    def __init__(self, view_width, view_height, world_width, world_height):
+        self.view_width = view_width
+        self.view_height = view_height
+        self.world_width = world_width
+        self.world_height = world_height
+        self.x = 0
+        self.y = 0
+        self.follow(0, 0)
+
+    def set_world(self, world_width, world_height):
+        self.world_width = world_width
+        self.world_height = world_height
+
+    @property
+    def fits(self):
+        """The world exactly fills the view, so the camera never moves"""
+        return self.world_width == self.view_width and self.world_height == self.view_height
+
+    def _clamp(self, centre, view, world):
+        if world is None:
+            return round(centre) - view // 2
+        if world <= view:
+            return -((view - world) // 2)
+        return min(max(0, round(centre) - view // 2), world - view)
+
+    def follow(self, x, y):
+        self.x = self._clamp(x, self.view_width, self.world_width)
+        self.y = self._clamp(y, self.view_height, self.world_height)
+
+    @property
+    def offset(self):
+        return -self.x, -self.y
+
+    @property
+    def rect(self):
+        """The visible area in world coordinates"""
+        return pygame.Rect(self.x, self.y, self.view_width, self.view_height)
@@ -0,0 +1,112 @@
+import importlib
+import random
+
+import pygame
+
+from engine import DIRECTIONS, OPPOSITE
+from game_settings import GameMode
+
+STEPS = {"UP": (0, -1), "DOWN": (0, 1), "LEFT": (-1, 0), "RIGHT": (1, 0)}
+
+
+class Controller:
+    """Plays a headless game: act() is called before every tick.
+
+    reaction_time (seconds) limits how often the controller may turn, so a
+    faster difficulty (more ticks per second) leaves it fewer chances to
+    steer. 0 lets it turn on every tick.
+    """
+    def __init__(self, rng=None, reaction_time=0.0):
+        self.rng = rng if rng is not None else random.Random()
+        self.reaction_time = reaction_time
+        self.next_turn_tick = 0
+
+    def act(self, engine):
+        if engine.state.tick < self.next_turn_tick:
+            return None
+        action = self.choose(engine)
+        if action is not None and action != engine.snake.direction:
+            self.next_turn_tick = engine.state.tick + round(self.reaction_time * engine.tick_rate)
+        return action
+
+    def choose(self, engine):
+        """Direction to take this tick, or None to keep going"""
+        raise NotImplementedError
+
+
+class RandomController(Controller):
+    """Turns in a random direction now and then"""
+    def __init__(self, rng=None, reaction_time=0.0, turn_chance=0.2):
+        super().__init__(rng, reaction_time)
+        self.turn_chance = turn_chance
+
+    def choose(self, engine):
+        if self.rng.random() < self.turn_chance:
+            return self.rng.choice(DIRECTIONS)
+        return None
+
+
+class GreedyController(Controller):
+    """Heads for the food (or the open portal), never stepping onto a deadly cell if it can help it"""
+    def choose(self, engine):
+        snake, size = engine.snake, engine.snake_size
+        level_manager = engine.level_manager
+        world = engine.world
+        if level_manager and level_manager.portal:
+            target = level_manager.portal.rect.topleft
+        elif world:
+            target = world.nearest_food(snake.pos[0], snake.pos[1])  # None: nothing nearby, just stay alive
+        else:
+            target = engine.food.pos
+        wrap = engine.gamemode not in (GameMode.MODERN, GameMode.ENDLESS)
+        tail = tuple(snake.body[-1])
+
+        best, best_distance = None, None
+        for direction in DIRECTIONS:
+            if direction == OPPOSITE[snake.direction]:
+                continue
+            dx, dy = STEPS[direction]
+            x, y = snake.pos[0] + dx * size, snake.pos[1] + dy * size
+            if wrap:
+                x, y = x % engine.width, y % engine.height
+            elif not world and not (0 <= x < engine.width and 0 <= y < engine.height):
+                continue
+            # The tail moves out of the way unless the snake is about to eat
+            if snake.body.count(x, y) and (x, y) != tail:
+                continue
+            obstacles = level_manager or world
+            if obstacles and obstacles.check_obstacle_collision(pygame.Rect(x, y, size, size)):
+                continue
+            distance = (self._distance(engine, (x, y), target, wrap) if target else 0) + self.rng.random()
+            if best is None or distance < best_distance:
+                best, best_distance = direction, distance
+        return best
+
+    @staticmethod
+    def _distance(engine, pos, target, wrap):
+        dx, dy = abs(pos[0] - target[0]), abs(pos[1] - target[1])
+        if wrap:
+            dx, dy = min(dx, engine.width - dx), min(dy, engine.height - dy)
+        return dx + dy
+
+
+CONTROLLERS = {
+    "random": RandomController,
+    "greedy": GreedyController,
+    # Imported on use (these modules build on this one)
+    "autopilot": "autopilot:Autopilot",
+    "hamiltonian": "hamiltonian:HamiltonianController",
+}
+
+
+def make_controller(spec, rng=None, reaction_time=0.0):
+    """Build a controller from a registered name or a "module:Class" path"""
+    spec = CONTROLLERS.get(spec, spec)
+    if not isinstance(spec, str):
+        cls = spec
+    elif ":" in spec:
+        module_name, class_name = spec.split(":", 1)
+        cls = getattr(importlib.import_module(module_name), class_name)
+    else:
+        raise ValueError(f"unknown controller {spec!r} (use one of {', '.join(CONTROLLERS)} or module:Class)")
+    return cls(rng=rng, reaction_time=reaction_time)
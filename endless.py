@@ -0,0 +1,130 @@
+import random
+from collections import OrderedDict
+
+import pygame
+from obstacles import LevelManager
+
+CHUNK_CELLS = 16  # chunk side in cells
+MAX_CHUNKS = 64  # chunks kept in memory; the least recently visited beyond this are dropped
+ACTIVE_RADIUS = 1  # chunks around the head's chunk that are always loaded
+MAX_WALLS = 3  # per chunk
+FOOD_PER_CHUNK = (1, 2)
+
+
+class Chunk(LevelManager):
+    """One square of the endless world: a few walls and some food.
+
+    Everything in a chunk comes from an RNG seeded with the world seed and
+    the chunk's coordinates, so a chunk is the same whenever (and in whatever
+    order) it is generated. Walls are laid out with LevelManager's wall
+    primitives in chunk-local pixels and indexed by its obstacle grid;
+    queries take rects moved into the chunk's frame. Food positions are
+    world pixels.
+    """
+    def __init__(self, cx, cy, cells, snake_size, seed):
+        size = cells * snake_size
+        super().__init__(size, size, snake_size, random.Random(f"{seed}:{cx}:{cy}"))
+        self.x, self.y = cx * size, cy * size
+        self.foods = []
+        self._generate(start=(cx, cy) == (0, 0))
+
+    def _generate(self, start):
+        rng, s, cells = self.rng, self.snake_size, self.cols
+        if not start:  # the snake starts in chunk (0, 0), so that one stays open
+            for _ in range(rng.randint(0, MAX_WALLS)):
+                length = rng.randint(3, cells // 2)
+                # Walls keep off the chunk's border cells, so neighbouring chunks' walls never join up
+                along, across = rng.randrange(1, cells - length), rng.randrange(1, cells - 1)
+                if rng.random() < 0.5:
+                    self._create_horizontal_wall(along * s, across * s, length)
+                else:
+                    self._create_vertical_wall(across * s, along * s, length)
+        self._compile_grid()
+        # The food is 2x2 cells like a portal, so the portal spots are exactly the free food spots
+        spots = rng.sample(self.portal_slots, min(len(self.portal_slots), rng.randint(*FOOD_PER_CHUNK)))
+        self.foods = [[self.x + x, self.y + y] for x, y in spots]
+        self.portal_slots = []
+
+
+class EndlessWorld:
+    """An unbounded world generated chunk by chunk around the snake.
+
+    update() is called with the head's position every tick; when the head
+    enters another chunk, the chunks within ACTIVE_RADIUS are loaded
+    (generated if needed) and any beyond max_chunks, least recently visited
+    first, are dropped. Memory and per-tick cost therefore stay the same
+    however far the snake goes. A dropped chunk comes back with the same
+    walls and fresh food. Only update() changes which chunks are loaded, so
+    drawing and controllers can't change how a seeded game plays out.
+    """
+    def __init__(self, snake_size, food_size, seed, chunk_cells=CHUNK_CELLS, max_chunks=MAX_CHUNKS):
+        if food_size != 2 * snake_size:
+            raise ValueError("endless mode needs food twice the snake's size")
+        if max_chunks < (2 * ACTIVE_RADIUS + 1) ** 2:
+            raise ValueError(f"max_chunks must hold the {(2 * ACTIVE_RADIUS + 1) ** 2} chunks around the head")
+        self.snake_size = snake_size
+        self.food_size = food_size
+        self.seed = seed
+        self.chunk_cells = chunk_cells
+        self.chunk_size = chunk_cells * snake_size
+        self.max_chunks = max_chunks
+        self.chunks = OrderedDict()  # (cx, cy) -> Chunk, least recently visited first
+        self.centre = None
+        self.generated = 0
+
+    def _make_chunk(self, key):
+        return Chunk(key[0], key[1], self.chunk_cells, self.snake_size, self.seed)
+
+    def update(self, x, y):
+        """Load the chunks around (x, y) and drop the stalest ones over the cap"""
+        key = (x // self.chunk_size, y // self.chunk_size)
+        if key == self.centre:
+            return
+        self.centre = key
+        chunks = self.chunks
+        for dy in range(-ACTIVE_RADIUS, ACTIVE_RADIUS + 1):
+            for dx in range(-ACTIVE_RADIUS, ACTIVE_RADIUS + 1):
+                near = (key[0] + dx, key[1] + dy)
+                if near in chunks:
+                    chunks.move_to_end(near)
+                else:
+                    chunks[near] = self._make_chunk(near)
+                    self.generated += 1
+        chunks.move_to_end(key)
+        while len(chunks) > self.max_chunks:
+            chunks.popitem(last=False)
+
+    def chunks_in_rect(self, rect):
+        """Loaded chunks overlapping rect (only update() generates chunks)"""
+        size = self.chunk_size
+        found = []
+        for cy in range(rect.top // size, (rect.bottom - 1) // size + 1):
+            for cx in range(rect.left // size, (rect.right - 1) // size + 1):
+                chunk = self.chunks.get((cx, cy))
+                if chunk is not None:
+                    found.append(chunk)
+        return found
+
+    def check_obstacle_collision(self, rect):
+        for chunk in self.chunks_in_rect(rect):
+            if chunk.check_obstacle_collision(rect.move(-chunk.x, -chunk.y)):
+                return True
+        return False
+
+    def eat_food(self, rect):
+        """Remove the food rect overlaps, if any; returns whether there was one"""
+        size = self.food_size
+        for chunk in self.chunks_in_rect(rect):
+            for food in chunk.foods:
+                if rect.colliderect(pygame.Rect(food[0], food[1], size, size)):
+                    chunk.foods.remove(food)
+                    return True
+        return False
+
+    def nearest_food(self, x, y):
+        """Closest food (Manhattan distance) in the loaded chunks around (x, y), or None"""
+        size = self.chunk_size
+        reach = pygame.Rect(x - ACTIVE_RADIUS * size, y - ACTIVE_RADIUS * size,
+                            (2 * ACTIVE_RADIUS + 1) * size, (2 * ACTIVE_RADIUS + 1) * size)
+        foods = [food for chunk in self.chunks_in_rect(reach) for food in chunk.foods]
+        return min(foods, key=lambda food: abs(food[0] - x) + abs(food[1] - y), default=None)
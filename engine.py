@@ -0,0 +1,263 @@
+import random
+
+import pygame
+from snake import Snake
+from food import Food
+from game_settings import Difficulty, GameMode
+from obstacles import LevelManager
+from endless import EndlessWorld
+
+# Board defaults (match the interactive window's game area)
+BOARD_WIDTH, BOARD_HEIGHT = 400, 600
+SNAKE_SIZE = 20
+FOOD_SIZE = 40
+START_POS = (100, 60)
+
+DIRECTIONS = ("UP", "DOWN", "LEFT", "RIGHT")
+OPPOSITE = {"UP": "DOWN", "DOWN": "UP", "LEFT": "RIGHT", "RIGHT": "LEFT"}
+
+
+class GameState:
+    """Result of the last engine tick"""
+    def __init__(self):
+        self.tick = 0
+        self.score = 0
+        self.game_over = False
+        self.won = False
+        self.death_cause = None  # "self", "wall", "obstacle", "campaign_complete" or "board_full"
+        # Per-tick events, reset at the start of every step
+        self.ate_food = False
+        self.food_respawned = False
+        self.level_advanced = False
+        self.vacated = None  # position of the tail segment dropped this tick
+        self.prev_head = None  # head position before this tick's move
+
+    def clear_events(self):
+        self.ate_food = False
+        self.food_respawned = False
+        self.level_advanced = False
+        self.vacated = None
+        self.prev_head = None
+
+
+class GameEngine:
+    """Headless snake simulation: all game rules, no display, audio or input.
+
+    The snake moves exactly one cell per step; the difficulty only sets how many
+    steps per second a real-time driver should run (tick_rate). Sprites are
+    optional and only carried through to Snake/Food so a display driver can
+    draw the engine's objects directly.
+    """
+    def __init__(self, difficulty=Difficulty.LEVEL_3, gamemode=GameMode.CLASSIC,
+                 width=BOARD_WIDTH, height=BOARD_HEIGHT, snake_size=SNAKE_SIZE, food_size=FOOD_SIZE,
+                 head_sprite=None, body_sprite=None, food_sprite=None, seed=None):
+        self.difficulty = difficulty
+        self.tick_rate = difficulty.value  # simulation ticks per second
+        self.gamemode = gamemode
+        self.width = width
+        self.height = height
+        self.snake_size = snake_size
+        self.food_size = food_size
+        self.head_sprite = head_sprite
+        self.body_sprite = body_sprite
+        self.food_sprite = food_sprite
+        self.snake = None
+        self.food = None
+        self.level_manager = None
+        self.world = None  # EndlessWorld in ENDLESS mode (which has no single food or board edges)
+        self.state = None
+        self.seed = None
+        self.rng = None
+        self.reset(seed=seed)
+
+    def reset(self, level=1, seed=None):
+        """Start a new game with the current settings.
+
+        All gameplay randomness (food and portal placement) comes from one RNG
+        seeded here, so a seed plus the actions taken reproduce a game exactly.
+        Without a seed a fresh one is drawn.
+        """
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.rng = random.Random(self.seed)
+        endless = self.gamemode == GameMode.ENDLESS
+        self.snake = Snake(list(START_POS), self.snake_size, self.snake_size,
+                           self.head_sprite, self.body_sprite, None if endless else (self.width, self.height))
+        if endless:
+            self.food = None
+            self.level_manager = None
+            self.world = EndlessWorld(self.snake_size, self.food_size, self.seed)
+            self.world.update(*START_POS)
+            self.state = GameState()
+            return self.state
+        self.world = None
+        self.food = Food(self.width, self.height, self.snake_size, self.food_size, self.food_sprite, self.rng)
+        if self.gamemode == GameMode.CAMPAIGN:
+            self.level_manager = LevelManager(self.width, self.height, self.snake_size, self.rng)
+            self.level_manager.start_level(level)
+        else:
+            self.level_manager = None
+        self.state = GameState()
+        self._rebuild_food_index()
+        self.food.respawn()
+        return self.state
+
+    def step(self, action=None):
+        """Advance the simulation by one tick.
+
+        action is one of DIRECTIONS or None to keep going straight. Turning back
+        onto the snake's own neck is ignored.
+        """
+        state = self.state
+        state.clear_events()
+        if state.game_over:
+            return state
+
+        snake = self.snake
+        if action is not None and action != OPPOSITE[snake.direction]:
+            snake.change_to = action
+
+        state.tick += 1
+        state.prev_head = (snake.pos[0], snake.pos[1])
+        snake.update_direction()
+        snake.move()
+        if self.world:
+            return self._step_endless(state)
+
+        # Check collision with food - AABB
+        food = self.food
+        if (
+            snake.pos[0] < food.pos[0] + self.food_size
+            and snake.pos[0] + self.snake_size > food.pos[0]
+            and snake.pos[1] < food.pos[1] + self.food_size
+            and snake.pos[1] + self.snake_size > food.pos[1]
+        ):
+            state.score += 1
+            state.ate_food = True
+            food.spawn = False
+            if self.level_manager:
+                self.level_manager.on_food_eaten()
+        else:
+            tail = snake.shrink_tail()
+            if tail:
+                food.unblock(tail[0], tail[1], self.snake_size, self.snake_size)
+                state.vacated = tail
+
+        # Collision detection based on game mode
+        # CLASSIC: Can go through walls, only dies on body collision
+        # MODERN: Dies on wall collision and body collision
+        # CAMPAIGN: Can go through walls, dies on obstacle and body collision
+        if self.gamemode == GameMode.MODERN:
+            if snake.check_wall_collision(self.width, self.height):
+                self._end("wall")
+        else:
+            self._wrap()
+        food.block(snake.pos[0], snake.pos[1], self.snake_size, self.snake_size)
+
+        # Food spawn (the free-slot index already excludes the snake and obstacles)
+        if not food.spawn:
+            if food.respawn():
+                state.food_respawned = True
+            else:
+                self._end("board_full", won=True)
+                return state
+
+        if self.level_manager and not state.game_over:
+            snake_rect = pygame.Rect(snake.pos[0], snake.pos[1], self.snake_size, self.snake_size)
+            if self.level_manager.check_obstacle_collision(snake_rect):
+                self._end("obstacle")
+            elif self.level_manager.check_portal_collision(snake_rect):
+                if self.level_manager.is_final_level():
+                    self._end("campaign_complete", won=True)
+                else:
+                    self.level_manager.next_level()
+                    self._reset_snake()
+                    self._rebuild_food_index()
+                    # Food left under one of the new level's walls could never be eaten
+                    if food.is_blocked():
+                        state.food_respawned = food.respawn()
+                    state.level_advanced = True
+
+        if not state.game_over and snake.check_self_collision():
+            self._end("self")
+        return state
+
+    def _step_endless(self, state):
+        """The rest of a tick in ENDLESS mode: no edges, food and walls come from the world's chunks"""
+        snake, world = self.snake, self.world
+        world.update(snake.pos[0], snake.pos[1])
+        head = pygame.Rect(snake.pos[0], snake.pos[1], self.snake_size, self.snake_size)
+        if world.eat_food(head):
+            state.score += 1
+            state.ate_food = True
+        else:
+            state.vacated = snake.shrink_tail()
+        if world.check_obstacle_collision(head):
+            self._end("obstacle")
+        elif snake.check_self_collision():
+            self._end("self")
+        return state
+
+    def set_body(self, segments):
+        """Replace the snake with the given segments (head first, each next to the last).
+
+        The snake heads away from its second segment, and the food index is
+        rebuilt around the new body; food the body now covers is moved.
+        """
+        snake = self.snake
+        snake.body.clear()
+        for x, y in reversed(segments):
+            snake.body.push_front(x, y)
+        snake.pos = list(segments[0])
+        if len(segments) < 2:
+            snake.direction = "RIGHT"
+        else:
+            (hx, hy), (nx, ny) = segments[0], segments[1]
+            snake.direction = "DOWN" if hy > ny else "UP" if hy < ny else "RIGHT" if hx > nx else "LEFT"
+        snake.change_to = snake.direction
+        if self.food:
+            self._rebuild_food_index()
+            if self.food.is_blocked():
+                self.food.respawn()
+
+    def _rebuild_food_index(self):
+        """Block every food slot covered by the snake or an obstacle"""
+        food, size = self.food, self.snake_size
+        food.clear_blocks()
+        for x, y in self.snake.body:
+            food.block(x, y, size, size)
+        if self.level_manager:
+            for obs in self.level_manager.obstacles:
+                food.block(obs.rect.x, obs.rect.y, obs.rect.width, obs.rect.height)
+
+    def _wrap(self):
+        """Wrap around walls (teleport to other side)"""
+        snake = self.snake
+        wrapped = False
+        if snake.pos[0] < 0:
+            snake.pos[0] = self.width - self.snake_size
+            wrapped = True
+        elif snake.pos[0] >= self.width:
+            snake.pos[0] = 0
+            wrapped = True
+        if snake.pos[1] < 0:
+            snake.pos[1] = self.height - self.snake_size
+            wrapped = True
+        elif snake.pos[1] >= self.height:
+            snake.pos[1] = 0
+            wrapped = True
+
+        # If wrapped, update body to follow head immediately
+        if wrapped and len(snake.body) > 0:
+            snake.body[0] = snake.pos[:]
+
+    def _reset_snake(self):
+        """Put the snake back at the start after a level change"""
+        snake = self.snake
+        snake.reset(START_POS)
+        snake.direction = "RIGHT"
+        snake.change_to = "RIGHT"
+
+    def _end(self, cause, won=False):
+        self.state.game_over = True
+        self.state.won = won
+        self.state.death_cause = cause
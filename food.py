@@ -1,44 +1,97 @@
 import random
 import math
-import pygame
+from array import array
 
 
 class Food:
-    def __init__(self, screen_width, screen_height, snake_size, food_size, sprite):
+    def __init__(self, screen_width, screen_height, snake_size, food_size, sprite, rng=None):
+        self.rng = rng if rng is not None else random  # gameplay RNG (seeded per game by the engine)
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.snake_size = snake_size
         self.food_size = food_size
         self.sprite = sprite
+
+        # Free-slot index: one slot per grid-aligned food position. blocked counts how
+        # many snake segments / obstacles overlap each slot's footprint; free lists the
+        # unblocked slots (swap-remove) and where maps a slot to its index in free.
+        self.slot_cols = (screen_width - food_size) // snake_size
+        self.slot_rows = (screen_height - food_size) // snake_size
+        slot_count = self.slot_cols * self.slot_rows
+        self.all_slots = array('i', range(slot_count))  # copied (not rebuilt) by clear_blocks
+        self.blocked = array('H', bytes(2 * slot_count))
+        self.free = array('i', self.all_slots)
+        self.where = array('i', self.all_slots)
+
         self.pos = self._random_pos()
         self.spawn = True
 
     def _random_pos(self):
         return [
-            random.randrange(0, (self.screen_width - self.food_size) // self.snake_size)
+            self.rng.randrange(0, (self.screen_width - self.food_size) // self.snake_size)
             * self.snake_size,
-            random.randrange(0, (self.screen_height - self.food_size) // self.snake_size)
+            self.rng.randrange(0, (self.screen_height - self.food_size) // self.snake_size)
             * self.snake_size,
         ]
 
-    def respawn(self, snake_body):
-        # Keep generating until it doesn't overlap the snake
-        while True:
-            pos = self._random_pos()
-            food_on_snake = False
-            for segment in snake_body:
-                if (
-                    pos[0] < segment[0] + self.snake_size
-                    and pos[0] + self.food_size > segment[0]
-                    and pos[1] < segment[1] + self.snake_size
-                    and pos[1] + self.food_size > segment[1]
-                ):
-                    food_on_snake = True
-                    break
-            if not food_on_snake:
-                self.pos = pos
-                break
+    def _slot_range(self, x, y, width, height):
+        """Slots whose food footprint overlaps the rect (x, y, width, height)"""
+        s, f = self.snake_size, self.food_size
+        col_min = max(0, (x - f) // s + 1)
+        col_max = min(self.slot_cols - 1, -(-(x + width) // s) - 1)
+        row_min = max(0, (y - f) // s + 1)
+        row_max = min(self.slot_rows - 1, -(-(y + height) // s) - 1)
+        return col_min, col_max, row_min, row_max
+
+    def block(self, x, y, width, height):
+        """Mark every slot overlapping the rect as unavailable"""
+        col_min, col_max, row_min, row_max = self._slot_range(x, y, width, height)
+        blocked, free, where = self.blocked, self.free, self.where
+        for row in range(row_min, row_max + 1):
+            for slot in range(row * self.slot_cols + col_min, row * self.slot_cols + col_max + 1):
+                blocked[slot] += 1
+                if blocked[slot] == 1:
+                    # Swap-remove from the free list
+                    i = where[slot]
+                    last = free.pop()
+                    if last != slot:
+                        free[i] = last
+                        where[last] = i
+                    where[slot] = -1
+
+    def unblock(self, x, y, width, height):
+        """Undo a previous block() of the same rect"""
+        col_min, col_max, row_min, row_max = self._slot_range(x, y, width, height)
+        blocked, free, where = self.blocked, self.free, self.where
+        for row in range(row_min, row_max + 1):
+            for slot in range(row * self.slot_cols + col_min, row * self.slot_cols + col_max + 1):
+                blocked[slot] -= 1
+                if blocked[slot] == 0:
+                    where[slot] = len(free)
+                    free.append(slot)
+
+    def clear_blocks(self):
+        self.blocked = array('H', bytes(2 * len(self.all_slots)))
+        self.free = array('i', self.all_slots)
+        self.where = array('i', self.all_slots)
+
+    def is_blocked(self):
+        """Whether a snake segment or obstacle now overlaps the food"""
+        slot = (self.pos[1] // self.snake_size) * self.slot_cols + self.pos[0] // self.snake_size
+        return self.blocked[slot] > 0
+
+    def respawn(self):
+        """Move the food to a random free slot in O(1).
+
+        Returns False, leaving the food unspawned, when no slot is free (board full).
+        """
+        if not self.free:
+            self.spawn = False
+            return False
+        slot = self.free[self.rng.randrange(len(self.free))]
+        self.pos = [(slot % self.slot_cols) * self.snake_size, (slot // self.slot_cols) * self.snake_size]
         self.spawn = True
+        return True
 
     def draw(self, surface, wave_phase=0, wave_amplitude=0):
         surface.blit(self.sprite, (self.pos[0], self.pos[1] - wave_amplitude * math.sin(wave_phase)))
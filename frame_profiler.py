@@ -0,0 +1,156 @@
+import atexit
+import csv
+import os
+import time
+from array import array
+from datetime import datetime
+
+import pygame
+from text_cache import get_font
+
+PHASES = ("events", "logic", "particles", "render", "menu", "present")
+OVERLAY_REFRESH_NS = 500_000_000  # rebuild the overlay text twice a second
+
+
+def _noop(*args):
+    pass
+
+
+class FrameProfiler:
+    """Times each phase of a frame with perf_counter_ns into fixed-size ring buffers.
+
+    Call start_frame(), mark(phase) after each phase in PHASES order and
+    end_frame(). While disabled those three are a no-op function, so the
+    instrumented loop costs next to nothing. The overlay shows min, mean,
+    p95 and p99 per phase over the last `capacity` frames; CSV export writes
+    one row of phase times (microseconds) per frame.
+    """
+    def __init__(self, font_path, capacity=600, csv_dir="profiles"):
+        self.font_path = font_path
+        self.capacity = capacity
+        self.csv_dir = csv_dir
+        self.samples = {phase: array('q', bytes(8 * capacity)) for phase in PHASES + ("frame",)}
+        self.index = 0
+        self.count = 0
+        self.frame_start = 0
+        self.last = 0
+        self.current = {}  # this frame's phase times, for the CSV row
+        self.overlay_visible = False
+        self.overlay = None
+        self.overlay_time = 0
+        self.overlay_rect = None
+        self.csv_file = None
+        self.csv_writer = None
+        self.frame_number = 0
+        self.watched = {}  # overlay rows from elsewhere: name -> function returning (min, mean, p95, p99) or None
+        self._set_active(False)
+        atexit.register(self.stop_csv)
+
+    def _set_active(self, active):
+        if active and not getattr(self, "active", False):
+            self._start_frame()  # switched on mid-frame: time from here
+        self.active = active
+        if active:
+            self.start_frame = self._start_frame
+            self.mark = self._mark
+            self.end_frame = self._end_frame
+        else:
+            self.start_frame = self.mark = self.end_frame = _noop
+
+    def _update_active(self):
+        self._set_active(self.overlay_visible or self.csv_writer is not None)
+
+    def watch(self, name, stats):
+        self.watched[name] = stats
+
+    def toggle_overlay(self):
+        self.overlay_visible = not self.overlay_visible
+        self.overlay = None
+        self.overlay_rect = None
+        self._update_active()
+
+    def toggle_csv(self):
+        if self.csv_writer:
+            self.stop_csv()
+        else:
+            os.makedirs(self.csv_dir, exist_ok=True)
+            path = os.path.join(self.csv_dir, f"frames_{datetime.now():%Y%m%d-%H%M%S}.csv")
+            self.csv_file = open(path, "w", newline="")
+            self.csv_writer = csv.writer(self.csv_file)
+            self.csv_writer.writerow(("frame",) + PHASES + ("total",))
+        self._update_active()
+
+    def stop_csv(self):
+        if self.csv_file:
+            self.csv_file.close()
+        self.csv_file = None
+        self.csv_writer = None
+        self._update_active()
+
+    def _start_frame(self):
+        self.frame_start = self.last = time.perf_counter_ns()
+
+    def _mark(self, phase):
+        now = time.perf_counter_ns()
+        elapsed = now - self.last
+        self.samples[phase][self.index] = elapsed
+        self.current[phase] = elapsed
+        self.last = now
+
+    def _end_frame(self):
+        total = self.last - self.frame_start
+        self.samples["frame"][self.index] = total
+        self.index = (self.index + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.frame_number += 1
+        if self.csv_writer:
+            current = self.current
+            self.csv_writer.writerow([self.frame_number] + [current.get(p, 0) // 1000 for p in PHASES]
+                                     + [total // 1000])
+
+    def stats(self):
+        """{phase: (min, mean, p95, p99)} in milliseconds over the buffered frames"""
+        result = {}
+        n = self.count
+        if not n:
+            return result
+        for phase, buffer in self.samples.items():
+            values = sorted(buffer[:n]) if n < self.capacity else sorted(buffer)
+            result[phase] = (values[0] / 1e6, sum(values) / n / 1e6,
+                             values[min(n - 1, n * 95 // 100)] / 1e6, values[min(n - 1, n * 99 // 100)] / 1e6)
+        return result
+
+    def draw(self, surface):
+        """Draw the overlay (if shown); returns the rect it covers, or None"""
+        if not self.overlay_visible:
+            return None
+        now = time.perf_counter_ns()
+        if self.overlay is None or now - self.overlay_time > OVERLAY_REFRESH_NS:
+            self.overlay = self._build_overlay()
+            self.overlay_time = now
+        self.overlay_rect = surface.blit(self.overlay, (4, 4))
+        return self.overlay_rect
+
+    def _build_overlay(self):
+        # Numbers change every refresh, so they are rendered directly rather than through the text cache
+        font = get_font(self.font_path, 12)
+        rows = [("phase ms", "min", "mean", "p95", "p99")]
+        for phase, values in self.stats().items():
+            rows.append((phase,) + tuple(f"{v:.2f}" for v in values))
+        for name, stats in self.watched.items():
+            values = stats()
+            if values:
+                rows.append((name,) + tuple(f"{v:.2f}" for v in values))
+        if self.csv_writer:
+            rows.append(("CSV on",))
+        line_height = font.get_linesize()
+        column_width = 46
+        panel = pygame.Surface((80 + 4 * column_width + 8, line_height * len(rows) + 8), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        for i, row in enumerate(rows):
+            y = 4 + i * line_height
+            panel.blit(font.render(row[0], True, (255, 255, 255)), (4, y))
+            for j, cell in enumerate(row[1:]):
+                text = font.render(cell, True, (255, 255, 255))
+                panel.blit(text, (80 + (j + 1) * column_width - text.get_width(), y))  # right-aligned
+        return panel
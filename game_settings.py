@@ -2,6 +2,7 @@ from enum import Enum
 
 
 class Difficulty(Enum):
+    # Snake speed in cells (ticks) per second
     LEVEL_1 = 5    # Slowest
     LEVEL_2 = 7
     LEVEL_3 = 9
@@ -16,6 +17,7 @@ class GameMode(Enum):
     CLASSIC = "Classic"           # Can go through walls, only dies when hitting body
     MODERN = "Modern"             # Cannot go through walls, dies when hitting wall or body
     CAMPAIGN = "Campaign"         # Level-based mode with obstacles, 5 levels total
+    ENDLESS = "Endless"           # Unbounded world generated in chunks, dies on walls and body hit
 
 
 DIFFICULTY_NAMES = {
@@ -33,4 +35,5 @@ GAMEMODE_DESCRIPTIONS = {
     GameMode.CLASSIC: "Go through walls, die on body hit",
     GameMode.MODERN: "Die on walls and body hit",
     GameMode.CAMPAIGN: "5 levels with obstacles and portals",
+    GameMode.ENDLESS: "Explore a world without edges",
 }
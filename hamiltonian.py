@@ -0,0 +1,285 @@
+import hashlib
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_right, insort
+from collections import deque
+
+from autopilot import Autopilot
+from controllers import Controller
+from engine import OPPOSITE
+
+MAGIC = b"HAMC"
+# magic, cols, rows, cycle length; then pos[cols * rows] and order[length] as int32
+HEADER = struct.Struct("<4siii")
+SHORTCUT_MARGIN = 4  # cells kept between the head and the tail when skipping ahead
+
+
+class HamiltonianCycle:
+    """A closed path through every cell of the board's obstacle-free 2x2 blocks.
+
+    Built by walking around a spanning tree of the free blocks, so every
+    covered cell has exactly one successor. order lists the cells along the
+    cycle; pos maps a cell to its index in order (-1: not on the cycle).
+    """
+    def __init__(self, cols, rows, pos, order, buffer=None):
+        self.cols = cols
+        self.rows = rows
+        self.pos = pos
+        self.order = order
+        self.length = len(order)
+        self._buffer = buffer  # keeps a memory map open
+
+    @classmethod
+    def build(cls, cols, rows, blocked):
+        """blocked: per-cell truthy values for cells the snake can never enter"""
+        block_cols, block_rows = cols // 2, rows // 2
+
+        def block_free(bc, br):
+            cells = (2 * br * cols + 2 * bc, 2 * br * cols + 2 * bc + 1,
+                     (2 * br + 1) * cols + 2 * bc, (2 * br + 1) * cols + 2 * bc + 1)
+            return not any(blocked[c] for c in cells)
+
+        free = {(bc, br) for br in range(block_rows) for bc in range(block_cols) if block_free(bc, br)}
+        if not free:
+            return cls(cols, rows, array('i', [-1]) * (cols * rows), array('i'))
+
+        # Spanning tree (depth first) of the largest group of connected free blocks
+        tree_edges = []
+        component, seen = [], set()
+        for root in sorted(free, key=lambda b: (b[1], b[0])):
+            if root in seen:
+                continue
+            edges, group, stack = [], [root], [root]
+            seen.add(root)
+            while stack:
+                bc, br = stack.pop()
+                for nb in ((bc + 1, br), (bc, br + 1), (bc - 1, br), (bc, br - 1)):
+                    if nb in free and nb not in seen:
+                        seen.add(nb)
+                        edges.append(((bc, br), nb))
+                        group.append(nb)
+                        stack.append(nb)
+            if len(group) > len(component):
+                component, tree_edges = group, edges
+
+        # Each block starts as a 2x2 loop; every tree edge splices two neighbouring loops together
+        links = {}
+
+        def link(a, b):
+            links.setdefault(a, set()).add(b)
+            links.setdefault(b, set()).add(a)
+
+        def unlink(a, b):
+            links[a].discard(b)
+            links[b].discard(a)
+
+        def corners(bc, br):
+            top_left = 2 * br * cols + 2 * bc
+            return top_left, top_left + 1, top_left + cols, top_left + cols + 1
+
+        for block in component:
+            tl, tr, bl, br_ = corners(*block)
+            link(tl, tr)
+            link(tr, br_)
+            link(br_, bl)
+            link(bl, tl)
+        for a, b in tree_edges:
+            if a[0] > b[0] or a[1] > b[1]:
+                a, b = b, a
+            a_tl, a_tr, a_bl, a_br = corners(*a)
+            b_tl, b_tr, b_bl, b_br = corners(*b)
+            if a[1] == b[1]:  # b is right of a
+                unlink(a_tr, a_br)
+                unlink(b_tl, b_bl)
+                link(a_tr, b_tl)
+                link(a_br, b_bl)
+            else:  # b is below a
+                unlink(a_bl, a_br)
+                unlink(b_tl, b_tr)
+                link(a_bl, b_tl)
+                link(a_br, b_tr)
+
+        start = min(links)
+        order = array('i', [start])
+        prev, cell = start, min(links[start])
+        while cell != start:
+            order.append(cell)
+            prev, cell = cell, next(c for c in links[cell] if c != prev)
+        pos = array('i', [-1]) * (cols * rows)
+        for i, cell in enumerate(order):
+            pos[cell] = i
+        return cls(cols, rows, pos, order)
+
+    def to_bytes(self):
+        return HEADER.pack(MAGIC, self.cols, self.rows, self.length) + self.pos.tobytes() + self.order.tobytes()
+
+    @classmethod
+    def load(cls, path):
+        """Memory-map a cached cycle; None if the file is missing or not a cycle"""
+        try:
+            with open(path, "rb") as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        if len(buffer) < HEADER.size:
+            return None
+        magic, cols, rows, length = HEADER.unpack_from(buffer)
+        if magic != MAGIC or len(buffer) != HEADER.size + 4 * (cols * rows + length):
+            return None
+        ints = memoryview(buffer)[HEADER.size:].cast('i')
+        return cls(cols, rows, ints[:cols * rows], ints[cols * rows:], buffer)
+
+    def distance(self, a, b):
+        """Steps along the cycle from cell a to cell b"""
+        return (self.pos[b] - self.pos[a]) % self.length
+
+
+def cycle_for(cols, rows, obstacle_grid, level=None, cache_dir=os.path.join(".cache", "hamiltonian")):
+    """The cycle for a board and obstacle layout, read from (or written to) the on-disk cache"""
+    layout = hashlib.sha1(bytes(obstacle_grid)).hexdigest()[:12]
+    name = f"{cols}x{rows}_{'L%d' % level if level else 'open'}_{layout}.bin"
+    path = os.path.join(cache_dir, name)
+    cycle = HamiltonianCycle.load(path)
+    if cycle is not None and (cycle.cols, cycle.rows) == (cols, rows):
+        return cycle
+    cycle = HamiltonianCycle.build(cols, rows, obstacle_grid)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(cycle.to_bytes())
+        os.replace(tmp_path, path)
+    except OSError:
+        pass  # The cache is only an optimisation
+    return HamiltonianCycle.load(path) or cycle
+
+
+class HamiltonianController(Controller):
+    """Follows a Hamiltonian cycle of the board, taking shortcuts while the snake is short.
+
+    Following the cycle can never run into the body, so the snake can fill
+    every covered cell. While the snake is shorter than half the cycle it may
+    jump ahead along the cycle towards the food, as long as that keeps the
+    whole body behind the new head. Off the cycle (at the start, or when the
+    cycle's next cell can't be taken) an Autopilot steers instead.
+
+    To check a shortcut it needs the nearest body cell ahead of the head
+    along the cycle. The body's cycle positions are kept sorted and updated
+    as the head and tail move, so that is a binary search rather than a scan
+    of the body.
+    """
+    def __init__(self, rng=None, reaction_time=0.0):
+        super().__init__(rng, reaction_time)
+        self.cycle = None
+        self.cycle_key = None
+        self.fallback = Autopilot(rng, 0.0)
+        self.body_cells = deque()  # the snake's cells as last seen, head first
+        self.body_positions = []  # sorted cycle positions of body_cells (those on the cycle)
+        self.body_cycle = None  # the cycle body_positions refer to
+
+    def _cycle(self, engine):
+        size = engine.snake_size
+        cols, rows = engine.width // size, engine.height // size
+        level_manager = engine.level_manager
+        level = level_manager.current_level if level_manager else None
+        key = (cols, rows, level)
+        if key != self.cycle_key:
+            grid = level_manager.obstacle_grid if level_manager else bytes(cols * rows)
+            self.cycle = cycle_for(cols, rows, grid, level)
+            self.cycle_key = key
+        return self.cycle
+
+    def choose(self, engine):
+        if engine.world:
+            raise ValueError("a Hamiltonian cycle needs a bounded board; ENDLESS games have none")
+        cycle = self._cycle(engine)
+        snake = engine.snake
+        size = engine.snake_size
+        cols = cycle.cols
+        head = (snake.pos[1] // size) * cols + snake.pos[0] // size
+        if not cycle.length or cycle.pos[head] < 0:
+            return self.fallback.choose(engine)
+
+        body = snake.body
+        tail = body[-1]
+        tail_cell = (tail[1] // size) * cols + tail[0] // size
+
+        def free(cell):
+            row, col = divmod(cell, cols)
+            count = body.count(col * size, row * size)
+            return not count or (count == 1 and cell == tail_cell)
+
+        best = cycle.order[(cycle.pos[head] + 1) % cycle.length]
+        target = self._target_distance(engine, cycle, head)
+        if target and len(body) < cycle.length // 2:
+            self._sync_body(cycle, body, size)  # every tick, so it stays a one-step update
+            row, col = divmod(head, cols)
+            shortcuts = []
+            for cell in (head - cols if row > 0 else None, head + cols if row < cycle.rows - 1 else None,
+                         head - 1 if col > 0 else None, head + 1 if col < cols - 1 else None):
+                if cell is not None and cycle.pos[cell] >= 0 and 1 < cycle.distance(head, cell) <= target:
+                    shortcuts.append((cycle.distance(head, cell), cell))
+            if shortcuts:
+                # The stretch of cycle being skipped must hold none of the body
+                nearest_body = self._nearest_body(cycle, head)
+                for distance, cell in sorted(shortcuts, reverse=True):
+                    if distance < nearest_body - SHORTCUT_MARGIN and free(cell):
+                        best = cell
+                        break
+
+        direction = {-cols: "UP", cols: "DOWN", -1: "LEFT", 1: "RIGHT"}[best - head]
+        if direction == OPPOSITE[snake.direction] or not free(best):
+            return self.fallback.choose(engine)
+        return direction
+
+    def _sync_body(self, cycle, body, size):
+        """Bring body_cells/body_positions up to date with the snake's body"""
+        cols, pos = cycle.cols, cycle.pos
+        cells, positions = self.body_cells, self.body_positions
+        head = (body[0][1] // size) * cols + body[0][0] // size
+        tail = (body[-1][1] // size) * cols + body[-1][0] // size
+        grown = len(body) - len(cells)
+        if self.body_cycle is cycle and cells and grown in (0, 1) and len(body) > 1 \
+                and cells[0] == (body[1][1] // size) * cols + body[1][0] // size:
+            # One step since the last call: a new head, and the old tail gone unless the snake grew
+            cells.appendleft(head)
+            if pos[head] >= 0:
+                insort(positions, pos[head])
+            if not grown:
+                left = cells.pop()
+                if pos[left] >= 0:
+                    del positions[bisect_right(positions, pos[left]) - 1]
+            if cells[-1] == tail:
+                return
+        # Anything else (a new game or level, a skipped tick): start again from the body
+        self.body_cycle = cycle
+        self.body_cells = deque((y // size) * cols + x // size for x, y in body)
+        self.body_positions = sorted(pos[cell] for cell in self.body_cells if pos[cell] >= 0)
+
+    def _nearest_body(self, cycle, head):
+        """Cycle distance from the head to the nearest other body cell ahead of it (cycle.length if none)"""
+        positions = self.body_positions
+        here = cycle.pos[head]
+        i = bisect_right(positions, here)
+        if i < len(positions):
+            return positions[i] - here
+        # Wrap around; the head's own position is the only one left if the body has no other
+        return positions[0] + cycle.length - here if positions else cycle.length
+
+    @staticmethod
+    def _target_distance(engine, cycle, head):
+        """Cycle distance from the head to the nearest cell of the food (or portal)"""
+        size, cols = engine.snake_size, cycle.cols
+        level_manager = engine.level_manager
+        if level_manager and level_manager.portal:
+            x, y, w, h = level_manager.portal.rect
+        else:
+            x, y = engine.food.pos
+            w = h = engine.food_size
+        distances = [cycle.distance(head, row * cols + col)
+                     for row in range(y // size, min(cycle.rows, (y + h - 1) // size + 1))
+                     for col in range(x // size, min(cols, (x + w - 1) // size + 1))
+                     if cycle.pos[row * cols + col] >= 0]
+        return min(distances, default=None)
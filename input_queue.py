@@ -0,0 +1,57 @@
+import time
+from array import array
+from collections import deque
+
+from engine import OPPOSITE
+
+CAPACITY = 3  # turns buffered ahead of the snake; presses beyond this are dropped
+LATENCY_SAMPLES = 600
+
+
+class InputQueue:
+    """Turns pressed between ticks, handed to the engine one per tick.
+
+    push() checks a turn against the last one still queued (or the snake's
+    heading if none is), so two quick presses like UP then LEFT both
+    happen, one tick apart, and a press that would reverse onto the queued
+    turn or repeat it is dropped rather than using up a tick. Each turn is
+    stamped when its key event is handled; pop() records how long it waited
+    for the tick that applies it, and stats() summarises the last
+    LATENCY_SAMPLES of those waits.
+    """
+    def __init__(self, capacity=CAPACITY):
+        self.turns = deque()  # (direction, perf_counter_ns when pressed)
+        self.capacity = capacity
+        self.latencies = array('q', bytes(8 * LATENCY_SAMPLES))
+        self.index = 0
+        self.count = 0
+
+    def push(self, direction, heading, now=None):
+        """Queue a turn for a snake currently heading `heading`; returns whether it was kept"""
+        last = self.turns[-1][0] if self.turns else heading
+        if direction == last or direction == OPPOSITE[last] or len(self.turns) >= self.capacity:
+            return False
+        self.turns.append((direction, time.perf_counter_ns() if now is None else now))
+        return True
+
+    def pop(self, now=None):
+        """The turn for this tick, or None to keep going straight"""
+        if not self.turns:
+            return None
+        direction, pressed = self.turns.popleft()
+        self.latencies[self.index] = (time.perf_counter_ns() if now is None else now) - pressed
+        self.index = (self.index + 1) % LATENCY_SAMPLES
+        self.count = min(self.count + 1, LATENCY_SAMPLES)
+        return direction
+
+    def clear(self):
+        self.turns.clear()
+
+    def stats(self):
+        """(min, mean, p95, p99) input-to-move latency in milliseconds, or None before any turn"""
+        n = self.count
+        if not n:
+            return None
+        values = sorted(self.latencies[:n])
+        return (values[0] / 1e6, sum(values) / n / 1e6,
+                values[min(n - 1, n * 95 // 100)] / 1e6, values[min(n - 1, n * 99 // 100)] / 1e6)
@@ -1,59 +1,119 @@
 import json
 import os
+import sqlite3
+import threading
 from datetime import datetime
 
+SCHEMA_VERSION = 1
+
 
 class Leaderboard:
-    def __init__(self, leaderboard_file="Scores/leaderboard.json"):
-        self.leaderboard_file = leaderboard_file
-        self.scores = self.load_scores()
+    """Full score history in an indexed SQLite database.
+
+    Every finished game is one row. Top-K, rank and count queries go through
+    the (gamemode, difficulty, score) indexes, so nothing is loaded into
+    memory beyond the rows a query returns. Scores from an old
+    leaderboard.json next to the database are imported on first run.
+    The connection is shared with the persistence thread behind a lock.
+    """
+    def __init__(self, db_file="Scores/scores.db", legacy_file="Scores/leaderboard.json"):
+        self.db_file = db_file
+        self.legacy_file = legacy_file
         self.max_entries = 10
+        if os.path.dirname(db_file):
+            os.makedirs(os.path.dirname(db_file), exist_ok=True)
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(db_file, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self._migrate()
+
+    def _migrate(self):
+        version = self.db.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+        with self.db:
+            self.db.execute("""CREATE TABLE IF NOT EXISTS scores (
+                                   id INTEGER PRIMARY KEY,
+                                   score INTEGER NOT NULL,
+                                   difficulty TEXT NOT NULL,
+                                   gamemode TEXT NOT NULL,
+                                   date TEXT NOT NULL)""")
+            self.db.execute("CREATE INDEX IF NOT EXISTS scores_by_score ON scores (score DESC)")
+            self.db.execute("CREATE INDEX IF NOT EXISTS scores_by_mode ON scores (gamemode, score DESC)")
+            self.db.execute("CREATE INDEX IF NOT EXISTS scores_by_mode_difficulty"
+                            " ON scores (gamemode, difficulty, score DESC)")
+            self.db.executemany("INSERT INTO scores (score, difficulty, gamemode, date) VALUES (?, ?, ?, ?)",
+                                self._load_legacy_scores())
+            self.db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
 
-    def load_scores(self):
-        """Load leaderboard from file"""
+    def _load_legacy_scores(self):
+        """Rows from the old top-10 leaderboard.json, if there is one"""
         try:
-            if os.path.exists(self.leaderboard_file):
-                with open(self.leaderboard_file, 'r') as f:
-                    return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            pass
-        return []
-
-    def save_scores(self):
-        """Save leaderboard to file"""
-        os.makedirs(os.path.dirname(self.leaderboard_file), exist_ok=True)
-        with open(self.leaderboard_file, 'w') as f:
-            json.dump(self.scores, f, indent=2)
+            with open(self.legacy_file, 'r') as f:
+                entries = json.load(f)
+            return [(int(e["score"]), e["difficulty"], e["gamemode"], e["date"]) for e in entries]
+        except (OSError, ValueError, KeyError, TypeError):
+            return []
+
+    @staticmethod
+    def _filters(gamemode, difficulty):
+        """WHERE clause and parameters for an optional mode/difficulty filter"""
+        clauses, params = [], []
+        if gamemode is not None:
+            clauses.append("gamemode = ?")
+            params.append(getattr(gamemode, "value", gamemode))
+        if difficulty is not None:
+            clauses.append("difficulty = ?")
+            params.append(getattr(difficulty, "name", difficulty))
+        return clauses, params
 
     def add_score(self, score, difficulty, gamemode):
-        """Add a new score and keep only top 10"""
-        entry = {
-            "score": score,
-            "difficulty": difficulty.name,
-            "gamemode": gamemode.value,
-            "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
-        
-        self.scores.append(entry)
-        # Sort by score descending
-        self.scores.sort(key=lambda x: x["score"], reverse=True)
-        # Keep only top 10
-        self.scores = self.scores[:self.max_entries]
-        self.save_scores()
-
-    def get_top_scores(self, limit=10):
-        """Get top scores"""
-        return self.scores[:limit]
-
-    def is_high_score(self, score):
-        """Check if score qualifies for leaderboard"""
-        if len(self.scores) < self.max_entries:
-            return True
-        return score > self.scores[-1]["score"]
-
-    def get_rank(self, score):
-        """Get rank of a score if it's in leaderboard"""
-        for i, entry in enumerate(self.scores):
-            if entry["score"] == score:
-                return i + 1
-        return None
+        """Record a finished game"""
+        self.add_scores([(score, difficulty, gamemode)])
+
+    def add_scores(self, entries):
+        """Record several (score, difficulty, gamemode) games in one transaction"""
+        date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        rows = [(score, difficulty.name, gamemode.value, date) for score, difficulty, gamemode in entries]
+        with self.lock, self.db:
+            self.db.executemany("INSERT INTO scores (score, difficulty, gamemode, date) VALUES (?, ?, ?, ?)", rows)
+
+    def get_top_scores(self, limit=10, gamemode=None, difficulty=None):
+        """Best scores, optionally for one game mode and/or difficulty"""
+        clauses, params = self._filters(gamemode, difficulty)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self.lock:
+            rows = self.db.execute(f"SELECT score, difficulty, gamemode, date FROM scores {where}"
+                                   " ORDER BY score DESC, id LIMIT ?", params + [limit]).fetchall()
+        return [dict(row) for row in rows]
+
+    def count(self, gamemode=None, difficulty=None):
+        """Number of recorded games"""
+        clauses, params = self._filters(gamemode, difficulty)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self.lock:
+            return self.db.execute(f"SELECT COUNT(*) FROM scores {where}", params).fetchone()[0]
+
+    def is_high_score(self, score, gamemode=None, difficulty=None):
+        """Check if score qualifies for the top entries"""
+        clauses, params = self._filters(gamemode, difficulty)
+        clauses.append("score >= ?")
+        with self.lock:
+            at_least = self.db.execute(f"SELECT COUNT(*) FROM (SELECT 1 FROM scores WHERE {' AND '.join(clauses)}"
+                                       " LIMIT ?)", params + [score, self.max_entries]).fetchone()[0]
+        return at_least < self.max_entries
+
+    def get_rank(self, score, gamemode=None, difficulty=None):
+        """Rank a score would have (ties share a rank)"""
+        clauses, params = self._filters(gamemode, difficulty)
+        clauses.append("score > ?")
+        with self.lock:
+            better = self.db.execute(f"SELECT COUNT(*) FROM scores WHERE {' AND '.join(clauses)}",
+                                     params + [score]).fetchone()[0]
+        return better + 1
+
+    def close(self):
+        with self.lock:
+            self.db.close()
@@ -1,459 +1,406 @@
 # main.py
 
-import math
+import time
+
+STARTED = time.perf_counter()  # start of the time-to-first-frame measurement (--profile-startup)
+
+import argparse
 import os
-import random
 import sys
-import time
+from datetime import datetime
 
 import pygame
-from snake import Snake
-from food import Food
-from score import load_high_score, save_high_score, ScoreRenderer
+from engine import GameEngine
+from score import load_high_score
 from menu import Menu, MenuState
 from scoreboard import ScoreBoard
 from game_settings import Difficulty, GameMode
 from leaderboard import Leaderboard
-from obstacles import LevelManager
+from persistence import PersistenceWorker
+from replay import ReplayRecorder
+from autopilot import Autopilot
+from controllers import GreedyController
+from frame_profiler import FrameProfiler
+from input_queue import InputQueue
+from renderer import GameRenderer
+from camera import Camera
+from assets import AssetManager
+from particles import ParticleSystem
+from sound import SoundService
+from startup import BackgroundLoader, StartupProfile
 
 # Game settings
 SCREEN_WIDTH, SCREEN_HEIGHT = 400, 700  # Extended height for score board
 GAME_AREA_HEIGHT = 600  # Height for actual gameplay
 SNAKE_SIZE = 20
 FOOD_SIZE = 40
-SNAKE_SPEED = 20 # Changed to match SNAKE_SIZE for grid alignment
-game_over = False
-restart_clicked = False
-score = 0
-game_paused = False
-game_state = MenuState.MAIN  # Start at main menu
-current_difficulty = Difficulty.LEVEL_3
-current_gamemode = GameMode.CLASSIC
-records_button_clicked = None  # Track if records submenu back button was clicked
-
-# Campaign mode variables
-campaign_level = 1
-level_manager = None  # Will be initialized when campaign starts
+RENDER_FPS = 60  # Display rate; the simulation runs at the difficulty's tick rate
+MAX_TICKS_PER_FRAME = 5  # Drop simulation time rather than spiral after a long stall
+PARTICLE_RATE = 20  # Particle velocities/lifetimes are per 1/20s step
+MIN_BOARD_CELLS, MAX_BOARD_CELLS = 10, 500
+IDLE_WAIT_MS = 500  # longest a menu sleeps waiting for input (the F3 overlay refreshes this often)
+UNFOCUSED_WAIT_MS = 2000  # same, while the window is in the background
+# Everything else is dropped by SDL before it reaches the queue
+EVENTS = (pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION,
+          pygame.WINDOWFOCUSLOST, pygame.WINDOWFOCUSGAINED, pygame.WINDOWEXPOSED)
 
 # Score management (moved to score.py)
 scores_folder = "Scores"
-high_score = load_high_score(scores_folder)
-
-
-# Initialize pygame
-pygame.init()
-pygame.mixer.init()
-pygame.mixer.music.load("assets/Lose My Mind (feat. Doja Cat).mp3")
-pygame.mixer.music.play(-1)
-pygame.mixer.music.set_volume(0.5)
+replays_folder = os.path.join(scores_folder, "replays")
 
 # Wave animation settings for food
 WAVE_AMPLITUDE = 0  # Amplitude of the wave motion
 WAVE_FREQUENCY = 0  # Frequency of the wave motion
-wave_phase = 0  # Phase of the wave
-
-# Snake body wave animation settings
-SNAKE_WAVE_AMPLITUDE = 0  # Amplitude for snake body wave motion
-SNAKE_WAVE_FREQUENCY = 0  # Frequency for snake body wave motion
-snake_wave_phase = 0  # Initial phase for snake body wave
-
-# Set up the display
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Snake Game")
-
-
-# Load sprite images
-snake_head_sprite = pygame.image.load("assets/snake_head.png")
-snake_head_sprite = pygame.transform.scale(snake_head_sprite, (SNAKE_SIZE, SNAKE_SIZE))
-
-food_sprite = pygame.image.load("assets/snake_food.png")
-food_sprite = pygame.transform.scale(food_sprite, (FOOD_SIZE, FOOD_SIZE))
-
-snake_body_sprite = pygame.image.load("assets/snake_body.png")
-snake_body_sprite = pygame.transform.scale(snake_body_sprite, (SNAKE_SIZE, SNAKE_SIZE))
-
-restart_button_sprite = pygame.image.load("assets/snake_restart_button.png")
-
-background_image = pygame.image.load("assets/Pixel_Art_Forest_Trees_And_Sky_Landscape_high_resolution_preview_3293114.jpg")
-background_image = pygame.transform.scale(
-    background_image, (SCREEN_WIDTH, SCREEN_HEIGHT)
-)
-
-# Load sound effects
-eat_sound = pygame.mixer.Sound("assets/eat_sound.wav")
-
-button_click_sound = pygame.mixer.Sound("assets/button_click_sound.wav")
-
-# Snake setup
-snake = Snake([100, 60], SNAKE_SIZE, SNAKE_SPEED, snake_head_sprite, snake_body_sprite)
-
-# Food setup
-food = Food(SCREEN_WIDTH, GAME_AREA_HEIGHT, SNAKE_SIZE, FOOD_SIZE, food_sprite)
 
 # Font settings
 font_path = "assets/font.ttf"
 font_size = 27
-font_color = (255, 255, 255)  # White color
-
-# Score renderer (delegated to score.py)
-score_renderer = ScoreRenderer(font_path, font_color)
-
-# Menu setup
-menu = Menu(SCREEN_WIDTH, SCREEN_HEIGHT, font_path, background_image, GAME_AREA_HEIGHT)
-
-# Scoreboard setup (for the stats panel below the game)
-scoreboard = ScoreBoard(0, GAME_AREA_HEIGHT, SCREEN_WIDTH, SCREEN_HEIGHT - GAME_AREA_HEIGHT, font_path, font_size - 2)
-
-# Leaderboard setup
-leaderboard = Leaderboard()
-
-
-# Particle System
-class Particle:
-    def __init__(self, x, y, color, direction):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.size = random.randint(2, 5)
-        self.lifetime = random.randint(5, 10)
-
-        # Adjust velocity based on the snake's direction
-        velocity = random.uniform(1, 3)
-        if direction == "UP":
-            self.x_vel = random.uniform(-1, 1)
-            self.y_vel = -velocity
-        elif direction == "DOWN":
-            self.x_vel = random.uniform(-1, 1)
-            self.y_vel = velocity
-        elif direction == "LEFT":
-            self.x_vel = -velocity
-            self.y_vel = random.uniform(-1, 1)
-        elif direction == "RIGHT":
-            self.x_vel = velocity
-            self.y_vel = random.uniform(-1, 1)
+
+BACKGROUND_IMAGE = "Pixel_Art_Forest_Trees_And_Sky_Landscape_high_resolution_preview_3293114.jpg"
+MUSIC = "assets/Lose My Mind (feat. Doja Cat).mp3"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Snake")
+    # World size in cells; anything but the game area's own size is shown through a camera that follows the head
+    parser.add_argument("--board", default=f"{SCREEN_WIDTH // SNAKE_SIZE}x{GAME_AREA_HEIGHT // SNAKE_SIZE}",
+                        help=f"world size in cells, COLSxROWS ({MIN_BOARD_CELLS} to {MAX_BOARD_CELLS} each way)")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print the time to the first frame and an import breakdown once everything has loaded, then quit")
+    args = parser.parse_args(argv)
+    try:
+        args.world_cols, args.world_rows = (int(v) for v in args.board.lower().split("x"))
+    except ValueError:
+        parser.error(f"--board must look like 20x30, not {args.board!r}")
+    if not all(MIN_BOARD_CELLS <= n <= MAX_BOARD_CELLS for n in (args.world_cols, args.world_rows)):
+        parser.error(f"--board sides must be between {MIN_BOARD_CELLS} and {MAX_BOARD_CELLS} cells")
+    return args
+
+
+def load_sprites(assets):
+    """Background job: gameplay sprites (converted to the display format, scaled copies cached on disk)"""
+    return {
+        "head": assets.image("snake_head.png", (SNAKE_SIZE, SNAKE_SIZE)),
+        "food": assets.image("snake_food.png", (FOOD_SIZE, FOOD_SIZE)),
+        "body": assets.image("snake_body.png", (SNAKE_SIZE, SNAKE_SIZE)),
+        "restart_button": assets.image("snake_restart_button.png"),
+    }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    world_width, world_height = args.world_cols * SNAKE_SIZE, args.world_rows * SNAKE_SIZE
+    profile = StartupProfile(STARTED)
+    profile.mark("imports and arguments")
+
+    # Low-latency mixer settings have to be in place before the mixer opens (in the background, below)
+    sound = SoundService()
+    sound.pre_init()
+
+    # Only what the main menu needs comes before the first frame: the window, the
+    # background and the menu's fonts. pygame.init() would also open the audio device.
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Snake Game")
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed(EVENTS)
+    profile.mark("window")
+
+    assets = AssetManager()
+    background_image = assets.image(BACKGROUND_IMAGE, (SCREEN_WIDTH, SCREEN_HEIGHT), alpha=False)
+    menu = Menu(SCREEN_WIDTH, SCREEN_HEIGHT, font_path, background_image, GAME_AREA_HEIGHT)
+    menu.draw_main_menu(screen)
+    pygame.display.update()
+    profile.mark("first frame")
+
+    # Music and sound effects, gameplay sprites and the leaderboard load behind the menu
+    loader = BackgroundLoader()
+    loader.submit("audio", sound.load, MUSIC)
+    loader.submit("sprites", load_sprites, assets)
+    loader.submit("leaderboard", Leaderboard)
+
+    game_state = MenuState.MAIN  # Start at main menu
+    current_difficulty = Difficulty.LEVEL_3
+    current_gamemode = GameMode.CLASSIC
+    high_score = load_high_score(scores_folder)
+    wave_phase = 0  # Phase of the wave
+
+    # Game setup (all rules live in engine.py; this file only drives it); made when a game starts
+    engine = None
+    recorder = None  # every game is kept as seed + direction changes
+
+    # Frame phase timings: F3 toggles the overlay, F4 CSV recording (no cost while both are off)
+    profiler = FrameProfiler(font_path)
+
+    # Scoreboard setup (for the stats panel below the game)
+    scoreboard = ScoreBoard(0, GAME_AREA_HEIGHT, SCREEN_WIDTH, SCREEN_HEIGHT - GAME_AREA_HEIGHT, font_path, font_size - 2)
+
+    # Score and high score writes happen on a background thread
+    persistence = PersistenceWorker()
+
+    # Gameplay renderer (cached background + obstacles, dirty-rect display updates; culled
+    # redraws through the camera when the world isn't the game area's size)
+    camera = Camera(SCREEN_WIDTH, GAME_AREA_HEIGHT, world_width, world_height)
+    game_renderer = GameRenderer(screen, background_image, scoreboard, SNAKE_SIZE, FOOD_SIZE, GAME_AREA_HEIGHT, camera)
+
+    # Particle system (fixed-capacity pool, drawn in one batch)
+    particles = ParticleSystem()
+
+    # Turns pressed on the keyboard, applied one per tick (the F3 overlay shows their latency)
+    input_queue = InputQueue()
+    profiler.watch("input", input_queue.stats)
+
+    # Press A during a game to let the autopilot steer (and again to take back control)
+    autopilot = None
+
+    # Fixed-timestep clock: frames run at RENDER_FPS, unconsumed time carries over
+    clock = pygame.time.Clock()
+    accumulator = 0.0
+    profile.mark("ready for input")
+
+    if args.profile_startup:
+        loader.wait()
+        profile.report(loader)
+        persistence.close()
+        pygame.quit()
+        return
+
+    def new_engine():
+        """Build a game engine for the current settings, wired to the loaded sprites"""
+        sprites = loader.result("sprites")
+        return GameEngine(current_difficulty, current_gamemode,
+                          world_width, world_height, SNAKE_SIZE, FOOD_SIZE,
+                          sprites["head"], sprites["body"], sprites["food"])
+
+    def new_autopilot():
+        # The autopilot plans over a bounded board; endless worlds get the greedy controller
+        return GreedyController() if engine.world else Autopilot()
+
+    def start_new_game():
+        nonlocal engine, recorder, wave_phase, game_state, autopilot
+        engine = new_engine()
+        recorder = ReplayRecorder(engine)
+        if autopilot:
+            autopilot = new_autopilot()  # stays on, with no plans left over from the last game
+        particles.clear()
+        wave_phase = 0
+        input_queue.clear()
+        game_renderer.invalidate()
+        game_renderer.reset_motion()
+        sound.music("play")
+        game_state = MenuState.PLAYING
+
+    def pause_game():
+        nonlocal game_state
+        game_state = MenuState.PAUSED
+        input_queue.clear()  # turns from before the pause would count the pause as latency
+        sound.music("pause")
+
+    # Game loop
+    focused = True
+    while True:
+        if game_state == MenuState.PLAYING:
+            frame_time = clock.tick(RENDER_FPS) / 1000.0
+            events = pygame.event.get()
+        else:
+            # Menus and the pause screen only change on input, so sleep until some arrives
+            # rather than redrawing them at RENDER_FPS
+            event = pygame.event.wait(IDLE_WAIT_MS if focused else UNFOCUSED_WAIT_MS)
+            events = [] if event.type == pygame.NOEVENT else [event] + pygame.event.get()
+            if not events and not profiler.overlay_visible:
+                continue
+            clock.tick()  # time spent waiting isn't simulation time
+            frame_time = 0.0
+        profiler.start_frame()
+        sound.next_frame()
+        mouse_pos = pygame.mouse.get_pos()
+
+        for event in events:
+            if event.type == pygame.QUIT:
+                persistence.close()
+                pygame.quit()
+                sys.exit()
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                # Handle menu clicks
+                if game_state in [MenuState.MAIN, MenuState.SUBMENU_PLAY, MenuState.SUBMENU_DIFFICULTY,
+                                  MenuState.SUBMENU_GAMEMODE, MenuState.SUBMENU_RECORDS, MenuState.PAUSED, MenuState.GAME_OVER]:
+                    action = menu.handle_click(mouse_pos, game_state)
+
+                    if action == 'start_game':
+                        # Initialize a new game with current settings
+                        current_difficulty = menu.current_difficulty
+                        current_gamemode = menu.current_gamemode
+                        start_new_game()
+                        sound.play("click")
+
+                    elif action == 'open_play_menu':
+                        game_state = MenuState.SUBMENU_PLAY
+                        sound.play("click")
+                    elif action == 'open_difficulty_menu':
+                        game_state = MenuState.SUBMENU_DIFFICULTY
+                        sound.play("click")
+                    elif action == 'open_gamemode_menu':
+                        game_state = MenuState.SUBMENU_GAMEMODE
+                        sound.play("click")
+                    elif action == 'open_records_menu':
+                        persistence.flush()  # Show the game that just ended
+                        game_state = MenuState.SUBMENU_RECORDS
+                        sound.play("click")
+
+                    elif action == 'difficulty_selected':
+                        sound.play("click")
+                    elif action == 'gamemode_selected':
+                        sound.play("click")
+
+                    elif action == 'back_to_play':
+                        game_state = MenuState.SUBMENU_PLAY
+                        sound.play("click")
+                    elif action == 'back_to_main':
+                        game_state = MenuState.MAIN
+                        sound.music("stop")
+                        sound.play("click")
+
+                    elif action == 'resume':
+                        game_state = MenuState.PLAYING
+                        sound.music("unpause")
+                        sound.play("click")
+                    elif action == 'restart':
+                        start_new_game()
+                        sound.play("click")
+
+                    elif action == 'quit':
+                        persistence.close()
+                        pygame.quit()
+                        sys.exit()
+
+            elif event.type == pygame.WINDOWFOCUSLOST:
+                # A game in the background pauses, which also drops the loop to the idle wait below
+                focused = False
+                if game_state == MenuState.PLAYING:
+                    pause_game()
+            elif event.type == pygame.WINDOWFOCUSGAINED:
+                focused = True
+            elif event.type == pygame.WINDOWEXPOSED:
+                game_renderer.invalidate()  # the window's contents were lost; redraw all of it
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_F3:
+                    profiler.toggle_overlay()
+                    game_renderer.invalidate()
+                elif event.key == pygame.K_F4:
+                    profiler.toggle_csv()
+                # Pause/Resume with ESC key
+                elif event.key == pygame.K_ESCAPE and game_state == MenuState.PLAYING:
+                    pause_game()
+                elif game_state == MenuState.PLAYING:
+                    # Snake direction controls only during gameplay
+                    if event.key == pygame.K_UP:
+                        input_queue.push("UP", engine.snake.direction)
+                    elif event.key == pygame.K_DOWN:
+                        input_queue.push("DOWN", engine.snake.direction)
+                    elif event.key == pygame.K_LEFT:
+                        input_queue.push("LEFT", engine.snake.direction)
+                    elif event.key == pygame.K_RIGHT:
+                        input_queue.push("RIGHT", engine.snake.direction)
+                    elif event.key == pygame.K_a:
+                        autopilot = None if autopilot else new_autopilot()
+
+        profiler.mark("events")
+
+        # Update menu hover states
+        if game_state in [MenuState.MAIN, MenuState.SUBMENU_PLAY, MenuState.SUBMENU_DIFFICULTY,
+                          MenuState.SUBMENU_GAMEMODE, MenuState.PAUSED, MenuState.GAME_OVER]:
+            menu.update(mouse_pos, game_state)
+
+        # Game logic only runs during gameplay, one engine tick per 1/tick_rate seconds
+        alpha = 1.0
+        if game_state == MenuState.PLAYING:
+            tick_time = 1.0 / engine.tick_rate
+            accumulator = min(accumulator + frame_time, MAX_TICKS_PER_FRAME * tick_time)
+            while accumulator >= tick_time:
+                accumulator -= tick_time
+                if autopilot:
+                    input_queue.clear()
+                    action = autopilot.act(engine)
+                else:
+                    action = input_queue.pop()
+                state = recorder.step(action)
+                game_renderer.note_step(engine, state)
+                if engine.level_manager:
+                    engine.level_manager.update()  # the portal pulses one step per tick
+
+                if state.ate_food:
+                    # Update high score if current score exceeds it
+                    if state.score > high_score:
+                        high_score = state.score
+                    particles.emit(engine.snake.pos[0], engine.snake.pos[1], engine.snake.direction, 20)
+                    sound.play("eat")
+
+                # Update wave phase
+                wave_phase += WAVE_FREQUENCY
+
+                # If game over, transition to game over menu
+                if state.game_over:
+                    persistence.add_score(loader.result("leaderboard"), state.score, current_difficulty, current_gamemode)
+                    sound.music("stop")
+                    persistence.save_high_score(scores_folder, high_score)
+                    replay_name = f"{datetime.now():%Y%m%d-%H%M%S}_{current_gamemode.value}_{engine.seed}.snkr"
+                    persistence.write_file(os.path.join(replays_folder, replay_name), recorder.replay.to_bytes())
+                    game_state = MenuState.GAME_OVER
+                    break
+            alpha = accumulator / tick_time
         else:
-            self.x_vel = random.uniform(-1, 1)
-            self.y_vel = random.uniform(-1, 1)
-
-    def update(self):
-        self.x += self.x_vel
-        self.y += self.y_vel
-        self.lifetime -= 1
-
-    def draw(self, surface):
-        pygame.draw.rect(surface, self.color, [self.x, self.y, self.size, self.size])
-
-
-# New list to hold particles
-particles = []
-
-
-# Game loop
-while True:
-    mouse_pos = pygame.mouse.get_pos()
-    
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            pygame.quit()
-            sys.exit()
-        elif event.type == pygame.MOUSEBUTTONDOWN:
-            # Handle menu clicks
-            if game_state in [MenuState.MAIN, MenuState.SUBMENU_PLAY, MenuState.SUBMENU_DIFFICULTY, 
-                              MenuState.SUBMENU_GAMEMODE, MenuState.SUBMENU_RECORDS, MenuState.PAUSED, MenuState.GAME_OVER]:
-                action = menu.handle_click(mouse_pos, game_state)
-                
-                if action == 'start_game':
-                    # Initialize a new game with current settings
-                    score = 0
-                    game_over = False
-                    game_paused = False
-                    snake = Snake([100, 60], SNAKE_SIZE, menu.current_difficulty.value, snake_head_sprite, snake_body_sprite)
-                    food = Food(SCREEN_WIDTH, GAME_AREA_HEIGHT, SNAKE_SIZE, FOOD_SIZE, food_sprite)
-                    particles = []
-                    wave_phase = 0
-                    current_difficulty = menu.current_difficulty
-                    current_gamemode = menu.current_gamemode
-                    
-                    # Initialize campaign mode if selected
-                    if current_gamemode == GameMode.CAMPAIGN:
-                        campaign_level = 1
-                        level_manager = LevelManager(SCREEN_WIDTH, GAME_AREA_HEIGHT, SNAKE_SIZE)
-                        level_manager.start_level(campaign_level)
-                    else:
-                        level_manager = None
-                    
-                    pygame.mixer.music.play(-1)
-                    game_state = MenuState.PLAYING
-                    button_click_sound.play()
-                
-                elif action == 'open_play_menu':
-                    game_state = MenuState.SUBMENU_PLAY
-                    button_click_sound.play()
-                elif action == 'open_difficulty_menu':
-                    game_state = MenuState.SUBMENU_DIFFICULTY
-                    button_click_sound.play()
-                elif action == 'open_gamemode_menu':
-                    game_state = MenuState.SUBMENU_GAMEMODE
-                    button_click_sound.play()
-                elif action == 'open_records_menu':
-                    game_state = MenuState.SUBMENU_RECORDS
-                    records_button_clicked = None
-                    button_click_sound.play()
-                
-                elif action == 'difficulty_selected':
-                    button_click_sound.play()
-                elif action == 'gamemode_selected':
-                    button_click_sound.play()
-                
-                elif action == 'back_to_play':
-                    game_state = MenuState.SUBMENU_PLAY
-                    button_click_sound.play()
-                elif action == 'back_to_main':
-                    game_state = MenuState.MAIN
-                    pygame.mixer.music.stop()
-                    button_click_sound.play()
-                
-                elif action == 'resume':
-                    game_paused = False
-                    game_state = MenuState.PLAYING
-                    pygame.mixer.music.unpause()
-                    button_click_sound.play()
-                elif action == 'restart':
-                    score = 0
-                    game_over = False
-                    game_paused = False
-                    snake = Snake([100, 60], SNAKE_SIZE, menu.current_difficulty.value, snake_head_sprite, snake_body_sprite)
-                    food = Food(SCREEN_WIDTH, GAME_AREA_HEIGHT, SNAKE_SIZE, FOOD_SIZE, food_sprite)
-                    particles = []
-                    wave_phase = 0
-                    pygame.mixer.music.play(-1)
-                    game_state = MenuState.PLAYING
-                    button_click_sound.play()
-                
-                elif action == 'quit':
-                    pygame.quit()
-                    sys.exit()
-            
-            # Handle records submenu back button click
-            if game_state == MenuState.SUBMENU_RECORDS:
-                back_btn = menu.draw_records_submenu(screen, leaderboard)
-                if back_btn.is_clicked(mouse_pos):
-                    game_state = MenuState.SUBMENU_PLAY
-                    button_click_sound.play()
-        
-        elif event.type == pygame.KEYDOWN:
-            # Pause/Resume with ESC key
-            if event.key == pygame.K_ESCAPE and game_state == MenuState.PLAYING:
-                game_paused = True
-                game_state = MenuState.PAUSED
-                pygame.mixer.music.pause()
-            elif game_state == MenuState.PLAYING:
-                # Snake direction controls only during gameplay
-                if event.key == pygame.K_UP and snake.direction != "DOWN":
-                    snake.change_to = "UP"
-                elif event.key == pygame.K_DOWN and snake.direction != "UP":
-                    snake.change_to = "DOWN"
-                elif event.key == pygame.K_LEFT and snake.direction != "RIGHT":
-                    snake.change_to = "LEFT"
-                elif event.key == pygame.K_RIGHT and snake.direction != "LEFT":
-                    snake.change_to = "RIGHT"
-
-    # Update menu hover states
-    if game_state in [MenuState.MAIN, MenuState.SUBMENU_PLAY, MenuState.SUBMENU_DIFFICULTY, 
-                      MenuState.SUBMENU_GAMEMODE, MenuState.PAUSED, MenuState.GAME_OVER]:
-        menu.update(mouse_pos, game_state)
-
-    # Game logic only runs during gameplay
-    if game_state == MenuState.PLAYING and not game_over:
-        # Update the direction and move the snake
-        snake.update_direction()
-        snake.move()
-
-        # Check collision with food - AABB
-        if (
-            snake.pos[0] < food.pos[0] + FOOD_SIZE
-            and snake.pos[0] + SNAKE_SIZE > food.pos[0]
-            and snake.pos[1] < food.pos[1] + FOOD_SIZE
-            and snake.pos[1] + SNAKE_SIZE > food.pos[1]
-        ):
-            score += 1
-            # Update high score if current score exceeds it
-            if score > high_score:
-                high_score = score
-            food.spawn = False
-            
-            # Campaign mode: track food eaten
-            if current_gamemode == GameMode.CAMPAIGN and level_manager:
-                level_manager.on_food_eaten()
-            
-            for _ in range(20):  # Create 20 particles
-                color = random.choice([(255, 0, 0), (0, 255, 0), (0, 0, 255)])
-                particles.append(Particle(snake.pos[0], snake.pos[1], color, snake.direction))
-            print("Food eaten at", food.pos)  # Debug message
+            accumulator = 0.0
+
+        profiler.mark("logic")
+
+        # Update particles
+        if game_state == MenuState.PLAYING:
+            particles.update(frame_time * PARTICLE_RATE)
+        profiler.mark("particles")
+
+        # Rendering
+        dirty_rects = None
+        if game_state == MenuState.PLAYING:
+            if profiler.overlay_rect:
+                game_renderer.mark_dirty(profiler.overlay_rect)  # so the translucent overlay isn't stacked
+            # Gameplay frames only push the rects that changed (see renderer.py)
+            dirty_rects = game_renderer.draw(engine, particles, alpha, wave_phase, WAVE_AMPLITUDE)
         else:
-            snake.shrink_tail()
-
-        # Update wave phase
-        wave_phase += WAVE_FREQUENCY
-
-        # Update snake wave phase
-        snake_wave_phase += SNAKE_WAVE_FREQUENCY
-
-        # Food spawn
-        if not food.spawn:
-            # In campaign mode, avoid spawning food on obstacles
-            if current_gamemode == GameMode.CAMPAIGN and level_manager:
-                attempts = 0
-                while attempts < 100:
-                    food.respawn(snake.body)
-                    food_rect = pygame.Rect(food.pos[0], food.pos[1], FOOD_SIZE, FOOD_SIZE)
-                    if not level_manager.check_obstacle_collision(food_rect):
-                        break
-                    attempts += 1
-            else:
-                food.respawn(snake.body)
-            print("New food position:", food.pos)  # Debug message
-            eat_sound.play()
-
-        # Collision detection based on game mode
-        # CLASSIC: Can go through walls, only dies on body collision
-        # MODERN: Dies on wall collision and body collision
-        # CAMPAIGN: Can go through walls, dies on obstacle and body collision
-        
-        if current_gamemode == GameMode.CLASSIC:
-            # Wrap around walls (teleport to other side)
-            wrapped = False
-            if snake.pos[0] < 0:
-                snake.pos[0] = SCREEN_WIDTH - SNAKE_SIZE
-                wrapped = True
-            elif snake.pos[0] >= SCREEN_WIDTH:
-                snake.pos[0] = 0
-                wrapped = True
-            if snake.pos[1] < 0:
-                snake.pos[1] = GAME_AREA_HEIGHT - SNAKE_SIZE
-                wrapped = True
-            elif snake.pos[1] >= GAME_AREA_HEIGHT:
-                snake.pos[1] = 0
-                wrapped = True
-            
-            # If wrapped, update body to follow head immediately
-            if wrapped and len(snake.body) > 0:
-                snake.body[0] = snake.pos[:]
-            
-            # Only check self collision
-            if snake.check_self_collision():
-                game_over = True
-                leaderboard.add_score(score, current_difficulty, current_gamemode)
-        
-        elif current_gamemode == GameMode.MODERN:
-            # Check wall collision
-            if snake.check_wall_collision(SCREEN_WIDTH, GAME_AREA_HEIGHT):
-                game_over = True
-                leaderboard.add_score(score, current_difficulty, current_gamemode)
-            # Check self collision
-            if snake.check_self_collision():
-                game_over = True
-                leaderboard.add_score(score, current_difficulty, current_gamemode)
-        
-        elif current_gamemode == GameMode.CAMPAIGN:
-            # Wrap around walls (like CLASSIC)
-            wrapped = False
-            if snake.pos[0] < 0:
-                snake.pos[0] = SCREEN_WIDTH - SNAKE_SIZE
-                wrapped = True
-            elif snake.pos[0] >= SCREEN_WIDTH:
-                snake.pos[0] = 0
-                wrapped = True
-            if snake.pos[1] < 0:
-                snake.pos[1] = GAME_AREA_HEIGHT - SNAKE_SIZE
-                wrapped = True
-            elif snake.pos[1] >= GAME_AREA_HEIGHT:
-                snake.pos[1] = 0
-                wrapped = True
-            
-            # If wrapped, update body to follow head immediately
-            if wrapped and len(snake.body) > 0:
-                snake.body[0] = snake.pos[:]
-            
-            # Check obstacle collision
-            if level_manager:
-                snake_rect = pygame.Rect(snake.pos[0], snake.pos[1], SNAKE_SIZE, SNAKE_SIZE)
-                if level_manager.check_obstacle_collision(snake_rect):
-                    game_over = True
-                    leaderboard.add_score(score, current_difficulty, current_gamemode)
-                
-                # Check portal collision (advance to next level)
-                if level_manager.check_portal_collision(snake_rect):
-                    if level_manager.is_final_level():
-                        # Won the campaign!
-                        game_over = True
-                        leaderboard.add_score(score, current_difficulty, current_gamemode)
-                    else:
-                        # Advance to next level
-                        level_manager.next_level()
-                        # Reset snake position
-                        snake.pos = [100, 60]
-                        snake.body = [snake.pos[:]]
-                        snake.direction = "RIGHT"
-                        snake.change_to = "RIGHT"
-            
-            # Check self collision
-            if snake.check_self_collision():
-                game_over = True
-                leaderboard.add_score(score, current_difficulty, current_gamemode)
-
-        # If game over, transition to game over menu
-        if game_over:
-            pygame.mixer.music.stop()
-            save_high_score(scores_folder, high_score)
-            game_state = MenuState.GAME_OVER
-
-    # Rendering
-    screen.blit(background_image, (0, 0))
-
-    # Draw gameplay elements only if not in menu
-    if game_state == MenuState.PLAYING:
-        # Draw obstacles and portal in campaign mode
-        if current_gamemode == GameMode.CAMPAIGN and level_manager:
-            level_manager.update()
-            level_manager.draw(screen)
-        
-        # Draw snake (body + head)
-        snake.draw(screen)
-
-        # Draw food
-        food.draw(screen, wave_phase, WAVE_AMPLITUDE)
-
-        # Update and draw particles
-        for particle in particles[:]:
-            particle.update()
-            particle.draw(screen)
-            if particle.lifetime <= 0:
-                particles.remove(particle)
-
-    # Draw menu based on game state
-    if game_state == MenuState.MAIN:
-        menu.draw_main_menu(screen)
-    elif game_state == MenuState.SUBMENU_PLAY:
-        menu.draw_play_submenu(screen)
-    elif game_state == MenuState.SUBMENU_DIFFICULTY:
-        menu.draw_difficulty_submenu(screen)
-    elif game_state == MenuState.SUBMENU_GAMEMODE:
-        menu.draw_gamemode_submenu(screen)
-    elif game_state == MenuState.SUBMENU_RECORDS:
-        menu.draw_records_submenu(screen, leaderboard)
-    elif game_state == MenuState.PAUSED:
-        menu.draw_pause_menu(screen)
-    elif game_state == MenuState.GAME_OVER:
-        menu.draw_gameover_menu(screen, score)
-    
-    # Draw scoreboard at the bottom (only during gameplay)
-    if game_state == MenuState.PLAYING:
-        if current_gamemode == GameMode.CAMPAIGN and level_manager:
-            scoreboard.draw(screen, score, level_manager)
+            # Menu screens are cached, fully composed surfaces; the next gameplay frame must be drawn in full
+            game_renderer.invalidate()
+        profiler.mark("render")
+
+        # Draw menu based on game state
+        if game_state == MenuState.MAIN:
+            menu.draw_main_menu(screen)
+        elif game_state == MenuState.SUBMENU_PLAY:
+            menu.draw_play_submenu(screen)
+        elif game_state == MenuState.SUBMENU_DIFFICULTY:
+            menu.draw_difficulty_submenu(screen)
+        elif game_state == MenuState.SUBMENU_GAMEMODE:
+            menu.draw_gamemode_submenu(screen)
+        elif game_state == MenuState.SUBMENU_RECORDS:
+            menu.draw_records_submenu(screen, loader.result("leaderboard"))
+        elif game_state == MenuState.PAUSED:
+            menu.draw_pause_menu(screen)
+        elif game_state == MenuState.GAME_OVER:
+            menu.draw_gameover_menu(screen, engine.state.score, won=engine.state.won, cause=engine.state.death_cause)
+
+        profiler.mark("menu")
+
+        # Refresh game screen (gameplay frames only push what the renderer changed)
+        overlay_rect = profiler.draw(screen)
+        if dirty_rects is None:
+            pygame.display.update()
         else:
-            scoreboard.draw(screen, score)
+            if overlay_rect:
+                dirty_rects.append(overlay_rect)
+            if dirty_rects:
+                pygame.display.update(dirty_rects)
+        profiler.mark("present")
+        profiler.end_frame()
 
-    # Refresh game screen
-    pygame.display.update()
-    pygame.time.Clock().tick(20)
+
+if __name__ == "__main__":
+    main()
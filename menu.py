@@ -1,7 +1,14 @@
 import pygame
+from text_cache import get_font, render_text
 from enum import Enum
 from game_settings import Difficulty, GameMode, DIFFICULTY_NAMES, GAMEMODE_DESCRIPTIONS
 
+# Subtitle of the game over screen for each way of winning (GameState.death_cause)
+WIN_MESSAGES = {
+    "board_full": "The board is full",
+    "campaign_complete": "Campaign complete",
+}
+
 
 class MenuState(Enum):
     MAIN = 1
@@ -29,7 +36,7 @@ class Button:
         pygame.draw.rect(surface, color, self.rect)
         pygame.draw.rect(surface, (255, 255, 255), self.rect, 2)  # Border
 
-        text_surface = self.font.render(self.text, True, self.font_color)
+        text_surface = render_text(self.font, self.text, self.font_color)
         text_rect = text_surface.get_rect(center=self.rect.center)
         surface.blit(text_surface, text_rect)
 
@@ -46,9 +53,9 @@ class Menu:
         self.screen_height = screen_height
         self.game_area_height = game_area_height
         self.background_image = background_image
-        self.font = pygame.font.Font(font_path, 36)
-        self.small_font = pygame.font.Font(font_path, 18)
-        self.tiny_font = pygame.font.Font(font_path, 14)
+        self.font = get_font(font_path, 36)
+        self.small_font = get_font(font_path, 18)
+        self.tiny_font = get_font(font_path, 14)
         self.state = MenuState.MAIN
         self.current_difficulty = Difficulty.LEVEL_3
         self.current_gamemode = GameMode.CLASSIC
@@ -84,6 +91,7 @@ class Menu:
             (GameMode.CLASSIC, Button(gm_x, 150, gm_w, gm_h, "CLASSIC", self.small_font)),
             (GameMode.MODERN, Button(gm_x, 210, gm_w, gm_h, "MODERN", self.small_font)),
             (GameMode.CAMPAIGN, Button(gm_x, 270, gm_w, gm_h, "CAMPAIGN", self.small_font)),
+            (GameMode.ENDLESS, Button(gm_x, 330, gm_w, gm_h, "ENDLESS", self.small_font)),
         ]
         self.gamemode_back_button = Button(gm_x, game_area_height - 80, 120, 36, "BACK", self.small_font)
 
@@ -99,23 +107,71 @@ class Menu:
         self.gameover_restart_button = Button(go_x, game_area_height // 2 + 20, go_w, go_h, "RESTART", self.small_font)
         self.gameover_menu_button = Button(go_x, game_area_height // 2 + 80, go_w, go_h, "MENU", self.small_font)
 
-    # Draw methods
+        # Records back button
+        self.records_back_button = Button(screen_width // 2 - 50, screen_height - 80, 100, 40, "BACK", self.small_font)
+
+        # Finished screens per MenuState as (key, surface); rebuilt only when a button's
+        # hover state, the selection or the screen's content key changes
+        self._screen_cache = {}
+
+    # Draw methods (each blits a cached, fully composed screen)
+    def _cached_screen(self, state, key, compose, *args):
+        cached = self._screen_cache.get(state)
+        if cached is None or cached[0] != key:
+            screen = self.background_image.copy()
+            compose(screen, *args)
+            cached = (key, screen)
+            self._screen_cache[state] = cached
+        return cached[1]
+
+    def invalidate(self, state=None):
+        """Drop the cached screen for state (or all screens)"""
+        if state is None:
+            self._screen_cache.clear()
+        else:
+            self._screen_cache.pop(state, None)
+
     def draw_main_menu(self, surface):
-        surface.blit(self.background_image, (0, 0))
+        surface.blit(self._cached_screen(MenuState.MAIN, None, self._compose_main_menu), (0, 0))
+
+    def draw_play_submenu(self, surface):
+        surface.blit(self._cached_screen(MenuState.SUBMENU_PLAY, None, self._compose_play_submenu), (0, 0))
+
+    def draw_difficulty_submenu(self, surface):
+        surface.blit(self._cached_screen(MenuState.SUBMENU_DIFFICULTY, None, self._compose_difficulty_submenu), (0, 0))
+
+    def draw_gamemode_submenu(self, surface):
+        surface.blit(self._cached_screen(MenuState.SUBMENU_GAMEMODE, None, self._compose_gamemode_submenu), (0, 0))
+
+    def draw_records_submenu(self, surface, leaderboard):
+        # Records change between visits, so the screen is rebuilt each time the submenu is opened
+        surface.blit(self._cached_screen(MenuState.SUBMENU_RECORDS, id(leaderboard),
+                                         self._compose_records_submenu, leaderboard), (0, 0))
+        return self.records_back_button
+
+    def draw_pause_menu(self, surface):
+        surface.blit(self._cached_screen(MenuState.PAUSED, None, self._compose_pause_menu), (0, 0))
+
+    def draw_gameover_menu(self, surface, score, high_score=None, won=False, cause=None):
+        surface.blit(self._cached_screen(MenuState.GAME_OVER, (score, won, cause), self._compose_gameover_menu,
+                                         score, won, cause), (0, 0))
+
+    # Screen composition
+    def _compose_main_menu(self, surface):
         overlay = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 200))
         surface.blit(overlay, (0, 0))
-        title_surface = self.font.render("SNAKE GAME", True, (255, 255, 255))
+        title_surface = render_text(self.font, "SNAKE GAME", (255, 255, 255))
         title_rect = title_surface.get_rect(center=(self.screen_width // 2, 100))
         surface.blit(title_surface, title_rect)
         self.main_play_button.draw(surface)
         self.main_quit_button.draw(surface)
 
-    def draw_play_submenu(self, surface):
+    def _compose_play_submenu(self, surface):
         overlay = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 200))
         surface.blit(overlay, (0, 0))
-        title_surface = self.font.render("PLAY", True, (0, 255, 0))
+        title_surface = render_text(self.font, "PLAY", (0, 255, 0))
         title_rect = title_surface.get_rect(center=(self.screen_width // 2, 80))
         surface.blit(title_surface, title_rect)
         self.play_new_game_button.draw(surface)
@@ -124,11 +180,11 @@ class Menu:
         self.play_records_button.draw(surface)
         self.play_back_button.draw(surface)
 
-    def draw_difficulty_submenu(self, surface):
+    def _compose_difficulty_submenu(self, surface):
         overlay = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 200))
         surface.blit(overlay, (0, 0))
-        title_surface = self.font.render("SELECT DIFFICULTY", True, (255, 200, 0))
+        title_surface = render_text(self.font, "SELECT DIFFICULTY", (255, 200, 0))
         title_rect = title_surface.get_rect(center=(self.screen_width // 2, 50))
         surface.blit(title_surface, title_rect)
         for i, btn in enumerate(self.difficulty_buttons):
@@ -136,95 +192,100 @@ class Menu:
             btn.draw(surface)
         self.difficulty_back_button.draw(surface)
 
-    def draw_gamemode_submenu(self, surface):
+    def _compose_gamemode_submenu(self, surface):
         overlay = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 200))
         surface.blit(overlay, (0, 0))
-        title_surface = self.font.render("SELECT GAME MODE", True, (0, 200, 255))
+        title_surface = render_text(self.font, "SELECT GAME MODE", (0, 200, 255))
         title_rect = title_surface.get_rect(center=(self.screen_width // 2, 50))
         surface.blit(title_surface, title_rect)
         for mode, btn in self.gamemode_buttons:
             btn.draw(surface)
             desc = GAMEMODE_DESCRIPTIONS.get(mode, "")
-            desc_surface = self.tiny_font.render(desc, True, (200, 200, 200))
+            desc_surface = render_text(self.tiny_font, desc, (200, 200, 200))
             desc_rect = desc_surface.get_rect(center=(self.screen_width // 2, btn.rect.bottom + 12))
             surface.blit(desc_surface, desc_rect)
         self.gamemode_back_button.draw(surface)
 
-    def draw_records_submenu(self, surface, leaderboard):
+    def _compose_records_submenu(self, surface, leaderboard):
         overlay = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 200))
         surface.blit(overlay, (0, 0))
-        title_surface = self.font.render("TOP 10 RECORDS", True, (255, 215, 0))
+        title_surface = render_text(self.font, "TOP 10 RECORDS", (255, 215, 0))
         title_rect = title_surface.get_rect(center=(self.screen_width // 2, 30))
         surface.blit(title_surface, title_rect)
         scores = leaderboard.get_top_scores()
         y_pos = 80
         for rank, entry in enumerate(scores, 1):
             rank_text = f"{rank}. Score: {entry['score']} - {entry['difficulty']} - {entry['date']}"
-            score_surface = self.tiny_font.render(rank_text, True, (255, 255, 255))
+            score_surface = render_text(self.tiny_font, rank_text, (255, 255, 255))
             surface.blit(score_surface, (20, y_pos))
             y_pos += 25
         if not scores:
-            empty_text = self.small_font.render("No records yet!", True, (200, 100, 100))
+            empty_text = render_text(self.small_font, "No records yet!", (200, 100, 100))
             empty_rect = empty_text.get_rect(center=(self.screen_width // 2, 200))
             surface.blit(empty_text, empty_rect)
-        back_button = Button(self.screen_width // 2 - 50, self.screen_height - 80, 100, 40, "BACK", self.small_font)
-        back_button.draw(surface)
-        return back_button
+        self.records_back_button.draw(surface)
 
-    def draw_pause_menu(self, surface):
+    def _compose_pause_menu(self, surface):
         overlay = pygame.Surface((self.screen_width, self.game_area_height), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 150))
         surface.blit(overlay, (0, 0))
-        title_surface = self.font.render("PAUSED", True, (255, 255, 255))
+        title_surface = render_text(self.font, "PAUSED", (255, 255, 255))
         title_rect = title_surface.get_rect(center=(self.screen_width // 2, 150))
         surface.blit(title_surface, title_rect)
         self.pause_resume_button.draw(surface)
         self.pause_menu_button.draw(surface)
 
-    def draw_gameover_menu(self, surface, score, high_score=None):
+    def _compose_gameover_menu(self, surface, score, won, cause):
         overlay = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 200))
         surface.blit(overlay, (0, 0))
-        title_surface = self.font.render("GAME OVER", True, (255, 0, 0))
+        if won:
+            title_surface = render_text(self.font, "YOU WIN!", (0, 255, 0))
+        else:
+            title_surface = render_text(self.font, "GAME OVER", (255, 0, 0))
         title_rect = title_surface.get_rect(center=(self.screen_width // 2, 80))
         surface.blit(title_surface, title_rect)
-        score_text = self.small_font.render(f"Score: {score}", True, (255, 255, 255))
+        if won and cause in WIN_MESSAGES:
+            reason_text = render_text(self.small_font, WIN_MESSAGES[cause], (255, 255, 255))
+            reason_rect = reason_text.get_rect(center=(self.screen_width // 2, 120))
+            surface.blit(reason_text, reason_rect)
+        score_text = render_text(self.small_font, f"Score: {score}", (255, 255, 255))
         score_rect = score_text.get_rect(center=(self.screen_width // 2, 160))
         surface.blit(score_text, score_rect)
         self.gameover_restart_button.draw(surface)
         self.gameover_menu_button.draw(surface)
 
     # Input handling
+    def _hover_buttons(self, state):
+        """Buttons whose hover state is shown on the given screen"""
+        if state == MenuState.MAIN:
+            return [self.main_play_button, self.main_quit_button]
+        if state == MenuState.SUBMENU_PLAY:
+            return [self.play_new_game_button, self.play_difficulty_button, self.play_gamemode_button,
+                    self.play_records_button, self.play_back_button]
+        if state == MenuState.SUBMENU_DIFFICULTY:
+            # Difficulty buttons are always drawn un-hovered
+            return [self.difficulty_back_button]
+        if state == MenuState.SUBMENU_GAMEMODE:
+            return [btn for _, btn in self.gamemode_buttons] + [self.gamemode_back_button]
+        if state == MenuState.PAUSED:
+            return [self.pause_resume_button, self.pause_menu_button]
+        if state == MenuState.GAME_OVER:
+            return [self.gameover_restart_button, self.gameover_menu_button]
+        # Records back button doesn't track hover
+        return []
+
     def update(self, mouse_pos, state):
         self.state = state
-        if state == MenuState.MAIN:
-            self.main_play_button.update(mouse_pos)
-            self.main_quit_button.update(mouse_pos)
-        elif state == MenuState.SUBMENU_PLAY:
-            self.play_new_game_button.update(mouse_pos)
-            self.play_difficulty_button.update(mouse_pos)
-            self.play_gamemode_button.update(mouse_pos)
-            self.play_records_button.update(mouse_pos)
-            self.play_back_button.update(mouse_pos)
-        elif state == MenuState.SUBMENU_DIFFICULTY:
-            for btn in self.difficulty_buttons:
-                btn.update(mouse_pos)
-            self.difficulty_back_button.update(mouse_pos)
-        elif state == MenuState.SUBMENU_GAMEMODE:
-            for _, btn in self.gamemode_buttons:
-                btn.update(mouse_pos)
-            self.gamemode_back_button.update(mouse_pos)
-        elif state == MenuState.SUBMENU_RECORDS:
-            # back button produced by draw_records_submenu; we won't track hover here
-            pass
-        elif state == MenuState.PAUSED:
-            self.pause_resume_button.update(mouse_pos)
-            self.pause_menu_button.update(mouse_pos)
-        elif state == MenuState.GAME_OVER:
-            self.gameover_restart_button.update(mouse_pos)
-            self.gameover_menu_button.update(mouse_pos)
+        changed = False
+        for btn in self._hover_buttons(state):
+            was_hovered = btn.is_hovered
+            btn.update(mouse_pos)
+            changed = changed or btn.is_hovered != was_hovered
+        if changed:
+            self.invalidate(state)
 
     def handle_click(self, mouse_pos, state):
         # MAIN
@@ -243,6 +304,7 @@ class Menu:
             if self.play_gamemode_button.is_clicked(mouse_pos):
                 return 'open_gamemode_menu'
             if self.play_records_button.is_clicked(mouse_pos):
+                self.invalidate(MenuState.SUBMENU_RECORDS)
                 return 'open_records_menu'
             if self.play_back_button.is_clicked(mouse_pos):
                 return 'back_to_main'
@@ -253,6 +315,7 @@ class Menu:
                 if btn.is_clicked(mouse_pos):
                     # set selected difficulty
                     self.current_difficulty = list(Difficulty)[i]
+                    self.invalidate(MenuState.SUBMENU_DIFFICULTY)
                     return 'difficulty_selected'
             if self.difficulty_back_button.is_clicked(mouse_pos):
                 return 'back_to_play'
@@ -262,15 +325,15 @@ class Menu:
             for mode, btn in self.gamemode_buttons:
                 if btn.is_clicked(mouse_pos):
                     self.current_gamemode = mode
+                    self.invalidate(MenuState.SUBMENU_GAMEMODE)
                     return 'gamemode_selected'
             if self.gamemode_back_button.is_clicked(mouse_pos):
                 return 'back_to_play'
 
         # RECORDS
         if state == MenuState.SUBMENU_RECORDS:
-            # The back button is drawn by draw_records_submenu and returned to the caller for click testing.
-            # We still handle it defensively here if needed.
-            # No direct clickable elements here otherwise.
+            if self.records_back_button.is_clicked(mouse_pos):
+                return 'back_to_play'
             return None
 
         # PAUSED
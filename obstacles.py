@@ -1,5 +1,6 @@
 import pygame
 import random
+from itertools import repeat
 
 
 class Obstacle:
@@ -9,9 +10,10 @@ class Obstacle:
         self.color = color
         self.border_color = (101, 50, 10)
     
-    def draw(self, surface):
-        pygame.draw.rect(surface, self.color, self.rect)
-        pygame.draw.rect(surface, self.border_color, self.rect, 2)
+    def draw(self, surface, offset=(0, 0)):
+        rect = self.rect.move(offset)
+        pygame.draw.rect(surface, self.color, rect)
+        pygame.draw.rect(surface, self.border_color, rect, 2)
 
 
 class Portal:
@@ -30,23 +32,25 @@ class Portal:
         if self.active:
             self.animation_phase = (self.animation_phase + 0.1) % (2 * 3.14159)
     
-    def draw(self, surface):
+    def draw(self, surface, offset=(0, 0)):
         if self.active:
+            rect = self.rect.move(offset)
             # Animated glow effect
             glow_size = int(5 + 3 * abs(pygame.math.Vector2(1, 0).rotate(self.animation_phase * 57.3).x))
-            glow_rect = self.rect.inflate(glow_size, glow_size)
+            glow_rect = rect.inflate(glow_size, glow_size)
             pygame.draw.rect(surface, self.glow_color, glow_rect, 3)
-            pygame.draw.rect(surface, self.color, self.rect)
+            pygame.draw.rect(surface, self.color, rect)
             
             # Draw portal symbol
-            center = self.rect.center
+            center = rect.center
             pygame.draw.circle(surface, (0, 0, 0), center, 8)
             pygame.draw.circle(surface, self.glow_color, center, 6, 2)
 
 
 class LevelManager:
     """Manages obstacles and portals for campaign mode"""
-    def __init__(self, screen_width, game_area_height, snake_size):
+    def __init__(self, screen_width, game_area_height, snake_size, rng=None):
+        self.rng = rng if rng is not None else random  # gameplay RNG (seeded per game by the engine)
         self.screen_width = screen_width
         self.game_area_height = game_area_height
         self.snake_size = snake_size
@@ -56,6 +60,12 @@ class LevelManager:
         self.portal = None
         self.food_eaten_this_level = 0
         self.food_required_for_portal = 20
+        # Spatial index built by start_level: cell -> obstacles overlapping it
+        self.cols = screen_width // snake_size
+        self.rows = game_area_height // snake_size
+        self.obstacle_grid = bytearray(self.cols * self.rows)
+        self.cell_obstacles = {}
+        self.portal_slots = []
         
     def start_level(self, level):
         """Initialize obstacles for the given level"""
@@ -97,6 +107,45 @@ class LevelManager:
             self._create_vertical_wall(self.screen_width - 80, 120, 6)
             self._create_horizontal_wall(self.screen_width // 2 - 60, self.game_area_height // 2, 6)
             self._create_vertical_wall(self.screen_width // 2, self.game_area_height // 2 - 80, 8)
+
+        self._compile_grid()
+
+    def _cells_for_rect(self, rect):
+        """Grid cells (clipped to the board) that rect overlaps"""
+        s = self.snake_size
+        col_min = max(0, rect.left // s)
+        col_max = min(self.cols - 1, (rect.right - 1) // s)
+        row_min = max(0, rect.top // s)
+        row_max = min(self.rows - 1, (rect.bottom - 1) // s)
+        for row in range(row_min, row_max + 1):
+            for col in range(col_min, col_max + 1):
+                yield row * self.cols + col
+
+    def _compile_grid(self):
+        """Index this level's obstacles by cell and precompute the portal slots"""
+        self.obstacle_grid = bytearray(self.cols * self.rows)
+        self.cell_obstacles = {}
+        for obs in self.obstacles:
+            for cell in self._cells_for_rect(obs.rect):
+                self.obstacle_grid[cell] = 1
+                self.cell_obstacles.setdefault(cell, []).append(obs)
+
+        # Every 2x2 spot in the portal's spawn range that no obstacle overlaps. The spots are
+        # cell-aligned, so a spot is blocked exactly when an obstacle cell is one of its four.
+        blocked = set()
+        for cell in self.cell_obstacles:
+            row, col = divmod(cell, self.cols)
+            blocked.update(((row - 1, col - 1), (row - 1, col), (row, col - 1), (row, col)))
+        self.portal_slots = []
+        s = self.snake_size
+        col_range = range(2, self.cols - 3)
+        xs = [col * s for col in col_range]
+        blocked_rows = {row for row, _ in blocked}
+        for row in range(2, self.rows - 3):
+            if row in blocked_rows:
+                self.portal_slots.extend((col * s, row * s) for col in col_range if (row, col) not in blocked)
+            else:
+                self.portal_slots.extend(zip(xs, repeat(row * s)))  # a clear row, built at C speed
     
     def _create_horizontal_wall(self, x, y, length):
         """Create a horizontal wall of obstacles"""
@@ -120,33 +169,37 @@ class LevelManager:
     
     def _spawn_portal(self):
         """Spawn the portal at a safe location"""
-        # Find a safe spot not occupied by obstacles
-        attempts = 0
-        while attempts < 100:
-            x = random.randint(2, (self.screen_width // self.snake_size) - 4) * self.snake_size
-            y = random.randint(2, (self.game_area_height // self.snake_size) - 4) * self.snake_size
-            
-            portal_rect = pygame.Rect(x, y, self.snake_size * 2, self.snake_size * 2)
-            
-            # Check if position is clear
-            is_clear = True
-            for obs in self.obstacles:
-                if portal_rect.colliderect(obs.rect):
-                    is_clear = False
-                    break
-            
-            if is_clear:
-                self.portal = Portal(x, y, self.snake_size)
-                self.portal.activate()
-                break
-            
-            attempts += 1
-    
+        if self.portal_slots:
+            x, y = self.rng.choice(self.portal_slots)
+            self.portal = Portal(x, y, self.snake_size)
+            self.portal.activate()
+
+    def obstacles_in_rect(self, rect):
+        """Obstacles overlapping rect, found through the grid (cost scales with rect, not the level)"""
+        s, cols, grid = self.snake_size, self.cols, self.obstacle_grid
+        col_min = max(0, rect.left // s)
+        col_max = min(cols - 1, (rect.right - 1) // s)
+        found = []
+        seen = set()
+        for row in range(max(0, rect.top // s), min(self.rows - 1, (rect.bottom - 1) // s) + 1):
+            end = row * cols + col_max + 1
+            cell = grid.find(1, row * cols + col_min, end)
+            while cell >= 0:
+                for obs in self.cell_obstacles[cell]:
+                    if id(obs) not in seen:
+                        seen.add(id(obs))
+                        found.append(obs)
+                cell = grid.find(1, cell + 1, end)
+        return found
+
     def check_obstacle_collision(self, rect):
         """Check if rect collides with any obstacle"""
-        for obs in self.obstacles:
-            if rect.colliderect(obs.rect):
-                return True
+        grid = self.obstacle_grid
+        for cell in self._cells_for_rect(rect):
+            if grid[cell]:
+                for obs in self.cell_obstacles[cell]:
+                    if rect.colliderect(obs.rect):
+                        return True
         return False
     
     def check_portal_collision(self, rect):
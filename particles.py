@@ -0,0 +1,108 @@
+import math
+import random
+from array import array
+import pygame
+
+PARTICLE_COLORS = [(255, 0, 0), (0, 255, 0), (0, 0, 255)]
+MIN_SIZE, MAX_SIZE = 2, 5
+
+
+class ParticleSystem:
+    """Fixed-capacity particle pool stored as parallel arrays.
+
+    Expired particles are swap-removed (the last live particle moves into the
+    freed slot) and everything is drawn with a single Surface.blits call from
+    pre-made coloured squares. Velocities and lifetimes are per update step.
+    """
+    def __init__(self, capacity=4096, colors=PARTICLE_COLORS, rng=None):
+        # Cosmetic randomness only, kept apart from the game's seeded RNG
+        self.rng = rng if rng is not None else random.Random()
+        self.capacity = capacity
+        self.count = 0
+        self.x = array('d', bytes(8 * capacity))
+        self.y = array('d', bytes(8 * capacity))
+        self.x_vel = array('d', bytes(8 * capacity))
+        self.y_vel = array('d', bytes(8 * capacity))
+        self.lifetime = array('d', bytes(8 * capacity))
+        self.sprite = array('H', bytes(2 * capacity))  # index into self.sprites
+
+        # One square per (color, size)
+        self.colors = list(colors)
+        self.sprites = []
+        for color in self.colors:
+            for size in range(MIN_SIZE, MAX_SIZE + 1):
+                square = pygame.Surface((size, size))
+                square.fill(color)
+                self.sprites.append(square)
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def emit(self, x, y, direction, amount=20):
+        """Burst of particles at (x, y) flying in the snake's direction"""
+        sizes = MAX_SIZE - MIN_SIZE + 1
+        rng = self.rng
+        for _ in range(min(amount, self.capacity - self.count)):
+            i = self.count
+            self.count += 1
+            self.x[i] = x
+            self.y[i] = y
+            color = rng.randrange(len(self.colors))
+            self.sprite[i] = color * sizes + rng.randint(MIN_SIZE, MAX_SIZE) - MIN_SIZE
+            self.lifetime[i] = rng.randint(5, 10)
+
+            # Adjust velocity based on the snake's direction
+            velocity = rng.uniform(1, 3)
+            if direction == "UP":
+                self.x_vel[i] = rng.uniform(-1, 1)
+                self.y_vel[i] = -velocity
+            elif direction == "DOWN":
+                self.x_vel[i] = rng.uniform(-1, 1)
+                self.y_vel[i] = velocity
+            elif direction == "LEFT":
+                self.x_vel[i] = -velocity
+                self.y_vel[i] = rng.uniform(-1, 1)
+            elif direction == "RIGHT":
+                self.x_vel[i] = velocity
+                self.y_vel[i] = rng.uniform(-1, 1)
+            else:
+                self.x_vel[i] = rng.uniform(-1, 1)
+                self.y_vel[i] = rng.uniform(-1, 1)
+
+    def update(self, steps=1.0):
+        """Drop particles that expired last update, then advance the rest"""
+        x, y, x_vel, y_vel = self.x, self.y, self.x_vel, self.y_vel
+        lifetime, sprite = self.lifetime, self.sprite
+        i = 0
+        while i < self.count:
+            if lifetime[i] <= 0:
+                # Swap-remove
+                last = self.count - 1
+                x[i], y[i], x_vel[i], y_vel[i] = x[last], y[last], x_vel[last], y_vel[last]
+                lifetime[i], sprite[i] = lifetime[last], sprite[last]
+                self.count = last
+                continue
+            x[i] += x_vel[i] * steps
+            y[i] += y_vel[i] * steps
+            lifetime[i] -= steps
+            i += 1
+
+    def bounds(self):
+        """Rect covering every live particle, or None"""
+        n = self.count
+        if not n:
+            return None
+        xs, ys = self.x[:n], self.y[:n]
+        left, top = math.floor(min(xs)), math.floor(min(ys))
+        return pygame.Rect(left, top, math.ceil(max(xs)) + MAX_SIZE - left, math.ceil(max(ys)) + MAX_SIZE - top)
+
+    def draw(self, surface, offset=(0, 0)):
+        sprites, sprite, x, y = self.sprites, self.sprite, self.x, self.y
+        if offset == (0, 0):
+            surface.blits([(sprites[sprite[i]], (x[i], y[i])) for i in range(self.count)], False)
+        else:
+            dx, dy = offset
+            surface.blits([(sprites[sprite[i]], (x[i] + dx, y[i] + dy)) for i in range(self.count)], False)
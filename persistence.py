@@ -0,0 +1,97 @@
+import atexit
+import os
+import queue
+import sqlite3
+import sys
+import threading
+
+from score import save_high_score
+
+
+class PersistenceWorker:
+    """Writes scores on a background thread so the game loop never touches the disk.
+
+    The game only enqueues records. The worker drains everything queued so far
+    in one go: repeated high-score saves collapse into the latest value per
+    file and finished games go to the leaderboard in a single transaction.
+    Whatever is still queued is written by close(), which also runs at exit.
+    """
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.closed = False
+        self.thread = threading.Thread(target=self._run, name="persistence", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def save_high_score(self, scores_folder, high_score, filename="high_score.txt"):
+        self.queue.put(("high_score", (scores_folder, filename), high_score))
+
+    def add_score(self, leaderboard, score, difficulty, gamemode):
+        self.queue.put(("score", leaderboard, (score, difficulty, gamemode)))
+
+    def write_file(self, path, data):
+        """Write bytes to path (replaced atomically; the last write to a path wins)"""
+        self.queue.put(("file", path, data))
+
+    def flush(self):
+        """Block until everything queued so far has been written"""
+        if not self.closed:
+            self.queue.join()
+
+    def close(self):
+        """Write what is left and stop the worker"""
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put(None)
+        self.thread.join()
+
+    def _run(self):
+        running = True
+        while running:
+            jobs = [self.queue.get()]
+            while True:
+                try:
+                    jobs.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            high_scores = {}  # (folder, filename) -> latest value
+            files = {}  # path -> latest data
+            scores = {}  # leaderboard -> [(score, difficulty, gamemode)]
+            for job in jobs:
+                if job is None:
+                    running = False
+                elif job[0] == "high_score":
+                    high_scores[job[1]] = job[2]
+                elif job[0] == "file":
+                    files[job[1]] = job[2]
+                else:
+                    scores.setdefault(job[1], []).append(job[2])
+
+            for leaderboard, entries in scores.items():
+                try:
+                    leaderboard.add_scores(entries)
+                except (OSError, sqlite3.Error) as e:
+                    print(f"Could not save scores: {e}", file=sys.stderr)
+            for (folder, filename), value in high_scores.items():
+                try:
+                    save_high_score(folder, value, filename)
+                except OSError as e:
+                    print(f"Could not save high score: {e}", file=sys.stderr)
+            for path, data in files.items():
+                try:
+                    self._write_file(path, data)
+                except OSError as e:
+                    print(f"Could not write {path}: {e}", file=sys.stderr)
+            for _ in jobs:
+                self.queue.task_done()
+
+    @staticmethod
+    def _write_file(path, data):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
@@ -0,0 +1,302 @@
+import math
+import pygame
+
+GRID_SPACING = 5  # cells between grid lines when the view scrolls
+GRID_COLOR = (255, 255, 255, 40)
+WORLD_EDGE_COLOR = (200, 40, 40)
+
+
+class GameRenderer:
+    """Draws gameplay with a cached static layer and dirty-rectangle updates.
+
+    The background and the level's obstacles are composited once per level.
+    After a full frame, only the regions that changed (cells the snake entered
+    or left, food, portal, particles, a changed scoreboard) are restored from
+    that layer and redrawn; draw() returns them for pygame.display.update(rects).
+
+    Frames are drawn between simulation ticks: alpha (0..1) slides the head
+    from its previous cell into the current one and the dropped tail segment
+    into the new tail cell. The rest of the body stays on its cells, so only
+    those two spans change from frame to frame.
+
+    With a camera onto a world of another size than the game area (or an
+    endless one), the view moves with the head, so the game area is redrawn
+    every frame instead - but only from what lies inside the view (obstacle
+    grids, snake occupancy grid), which keeps the cost independent of world
+    size and snake length.
+    """
+    def __init__(self, screen, background, scoreboard, snake_size, food_size, game_area_height, camera=None):
+        self.screen = screen
+        self.camera = camera
+        self.background = background
+        self.scoreboard = scoreboard
+        self.snake_size = snake_size
+        self.food_size = food_size
+        self.game_area = pygame.Rect(0, 0, screen.get_width(), game_area_height)
+        # The scoreboard's text can spill a few pixels above its panel
+        self.scoreboard_area = pygame.Rect(scoreboard.rect.x, scoreboard.rect.y - 4,
+                                           scoreboard.rect.width, scoreboard.rect.height + 4)
+
+        self.static = None
+        self.static_key = None
+        self.needs_full = True
+        self.pending = []  # cells changed by engine ticks since the last frame
+        self.motion = None  # (prev_head, head, vacated_tail, tail) of the latest tick
+        self.spans = []
+        self.food_rect = None
+        self.particle_rect = None
+        self.scoreboard_key = None
+
+        # Faint lines every GRID_SPACING cells, so scrolling shows even on an empty board
+        spacing = snake_size * GRID_SPACING
+        self.grid_spacing = spacing
+        self.grid_lines = (pygame.Surface((1, game_area_height), pygame.SRCALPHA),
+                           pygame.Surface((screen.get_width(), 1), pygame.SRCALPHA))
+        for line in self.grid_lines:
+            line.fill(GRID_COLOR)
+
+    def invalidate(self):
+        """Force the next frame to be drawn and pushed in full"""
+        self.needs_full = True
+
+    def mark_dirty(self, rect):
+        """Restore rect from the game layers on the next frame (e.g. under an overlay)"""
+        self.pending.append(pygame.Rect(rect))
+
+    def reset_motion(self):
+        """Drop interpolation state (new game or snake teleported)"""
+        self.motion = None
+
+    def note_step(self, engine, state):
+        """Record the cells an engine tick changed"""
+        if state.level_advanced:
+            self.needs_full = True
+            self.motion = None
+            return
+        size = self.snake_size
+        snake = engine.snake
+        head = (snake.pos[0], snake.pos[1])
+        tail = tuple(snake.body[-1])
+        if state.vacated:
+            self.pending.append(pygame.Rect(state.vacated[0], state.vacated[1], size, size))
+        self.pending.append(pygame.Rect(head[0], head[1], size, size))
+        self.pending.append(pygame.Rect(state.prev_head[0], state.prev_head[1], size, size))
+        self.motion = (state.prev_head, head, state.vacated, tail)
+
+    def _lerp(self, start, end, alpha):
+        """Position between two neighbouring cells; jumps (wrap-around) snap to end"""
+        if abs(end[0] - start[0]) + abs(end[1] - start[1]) != self.snake_size:
+            return end
+        return (round(start[0] + (end[0] - start[0]) * alpha),
+                round(start[1] + (end[1] - start[1]) * alpha))
+
+    def _span(self, start, end):
+        size = self.snake_size
+        return pygame.Rect(start[0], start[1], size, size).union(pygame.Rect(end[0], end[1], size, size))
+
+    def _build_static(self, level_manager):
+        self.static = self.background.copy()
+        if level_manager:
+            for obs in level_manager.obstacles:
+                obs.draw(self.static)
+
+    @staticmethod
+    def _portal_bounds(portal):
+        # Glow ring grows up to 8px plus its 3px outline
+        return portal.rect.inflate(14, 14)
+
+    def _scoreboard_key(self, score, level_manager):
+        if level_manager:
+            return score, level_manager.current_level, level_manager.food_eaten_this_level
+        return score, None, None
+
+    def draw(self, engine, particles, alpha=1.0, wave_phase=0, wave_amplitude=0):
+        """Draw one gameplay frame; particles is a ParticleSystem.
+
+        Returns the rects to push with pygame.display.update (the whole
+        screen after a full redraw).
+        """
+        screen = self.screen
+        level_manager = engine.level_manager
+        portal = level_manager.portal if level_manager else None
+
+        camera = self.camera
+        if camera:
+            # An endless world has no edges to clamp the view to
+            camera.set_world(*((None, None) if engine.world else (engine.width, engine.height)))
+        scrolling = camera is not None and not camera.fits
+        key = (id(level_manager), level_manager.current_level) if level_manager else None
+        if not scrolling and (self.static is None or key != self.static_key):
+            self._build_static(level_manager)
+            self.static_key = key
+            self.needs_full = True
+
+        snake = engine.snake
+        head = (snake.pos[0], snake.pos[1])
+        ghost = None
+        if self.motion and self.motion[1] == head:
+            prev_head, _, vacated, tail = self.motion
+            head_pos = self._lerp(prev_head, head, alpha)
+            spans = [self._span(prev_head, head)]
+            if vacated:
+                ghost = self._lerp(vacated, tail, alpha)
+                spans.append(self._span(vacated, tail))
+        else:
+            head_pos = head
+            spans = [self._span(head, head)]
+
+        food = engine.food
+        food_rect = None
+        if food:  # endless worlds keep their food in the chunks
+            food_rect = pygame.Rect(food.pos[0], food.pos[1] - wave_amplitude * math.sin(wave_phase),
+                                    self.food_size, self.food_size)
+        particle_rect = particles.bounds()
+        score_key = self._scoreboard_key(engine.state.score, level_manager)
+
+        if scrolling:
+            dirty = self._draw_view(engine, particles, portal, food_rect, head_pos, ghost)
+        elif self.needs_full:
+            screen.blit(self.static, (0, 0))
+            if portal:
+                portal.draw(screen)
+            body_sprite = snake.body_sprite
+            segments = iter(snake.body)
+            next(segments, None)
+            screen.blits([(body_sprite, pos) for pos in segments], False)
+            if ghost:
+                screen.blit(body_sprite, ghost)
+            screen.blit(snake.head_sprite, head_pos)
+            screen.blit(food.sprite, food_rect)
+            self._draw_particles(particles)
+            self.scoreboard.draw(screen, engine.state.score, level_manager)
+            dirty = [screen.get_rect()]
+            self.needs_full = False
+            self.pending = []
+        else:
+            regions = self.pending
+            self.pending = []
+            # Last frame's head and tail positions plus this frame's
+            regions.extend(self.spans)
+            regions.extend(spans)
+            if self.food_rect != food_rect:
+                regions.append(self.food_rect)
+                regions.append(food_rect)
+            if self.particle_rect:
+                regions.append(self.particle_rect)
+            if portal:
+                regions.append(self._portal_bounds(portal))
+
+            # The scoreboard sits on top of everything, so repaint it if anything touches it
+            # (restoring the strip it spills onto first, so its text isn't blended twice)
+            redraw_scoreboard = (score_key != self.scoreboard_key
+                                 or self.scoreboard_area.collidelist(regions) != -1
+                                 or (particle_rect and self.scoreboard_area.colliderect(particle_rect)))
+            if redraw_scoreboard:
+                regions.append(self.scoreboard_area)
+
+            dirty = []
+            for rect in regions:
+                rect = rect.clip(self.game_area)
+                if rect.width and rect.height:
+                    self._redraw_region(rect, engine, portal, food_rect, head_pos, ghost)
+                    dirty.append(rect)
+
+            if particle_rect:
+                self._draw_particles(particles)
+                dirty.append(particle_rect.clip(self.game_area))
+
+            if redraw_scoreboard:
+                self.scoreboard.draw(screen, engine.state.score, level_manager)
+                dirty.append(self.scoreboard_area)
+
+        self.spans = spans
+        self.food_rect = food_rect
+        self.particle_rect = particle_rect
+        self.scoreboard_key = score_key
+        return dirty
+
+    def _draw_view(self, engine, particles, portal, food_rect, head_pos, ghost):
+        """Draw the game area through the camera, centred on the (interpolated) head"""
+        screen = self.screen
+        size = self.snake_size
+        camera = self.camera
+        camera.follow(head_pos[0] + size / 2, head_pos[1] + size / 2)
+        view = camera.rect
+        offset = ox, oy = camera.offset
+        self.pending = []
+        self.needs_full = False
+
+        screen.set_clip(self.game_area)
+        screen.blit(self.background, (0, 0))
+        world = engine.world
+        vertical, horizontal = self.grid_lines
+        spacing = self.grid_spacing
+        left, top = view.left // spacing * spacing, view.top // spacing * spacing
+        right, bottom = view.right, view.bottom
+        if not world:
+            left, top = max(0, left), max(0, top)
+            right, bottom = min(right, engine.width), min(bottom, engine.height)
+        screen.blits([(vertical, (x + ox, 0)) for x in range(left, right, spacing)]
+                     + [(horizontal, (0, y + oy)) for y in range(top, bottom, spacing)], False)
+        if not world:
+            pygame.draw.rect(screen, WORLD_EDGE_COLOR,
+                             pygame.Rect(ox - 2, oy - 2, engine.width + 4, engine.height + 4), 2)
+
+        level_manager = engine.level_manager
+        if level_manager:
+            for obs in level_manager.obstacles_in_rect(view):
+                obs.draw(screen, offset)
+            if portal and view.colliderect(self._portal_bounds(portal)):
+                portal.draw(screen, offset)
+        if world:
+            # Walls through each visible chunk's own grid; a chunk holds only a food or two
+            food_sprite = engine.food_sprite
+            for chunk in world.chunks_in_rect(view):
+                for obs in chunk.obstacles_in_rect(view.move(-chunk.x, -chunk.y)):
+                    obs.draw(screen, (ox + chunk.x, oy + chunk.y))
+                screen.blits([(food_sprite, (x + ox, y + oy)) for x, y in chunk.foods], False)
+
+        snake = engine.snake
+        head = (snake.pos[0], snake.pos[1])
+        body_sprite = snake.body_sprite
+        segments = snake.body.segments_in_rect(view.x, view.y, view.width, view.height, size)
+        screen.blits([(body_sprite, (x + ox, y + oy)) for x, y in segments if (x, y) != head], False)
+        if ghost:
+            screen.blit(body_sprite, (ghost[0] + ox, ghost[1] + oy))
+        screen.blit(snake.head_sprite, (head_pos[0] + ox, head_pos[1] + oy))
+        if food_rect and view.colliderect(food_rect):
+            screen.blit(engine.food.sprite, food_rect.move(offset))
+        if particles.count:
+            particles.draw(screen, offset)
+        screen.set_clip(None)
+
+        # The scoreboard's text spills onto the game area, so it goes on top every frame
+        self.scoreboard.draw(screen, engine.state.score, engine.level_manager)
+        return [screen.get_rect()]
+
+    def _redraw_region(self, rect, engine, portal, food_rect, head_pos, ghost):
+        """Restore rect from the static layer and redraw every layer above it, clipped"""
+        screen = self.screen
+        snake = engine.snake
+        size = self.snake_size
+        screen.set_clip(rect)
+        screen.blit(self.static, rect, rect)
+        if portal and rect.colliderect(self._portal_bounds(portal)):
+            portal.draw(screen)
+        head = (snake.pos[0], snake.pos[1])
+        for pos in snake.body.segments_in_rect(rect.x, rect.y, rect.width, rect.height, size):
+            if pos != head:
+                screen.blit(snake.body_sprite, pos)
+        if ghost and rect.colliderect(pygame.Rect(ghost[0], ghost[1], size, size)):
+            screen.blit(snake.body_sprite, ghost)
+        if rect.colliderect(pygame.Rect(head_pos[0], head_pos[1], size, size)):
+            screen.blit(snake.head_sprite, head_pos)
+        if rect.colliderect(food_rect):
+            screen.blit(engine.food.sprite, food_rect)
+        screen.set_clip(None)
+
+    def _draw_particles(self, particles):
+        # Particles never spill over the scoreboard panel
+        self.screen.set_clip(self.game_area)
+        particles.draw(self.screen)
+        self.screen.set_clip(None)
@@ -0,0 +1,136 @@
+import struct
+import sys
+import time
+
+from engine import GameEngine, DIRECTIONS, OPPOSITE, BOARD_WIDTH, BOARD_HEIGHT
+from game_settings import Difficulty, GameMode
+
+MAGIC = b"SNKR"
+VERSION = 2
+# magic, version, game mode, difficulty, seed, total ticks, world width, world height (pixels)
+HEADER = struct.Struct("<4sBBBIIHH")
+HEADER_V1 = struct.Struct("<4sBBBII")  # version 1 had no world size; those games were all on the default board
+
+GAMEMODES = list(GameMode)
+DIFFICULTIES = list(Difficulty)
+
+
+def write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, offset):
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+class Replay:
+    """A game stored as its seed plus the direction changes the player made.
+
+    Each change is one varint holding (ticks since the previous change << 2)
+    | direction, so a typical change costs one or two bytes. Replaying the
+    changes through a headless GameEngine with the same seed reproduces the
+    game exactly.
+    """
+    def __init__(self, seed, gamemode, difficulty, changes=None, ticks=0,
+                 world_width=BOARD_WIDTH, world_height=BOARD_HEIGHT):
+        self.seed = seed
+        self.gamemode = gamemode
+        self.difficulty = difficulty
+        self.world_width = world_width
+        self.world_height = world_height
+        self.changes = changes if changes is not None else []  # [(tick, direction)]
+        self.ticks = ticks
+
+    def to_bytes(self):
+        out = bytearray(HEADER.pack(MAGIC, VERSION, GAMEMODES.index(self.gamemode),
+                                    DIFFICULTIES.index(self.difficulty), self.seed, self.ticks,
+                                    self.world_width, self.world_height))
+        last_tick = 0
+        for tick, direction in self.changes:
+            write_varint(out, (tick - last_tick) << 2 | DIRECTIONS.index(direction))
+            last_tick = tick
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, mode, difficulty, seed, ticks = HEADER_V1.unpack_from(data)
+        if magic != MAGIC or version not in (1, VERSION):
+            raise ValueError("not a snake replay")
+        world_width, world_height = BOARD_WIDTH, BOARD_HEIGHT
+        offset = HEADER_V1.size
+        if version == VERSION:
+            world_width, world_height = HEADER.unpack_from(data)[6:]
+            offset = HEADER.size
+        changes = []
+        tick = 0
+        while offset < len(data):
+            value, offset = read_varint(data, offset)
+            tick += value >> 2
+            changes.append((tick, DIRECTIONS[value & 3]))
+        return cls(seed, GAMEMODES[mode], DIFFICULTIES[difficulty], changes, ticks, world_width, world_height)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+    def new_engine(self):
+        """Headless engine set up exactly like the recorded game"""
+        return GameEngine(self.difficulty, self.gamemode, self.world_width, self.world_height, seed=self.seed)
+
+    def play(self, engine=None):
+        """Run the whole replay through an engine and return its final state"""
+        engine = engine or self.new_engine()
+        changes = iter(self.changes)
+        next_change = next(changes, None)
+        state = engine.state
+        while state.tick < self.ticks and not state.game_over:
+            action = None
+            if next_change and next_change[0] == state.tick + 1:
+                action = next_change[1]
+                next_change = next(changes, None)
+            state = engine.step(action)
+        return state
+
+
+class ReplayRecorder:
+    """Records a live game: call step() in place of engine.step()"""
+    def __init__(self, engine):
+        self.engine = engine
+        self.replay = Replay(engine.seed, engine.gamemode, engine.difficulty,
+                             world_width=engine.width, world_height=engine.height)
+
+    def step(self, action=None):
+        engine = self.engine
+        direction = engine.snake.direction
+        # Only actions that actually turn the snake change the game
+        if action is not None and action != direction and action != OPPOSITE[direction] \
+                and not engine.state.game_over:
+            self.replay.changes.append((engine.state.tick + 1, action))
+        state = engine.step(action)
+        self.replay.ticks = state.tick
+        return state
+
+
+if __name__ == "__main__":
+    # Check a replay file: python replay.py path/to/game.snkr
+    replay = Replay.load(sys.argv[1])
+    start = time.perf_counter()
+    state = replay.play()
+    elapsed = time.perf_counter() - start
+    print(f"{replay.gamemode.value} {replay.difficulty.name} seed={replay.seed}: score {state.score}, "
+          f"{state.tick} ticks, {state.death_cause or 'unfinished'} ({state.tick / max(elapsed, 1e-9):.0f} ticks/s)")
@@ -1,7 +1,7 @@
 import os
 import math
 import time
-import pygame
+from text_cache import get_font, render_text
 
 
 def load_high_score(scores_folder="Scores", filename="high_score.txt"):
@@ -20,11 +20,13 @@ def load_high_score(scores_folder="Scores", filename="high_score.txt"):
 
 
 def save_high_score(scores_folder, high_score, filename="high_score.txt"):
-    if not os.path.exists(scores_folder):
-        os.makedirs(scores_folder)
+    os.makedirs(scores_folder, exist_ok=True)
     path = os.path.join(scores_folder, filename)
-    with open(path, "w") as f:
+    # Write a temp file and rename it over the old one, so a crash never leaves a truncated file
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
         f.write(str(high_score))
+    os.replace(tmp_path, path)
 
 
 class ScoreRenderer:
@@ -33,28 +35,16 @@ class ScoreRenderer:
         self.font_color = font_color
 
     def draw(self, surface, text, size, x, y, outline_thickness=2, wave_amplitude=5, wave_frequency=2):
-        font = pygame.font.Font(self.font_path, size)
+        font = get_font(self.font_path, size)
         outline_color = (0, 0, 0)
 
-        def render_with_outline(message, font, main_color, outline_color, thickness):
-            base = font.render(message, True, main_color)
-            outline_size = (base.get_width() + 2 * thickness, base.get_height() + 2 * thickness)
-            outline = pygame.Surface(outline_size, pygame.SRCALPHA)
-            for dx in range(-thickness, thickness + 1):
-                for dy in range(-thickness, thickness + 1):
-                    if dx != 0 or dy != 0:
-                        temp = font.render(message, True, outline_color)
-                        outline.blit(temp, (dx + thickness, dy + thickness))
-            outline.blit(base, (thickness, thickness))
-            return outline
-
         # Time-based wave phase
         time_ms = time.time() * 1000
         phase = wave_frequency * time_ms / 1000
         wave_offset = wave_amplitude * math.sin(phase)
         y_with_wave = y + wave_offset
 
-        text_surface = render_with_outline(text, font, self.font_color, outline_color, outline_thickness)
+        text_surface = render_text(font, text, self.font_color, outline_thickness, outline_color)
         text_rect = text_surface.get_rect()
         text_rect.midtop = (x, y_with_wave)
         surface.blit(text_surface, text_rect)
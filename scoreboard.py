@@ -1,12 +1,13 @@
 import pygame
+from text_cache import get_font, render_text
 
 
 class ScoreBoard:
     def __init__(self, x, y, width, height, font_path, font_size=24):
         self.rect = pygame.Rect(x, y, width, height)
-        self.font = pygame.font.Font(font_path, font_size)
-        self.font_large = pygame.font.Font(font_path, font_size + 4)
-        self.font_small = pygame.font.Font(font_path, font_size - 6)
+        self.font = get_font(font_path, font_size)
+        self.font_large = get_font(font_path, font_size + 4)
+        self.font_small = get_font(font_path, font_size - 6)
         self.bg_color = (20, 20, 20)
         self.border_color = (100, 100, 100)
         self.text_color = (255, 255, 255)
@@ -26,27 +27,27 @@ class ScoreBoard:
             
             # Score
             score_text = f"Score: {score}"
-            score_surface = self.font_large.render(score_text, True, self.highlight_color)
+            score_surface = render_text(self.font_large, score_text, self.highlight_color)
             score_rect = score_surface.get_rect(center=(self.rect.centerx, y_offset))
             surface.blit(score_surface, score_rect)
             
             # Level info
             y_offset += 35
             level_text = f"Level: {level_manager.current_level}/{level_manager.max_levels}"
-            level_surface = self.font.render(level_text, True, self.campaign_color)
+            level_surface = render_text(self.font, level_text, self.campaign_color)
             level_rect = level_surface.get_rect(center=(self.rect.centerx, y_offset))
             surface.blit(level_surface, level_rect)
             
             # Food count
             y_offset += 28
             food_text = f"Food: {level_manager.food_eaten_this_level}/{level_manager.food_required_for_portal}"
-            food_surface = self.font_small.render(food_text, True, self.text_color)
+            food_surface = render_text(self.font_small, food_text, self.text_color)
             food_rect = food_surface.get_rect(center=(self.rect.centerx, y_offset))
             surface.blit(food_surface, food_rect)
         else:
             # Normal mode - just show score centered
             score_text = f"Score: {score}"
-            score_surface = self.font_large.render(score_text, True, self.highlight_color)
+            score_surface = render_text(self.font_large, score_text, self.highlight_color)
             score_rect = score_surface.get_rect(center=(self.rect.centerx, self.rect.centery))
             surface.blit(score_surface, score_rect)
         
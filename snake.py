@@ -1,18 +1,214 @@
+from array import array
+from collections import deque
+from math import gcd
 import pygame
 
 
+class SnakeBody:
+    """Fixed-capacity ring buffer of segment positions (head first) plus an occupancy grid.
+
+    Positions are pixel coordinates on a lattice of `unit` pixels. Adding a head,
+    dropping the tail and asking whether a cell is occupied are all O(1).
+    Off-board positions are stored but not counted in the grid.
+    """
+    def __init__(self, board_width, board_height, unit):
+        self.unit = unit
+        self.cols = board_width // unit
+        self.rows = board_height // unit
+        self.capacity = self.cols * self.rows + 1
+        self.xs = array('i', bytes(4 * self.capacity))
+        self.ys = array('i', bytes(4 * self.capacity))
+        self.grid = bytearray(self.cols * self.rows)
+        self.start = 0  # slot of the head
+        self.length = 0
+
+    def _cell(self, x, y):
+        if x < 0 or y < 0 or x % self.unit or y % self.unit:
+            return -1
+        col, row = x // self.unit, y // self.unit
+        if col >= self.cols or row >= self.rows:
+            return -1
+        return row * self.cols + col
+
+    def _occupy(self, x, y):
+        cell = self._cell(x, y)
+        if cell >= 0:
+            self.grid[cell] += 1
+
+    def _vacate(self, x, y):
+        cell = self._cell(x, y)
+        if cell >= 0:
+            self.grid[cell] -= 1
+
+    def count(self, x, y):
+        """Number of segments sitting exactly on (x, y)"""
+        cell = self._cell(x, y)
+        return self.grid[cell] if cell >= 0 else 0
+
+    def segments_in_rect(self, x, y, width, height, size):
+        """On-board segment positions whose size x size square overlaps the rect"""
+        unit, cols = self.unit, self.cols
+        # Lattice positions p with x - size < p < x + width (same for y)
+        col_min = max(0, (x - size) // unit + 1)
+        col_max = min(cols - 1, -(-(x + width) // unit) - 1)
+        row_min = max(0, (y - size) // unit + 1)
+        row_max = min(self.rows - 1, -(-(y + height) // unit) - 1)
+        if col_min > col_max or row_min > row_max:
+            return []
+        if (col_max - col_min + 1) * (row_max - row_min + 1) > self.length:
+            # Fewer segments than candidate cells: scanning the body is cheaper
+            return [(sx, sy) for sx, sy in self
+                    if sx < x + width and sx + size > x and sy < y + height and sy + size > y
+                    and self._cell(sx, sy) >= 0]
+        grid = self.grid
+        found = []
+        for row in range(row_min, row_max + 1):
+            base = row * cols
+            for col in range(col_min, col_max + 1):
+                if grid[base + col]:
+                    found.append((col * unit, row * unit))
+        return found
+
+    def push_front(self, x, y):
+        self.start = (self.start - 1) % self.capacity
+        self.xs[self.start] = x
+        self.ys[self.start] = y
+        self.length += 1
+        self._occupy(x, y)
+
+    def pop_back(self):
+        slot = (self.start + self.length - 1) % self.capacity
+        x, y = self.xs[slot], self.ys[slot]
+        self.length -= 1
+        self._vacate(x, y)
+        return x, y
+
+    def clear(self):
+        self.grid[:] = bytes(len(self.grid))
+        self.start = 0
+        self.length = 0
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.length))]
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("snake body index out of range")
+        slot = (self.start + index) % self.capacity
+        return [self.xs[slot], self.ys[slot]]
+
+    def __setitem__(self, index, pos):
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("snake body index out of range")
+        slot = (self.start + index) % self.capacity
+        self._vacate(self.xs[slot], self.ys[slot])
+        self.xs[slot], self.ys[slot] = pos[0], pos[1]
+        self._occupy(pos[0], pos[1])
+
+    def __iter__(self):
+        xs, ys, capacity = self.xs, self.ys, self.capacity
+        for i in range(self.length):
+            slot = (self.start + i) % capacity
+            yield (xs[slot], ys[slot])
+
+
+class SparseSnakeBody:
+    """Segment positions (head first) plus occupancy counts in a dict, for a world without edges.
+
+    Same interface as SnakeBody. Memory follows the snake's length, not how
+    far it has travelled; the cost is a dict lookup instead of a grid index.
+    """
+    def __init__(self, unit):
+        self.unit = unit
+        self.segments = deque()
+        self.cells = {}  # (x, y) -> number of segments on it
+
+    def count(self, x, y):
+        """Number of segments sitting exactly on (x, y)"""
+        return self.cells.get((x, y), 0)
+
+    def segments_in_rect(self, x, y, width, height, size):
+        """Segment positions whose size x size square overlaps the rect"""
+        unit = self.unit
+        col_min, col_max = (x - size) // unit + 1, -(-(x + width) // unit) - 1
+        row_min, row_max = (y - size) // unit + 1, -(-(y + height) // unit) - 1
+        if col_min > col_max or row_min > row_max:
+            return []
+        if (col_max - col_min + 1) * (row_max - row_min + 1) > len(self.segments):
+            return [(sx, sy) for sx, sy in self.segments
+                    if sx < x + width and sx + size > x and sy < y + height and sy + size > y]
+        cells = self.cells
+        return [(col * unit, row * unit) for row in range(row_min, row_max + 1)
+                for col in range(col_min, col_max + 1) if (col * unit, row * unit) in cells]
+
+    def push_front(self, x, y):
+        self.segments.appendleft((x, y))
+        self.cells[(x, y)] = self.cells.get((x, y), 0) + 1
+
+    def pop_back(self):
+        pos = self.segments.pop()
+        self._vacate(pos)
+        return pos
+
+    def _vacate(self, pos):
+        count = self.cells[pos] - 1
+        if count:
+            self.cells[pos] = count
+        else:
+            del self.cells[pos]
+
+    def clear(self):
+        self.segments.clear()
+        self.cells.clear()
+
+    def __len__(self):
+        return len(self.segments)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.segments)))]
+        return list(self.segments[index])
+
+    def __setitem__(self, index, pos):
+        self._vacate(self.segments[index])
+        self.segments[index] = (pos[0], pos[1])
+        self.cells[(pos[0], pos[1])] = self.cells.get((pos[0], pos[1]), 0) + 1
+
+    def __iter__(self):
+        return iter(self.segments)
+
+
 class Snake:
-    def __init__(self, init_pos, size, speed, head_sprite, body_sprite):
+    def __init__(self, init_pos, size, speed, head_sprite, body_sprite, board_size=(400, 600)):
         self.pos = list(init_pos)
         self.size = size
         self.speed = speed
+        # Grid fine enough that every reachable position lands on a cell
+        unit = gcd(gcd(size, speed), gcd(init_pos[0], init_pos[1]))
+        if board_size is None:  # a world without edges
+            self.body = SparseSnakeBody(unit)
+        else:
+            self.body = SnakeBody(board_size[0], board_size[1], unit)
         # initialize a small body aligned on the left
-        self.body = [list(init_pos), [init_pos[0] - size, init_pos[1]], [init_pos[0] - 2 * size, init_pos[1]]]
+        for i in (2, 1, 0):
+            self.body.push_front(init_pos[0] - i * size, init_pos[1])
         self.direction = "RIGHT"
         self.change_to = self.direction
         self.head_sprite = head_sprite
         self.body_sprite = body_sprite
 
+    def reset(self, pos):
+        """Collapse the snake to a single segment at pos"""
+        self.pos = list(pos)
+        self.body.clear()
+        self.body.push_front(pos[0], pos[1])
+
     def update_direction(self):
         self.direction = self.change_to
 
@@ -27,25 +223,26 @@ class Snake:
             self.pos[0] += self.speed
 
         # grow by inserting head position; popping handled by caller when not eating
-        self.body.insert(0, list(self.pos))
+        self.body.push_front(self.pos[0], self.pos[1])
 
     def shrink_tail(self):
-        # remove last segment (call when no food eaten)
+        # remove last segment (call when no food eaten); returns its position
         if self.body:
-            self.body.pop()
+            return self.body.pop_back()
+        return None
 
     def draw(self, surface):
         # Draw body (excluding head)
-        for pos in self.body[1:]:
-            surface.blit(self.body_sprite, (pos[0], pos[1]))
+        body_sprite = self.body_sprite
+        segments = iter(self.body)
+        next(segments, None)
+        surface.blits([(body_sprite, pos) for pos in segments], False)
         # Draw head
         surface.blit(self.head_sprite, (self.pos[0], self.pos[1]))
 
     def check_self_collision(self):
-        for block in self.body[1:]:
-            if self.pos[0] == block[0] and self.pos[1] == block[1]:
-                return True
-        return False
+        # The head is counted too, so any other segment on its cell makes it 2
+        return self.body.count(self.pos[0], self.pos[1]) > 1
 
     def check_wall_collision(self, screen_width, screen_height):
         if self.pos[0] < 0 or self.pos[0] > screen_width - self.size:
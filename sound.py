@@ -0,0 +1,94 @@
+import os
+import sys
+
+import pygame
+
+FREQUENCY = 44100
+BUFFER = 256  # samples per mix, ~6ms at 44.1kHz (pygame's default is 512)
+
+# Effect category -> channels reserved for it
+CATEGORIES = {"ui": 1, "gameplay": 2}
+
+# Effect name -> (file, category)
+SOUNDS = {
+    "eat": ("assets/eat_sound.wav", "gameplay"),
+    "click": ("assets/button_click_sound.wav", "ui"),
+}
+
+MUSIC_VOLUME = 0.5
+
+
+class SoundService:
+    """Sound effects on reserved per-category channels, and the music.
+
+    pre_init() sets a small mixer buffer and has to run before anything
+    opens the mixer; load() opens it and loads the effects (it is slow, so
+    main.py runs it on the background loader). Until it has finished every
+    call is a no-op. Each category plays only on its own channels, so a
+    click never cuts off a gameplay sound; when all of a category's
+    channels are busy the one started longest ago is reused. The same
+    effect asked for again in the same frame is dropped. Under the dummy
+    audio driver (headless runs), or if the mixer can't be opened, the
+    mixer is never initialised and the service stays silent.
+    """
+    def __init__(self, sounds=SOUNDS, categories=CATEGORIES):
+        self.enabled = os.environ.get("SDL_AUDIODRIVER") != "dummy"
+        self.ready = False
+        self.sound_files = sounds
+        self.category_sizes = categories
+        self.sounds = {}  # name -> (Sound, category)
+        self.channels = {}  # category -> its channels, least recently started first
+        self.frame = 0
+        self.last_played = {}  # name -> frame it last played in
+
+    def pre_init(self):
+        if self.enabled:
+            pygame.mixer.pre_init(FREQUENCY, -16, 2, BUFFER)
+
+    def load(self, music=None):
+        """Open the mixer, reserve the channels, load the effects and start the music (if given)"""
+        if not self.enabled:
+            return
+        try:
+            pygame.mixer.init()
+            reserved = sum(self.category_sizes.values())
+            pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), reserved))
+            pygame.mixer.set_reserved(reserved)  # Sound.play() never takes these
+            first = 0
+            for category, count in self.category_sizes.items():
+                self.channels[category] = [pygame.mixer.Channel(i) for i in range(first, first + count)]
+                first += count
+            for name, (path, category) in self.sound_files.items():
+                self.sounds[name] = (pygame.mixer.Sound(path), category)
+            if music:
+                pygame.mixer.music.load(music)
+                pygame.mixer.music.play(-1)
+                pygame.mixer.music.set_volume(MUSIC_VOLUME)
+        except pygame.error as e:
+            print(f"Sound disabled: {e}", file=sys.stderr)
+            self.enabled = False
+            return
+        self.ready = True
+
+    def next_frame(self):
+        self.frame += 1
+
+    def play(self, name):
+        if not self.ready or self.last_played.get(name) == self.frame:
+            return
+        self.last_played[name] = self.frame
+        sound, category = self.sounds[name]
+        channels = self.channels[category]
+        channel = next((c for c in channels if not c.get_busy()), channels[0])
+        channels.remove(channel)
+        channels.append(channel)
+        channel.play(sound)
+
+    def music(self, action):
+        """action is "play" (from the start, looping), "stop", "pause" or "unpause"."""
+        if not self.ready:
+            return
+        if action == "play":
+            pygame.mixer.music.play(-1)
+        else:
+            getattr(pygame.mixer.music, action)()
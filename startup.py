@@ -0,0 +1,97 @@
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class BackgroundLoader:
+    """Runs loading jobs on worker threads so the first frame doesn't wait for them.
+
+    submit() starts a job, peek() returns its result once it has finished
+    (None until then) and result() waits for it. Each job's start and end
+    times are kept for the startup report.
+    """
+    def __init__(self, workers=2):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="loader")
+        self.futures = {}
+        self.timings = {}  # name -> (start, end) perf_counter times
+
+    def submit(self, name, load, *args):
+        def run():
+            start = time.perf_counter()
+            try:
+                return load(*args)
+            finally:
+                self.timings[name] = (start, time.perf_counter())
+        self.futures[name] = self.executor.submit(run)
+
+    def peek(self, name):
+        future = self.futures.get(name)
+        if future is None or not future.done():
+            return None
+        return future.result()
+
+    def result(self, name):
+        return self.futures[name].result()
+
+    def wait(self):
+        for future in self.futures.values():
+            future.result()
+
+
+class StartupProfile:
+    """Named points on the way to the first frame, reported by --profile-startup"""
+    def __init__(self, started):
+        self.started = started  # perf_counter() when main.py began executing
+        self.marks = []
+
+    def mark(self, name):
+        self.marks.append((name, time.perf_counter()))
+
+    def report(self, loader=None, module="main", out=sys.stdout):
+        print("startup (ms since main.py started; interpreter start-up not included)", file=out)
+        previous = self.started
+        for name, when in self.marks:
+            print(f"  {name:<28}{(when - self.started) * 1000:>9.1f}{(when - previous) * 1000:>+9.1f}", file=out)
+            previous = when
+        if loader:
+            print("background loads (start - end)", file=out)
+            for name, (start, end) in sorted(loader.timings.items(), key=lambda item: item[1]):
+                print(f"  {name:<28}{(start - self.started) * 1000:>9.1f}{(end - self.started) * 1000:>9.1f}"
+                      f"  ({(end - start) * 1000:.1f})", file=out)
+        direct, heaviest, total = import_breakdown(module)
+        print(f"imports of {module} (cumulative ms, fresh interpreter; total {total / 1000:.1f})", file=out)
+        for name, _, cumulative in direct[:12]:
+            print(f"  {name:<28}{cumulative / 1000:>9.1f}", file=out)
+        print("slowest single modules (self ms)", file=out)
+        for name, self_us, _ in heaviest[:8]:
+            print(f"  {name:<44}{self_us / 1000:>9.1f}", file=out)
+
+
+def import_breakdown(module):
+    """Import times of module, measured with -X importtime in a fresh interpreter.
+
+    Returns (direct imports by cumulative time, every module by self time,
+    total microseconds), each entry (name, self_us, cumulative_us).
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    children, every, total = [], [], 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entry = (name.strip(), int(self_us), int(cumulative))
+        every.append(entry)
+        # Nested imports are listed before the module that imported them
+        if depth == 1:
+            children.append(entry)
+        elif depth == 0:
+            if entry[0] == module:
+                total = entry[2]
+                break
+            children = []
+    return (sorted(children, key=lambda e: e[2], reverse=True),
+            sorted(every, key=lambda e: e[1], reverse=True), total)
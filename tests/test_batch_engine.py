@@ -0,0 +1,34 @@
+import pytest
+
+from controllers import GreedyController
+from engine import GameEngine, DIRECTIONS, SNAKE_SIZE
+from game_settings import Difficulty, GameMode
+
+np = pytest.importorskip("numpy")
+from batch_engine import BatchEngine, CAUSES, NO_ACTION  # noqa: E402  (needs NumPy)
+
+
+def copy_food(batch, engine):
+    """The two engines draw food from different RNGs, so the batch game is given the engine's food"""
+    batch.food_row[0] = engine.food.pos[1] // SNAKE_SIZE
+    batch.food_col[0] = engine.food.pos[0] // SNAKE_SIZE
+
+
+@pytest.mark.parametrize("gamemode", [GameMode.CLASSIC, GameMode.MODERN])
+def test_step_parity_with_game_engine(gamemode):
+    engine = GameEngine(Difficulty.LEVEL_5, gamemode, seed=3)
+    batch = BatchEngine(1, gamemode, seed=3)
+    copy_food(batch, engine)
+    controller = GreedyController()
+    while not engine.state.game_over and engine.state.tick < 3000:
+        action = controller.act(engine)
+        state = engine.step(action)
+        batch.step(np.array([NO_ACTION if action is None else DIRECTIONS.index(action)], dtype=np.int8))
+
+        assert (bool(batch.game_over[0]), int(batch.score[0]), CAUSES[batch.death_cause[0]]) == \
+            (state.game_over, state.score, state.death_cause)
+        assert bool(batch.ate_food[0]) == state.ate_food
+        if state.death_cause != "wall":  # the engine keeps an off-board head, the batch doesn't move it
+            assert batch.body_cells(0) == [(y // SNAKE_SIZE, x // SNAKE_SIZE) for x, y in engine.snake.body]
+        copy_food(batch, engine)
+    assert engine.state.score > 0
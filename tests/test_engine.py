@@ -0,0 +1,21 @@
+import pygame
+
+from engine import GameEngine
+from game_settings import Difficulty, GameMode
+from obstacles import Portal
+
+
+def test_level_change_moves_food_off_new_walls():
+    engine = GameEngine(Difficulty.LEVEL_1, GameMode.CAMPAIGN, seed=0)
+    engine.reset(level=3, seed=0)
+    snake, food, levels = engine.snake, engine.food, engine.level_manager
+    # Level 4 has a wall at (60, 450); food at (60, 440) sits on it, and the portal is the next cell ahead
+    food.pos = [60, 440]
+    levels.portal = Portal(snake.pos[0] + engine.snake_size, snake.pos[1], engine.snake_size)
+    levels.portal.activate()
+
+    state = engine.step()
+
+    assert state.level_advanced and levels.current_level == 4
+    food_rect = pygame.Rect(food.pos[0], food.pos[1], engine.food_size, engine.food_size)
+    assert not any(food_rect.colliderect(obs.rect) for obs in levels.obstacles)
@@ -0,0 +1,49 @@
+import random
+
+from food import Food
+
+
+def make_food(width, height):
+    return Food(width, height, 20, 40, None, random.Random(0))
+
+
+def check_index(food):
+    """free holds exactly the unblocked slots, and where points back into it"""
+    assert sorted(food.free) == [s for s in food.all_slots if food.blocked[s] == 0]
+    for i, slot in enumerate(food.free):
+        assert food.where[slot] == i
+    assert all(food.where[s] == -1 for s in food.all_slots if food.blocked[s])
+
+
+def test_block_and_unblock_swap_remove():
+    food = make_food(120, 120)  # 4x4 slots, each 2x2 cells
+    food.block(0, 0, 20, 20)  # only slot 0 covers the top-left cell
+    assert list(food.blocked[:2]) == [1, 0] and len(food.free) == 15
+    check_index(food)
+    food.block(40, 40, 20, 20)  # slots (1..2, 1..2)
+    food.block(40, 40, 20, 20)
+    assert food.blocked[1 * 4 + 1] == 2
+    check_index(food)
+    food.unblock(40, 40, 20, 20)
+    assert len(food.free) == 11  # still blocked once
+    food.unblock(40, 40, 20, 20)
+    food.unblock(0, 0, 20, 20)
+    assert sorted(food.free) == list(range(16))
+    check_index(food)
+
+
+def test_respawn_only_picks_free_slots():
+    food = make_food(120, 120)
+    food.block(0, 0, 120, 60)  # the top three rows of cells cover slot rows 0..2
+    for _ in range(50):
+        assert food.respawn()
+        assert food.pos[1] == 60 and not food.is_blocked()
+
+
+def test_respawn_on_full_board():
+    food = make_food(80, 80)
+    food.block(0, 0, 80, 80)
+    assert not food.free
+    assert food.respawn() is False and food.spawn is False
+    food.unblock(0, 0, 80, 80)
+    assert food.respawn() and food.spawn
@@ -0,0 +1,36 @@
+from input_queue import CAPACITY, InputQueue
+
+
+def test_capacity():
+    queue = InputQueue()
+    assert CAPACITY == 3
+    assert queue.push("UP", "RIGHT", now=0)
+    assert queue.push("LEFT", "RIGHT", now=1)
+    assert queue.push("DOWN", "RIGHT", now=2)
+    assert not queue.push("RIGHT", "RIGHT", now=3)  # full
+    assert [turn for turn, _ in queue.turns] == ["UP", "LEFT", "DOWN"]
+
+
+def test_checked_against_last_queued_turn():
+    queue = InputQueue()
+    assert not queue.push("LEFT", "RIGHT", now=0)  # reverses the heading
+    assert not queue.push("RIGHT", "RIGHT", now=0)  # already heading that way
+    assert queue.push("UP", "RIGHT", now=0)
+    # LEFT reverses the heading but not the queued UP, so it is kept; DOWN reverses UP
+    assert not queue.push("DOWN", "RIGHT", now=1)
+    assert not queue.push("UP", "RIGHT", now=1)
+    assert queue.push("LEFT", "RIGHT", now=1)
+
+
+def test_one_turn_per_tick():
+    queue = InputQueue()
+    queue.push("UP", "RIGHT", now=1_000_000)
+    queue.push("LEFT", "RIGHT", now=2_000_000)
+    assert queue.pop(now=5_000_000) == "UP"
+    assert queue.pop(now=9_000_000) == "LEFT"
+    assert queue.pop(now=10_000_000) is None  # nothing queued: keep going straight
+    assert queue.stats() == (4.0, 5.5, 7.0, 7.0)
+
+    queue.push("DOWN", "LEFT", now=0)
+    queue.clear()
+    assert queue.pop() is None
@@ -0,0 +1,60 @@
+import json
+
+from game_settings import Difficulty, GameMode
+from leaderboard import Leaderboard
+
+
+def make_board(tmp_path, legacy=None):
+    legacy_file = tmp_path / "leaderboard.json"
+    if legacy is not None:
+        legacy_file.write_text(json.dumps(legacy))
+    return Leaderboard(str(tmp_path / "scores.db"), str(legacy_file))
+
+
+def test_rank_ties_share_a_rank(tmp_path):
+    board = make_board(tmp_path)
+    board.add_scores([(s, Difficulty.LEVEL_3, GameMode.CLASSIC) for s in (50, 40, 40, 30)])
+    board.add_score(90, Difficulty.LEVEL_3, GameMode.MODERN)
+    assert [board.get_rank(s, GameMode.CLASSIC) for s in (60, 50, 40, 35, 30)] == [1, 1, 2, 4, 4]
+    assert board.get_rank(40) == 3  # the MODERN 90 counts without a filter
+    assert board.get_rank(40, GameMode.CLASSIC, Difficulty.LEVEL_5) == 1
+    top = board.get_top_scores(3, GameMode.CLASSIC)
+    assert [e["score"] for e in top] == [50, 40, 40]
+    board.close()
+
+
+def test_legacy_json_is_imported_once(tmp_path):
+    legacy = [
+        {"score": 12, "difficulty": "LEVEL_2", "gamemode": GameMode.CLASSIC.value, "date": "2023-01-02 03:04:05"},
+        {"score": "7", "difficulty": "LEVEL_4", "gamemode": GameMode.MODERN.value, "date": "2023-02-03 04:05:06"},
+    ]
+    board = make_board(tmp_path, legacy)
+    assert board.count() == 2
+    assert board.get_top_scores()[0] == {"score": 12, "difficulty": "LEVEL_2",
+                                         "gamemode": GameMode.CLASSIC.value, "date": "2023-01-02 03:04:05"}
+    assert board.count(GameMode.MODERN, Difficulty.LEVEL_4) == 1
+    board.close()
+
+    board = make_board(tmp_path, legacy)  # already migrated: not imported again
+    assert board.count() == 2
+    board.close()
+
+
+def test_broken_legacy_json_is_skipped(tmp_path):
+    (tmp_path / "leaderboard.json").write_text("{not json")
+    board = make_board(tmp_path)
+    assert board.count() == 0
+    board.close()
+
+
+def test_queries_use_the_indexes(tmp_path):
+    board = make_board(tmp_path)
+
+    def plan(sql, params):
+        return " ".join(row[-1] for row in board.db.execute("EXPLAIN QUERY PLAN " + sql, params))
+    assert "scores_by_mode_difficulty" in plan(
+        "SELECT score FROM scores WHERE gamemode = ? AND difficulty = ? ORDER BY score DESC, id LIMIT 10",
+        [GameMode.CLASSIC.value, "LEVEL_3"])
+    assert "scores_by_mode" in plan("SELECT COUNT(*) FROM scores WHERE gamemode = ? AND score > ?", [GameMode.CLASSIC.value, 5])
+    assert "USING COVERING INDEX scores_by_score" in plan("SELECT COUNT(*) FROM scores WHERE score > ?", [5])
+    board.close()
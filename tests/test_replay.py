@@ -0,0 +1,59 @@
+import pytest
+
+from controllers import GreedyController
+from engine import GameEngine, SNAKE_SIZE, BOARD_WIDTH, BOARD_HEIGHT
+from game_settings import Difficulty, GameMode
+from main import parse_args
+from replay import (HEADER, HEADER_V1, MAGIC, VERSION, Replay, ReplayRecorder, read_varint,
+                    write_varint)
+
+
+def test_board_replay_round_trip():
+    args = parse_args(["--board", "100x100"])
+    width, height = args.world_cols * SNAKE_SIZE, args.world_rows * SNAKE_SIZE
+    engine = GameEngine(Difficulty.LEVEL_3, GameMode.MODERN, width, height, seed=7)
+    recorder = ReplayRecorder(engine)
+    controller = GreedyController()
+    while not engine.state.game_over and engine.state.tick < 5000:
+        recorder.step(controller.act(engine))
+    live = engine.state
+
+    replay = Replay.from_bytes(recorder.replay.to_bytes())
+    assert (replay.world_width, replay.world_height) == (width, height)
+    state = replay.play()
+    assert state.score == live.score > 0
+    assert state.tick == live.tick
+
+
+def test_varint_tick_deltas():
+    # Deltas that need one, two, three and five bytes once shifted past the direction bits
+    changes = [(1, "UP"), (33, "LEFT"), (33 + 2 ** 12, "DOWN"), (33 + 2 ** 12 + 2 ** 30, "RIGHT")]
+    replay = Replay(5, GameMode.CLASSIC, Difficulty.LEVEL_3, changes, ticks=changes[-1][0])
+    data = replay.to_bytes()
+    assert len(data) == HEADER.size + 1 + 2 + 3 + 5
+    assert Replay.from_bytes(data).changes == changes
+
+    out = bytearray()
+    write_varint(out, 2 ** 40 + 5)
+    assert read_varint(bytes(out) + b"\x07", 0) == (2 ** 40 + 5, len(out))
+
+
+def test_header_versions():
+    replay = Replay(123456, GameMode.CAMPAIGN, Difficulty.LEVEL_8, [(3, "DOWN")], ticks=40,
+                    world_width=2000, world_height=1400)
+    data = replay.to_bytes()
+    loaded = Replay.from_bytes(data)
+    assert (loaded.seed, loaded.gamemode, loaded.difficulty, loaded.ticks) == (123456, GameMode.CAMPAIGN,
+                                                                               Difficulty.LEVEL_8, 40)
+    assert (loaded.world_width, loaded.world_height) == (2000, 1400)
+
+    # A version 1 file: the same changes after the shorter header, always on the default board
+    v1 = HEADER_V1.pack(MAGIC, 1, *data[5:7], 123456, 40) + data[HEADER.size:]
+    loaded = Replay.from_bytes(v1)
+    assert (loaded.world_width, loaded.world_height) == (BOARD_WIDTH, BOARD_HEIGHT)
+    assert loaded.changes == [(3, "DOWN")] and loaded.gamemode == GameMode.CAMPAIGN
+
+    with pytest.raises(ValueError):
+        Replay.from_bytes(HEADER.pack(b"XXXX", VERSION, 0, 0, 0, 0, 0, 0))
+    with pytest.raises(ValueError):
+        Replay.from_bytes(data[:4] + bytes([VERSION + 1]) + data[5:])
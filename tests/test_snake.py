@@ -0,0 +1,60 @@
+from snake import SnakeBody, SparseSnakeBody
+
+
+def test_ring_buffer_wraps_around():
+    body = SnakeBody(60, 20, 20)  # 3 cells, so the ring has 4 slots
+    body.push_front(0, 0)
+    body.push_front(20, 0)
+    # Move right along the row and back again many times; start walks round the ring
+    xs = [40, 20, 0, 20, 40, 20, 0]
+    for x in xs:
+        body.push_front(x, 0)
+        body.pop_back()
+    assert body.capacity == 4  # seven moves have taken the head slot round the ring
+    assert list(body) == [(0, 0), (20, 0)]
+    assert body[0] == [0, 0] and body[-1] == [20, 0]
+    assert body.count(0, 0) == 1 and body.count(20, 0) == 1 and body.count(40, 0) == 0
+
+
+def test_occupancy_after_grow_and_shrink():
+    body = SnakeBody(100, 100, 20)
+    for x in (0, 20, 40):
+        body.push_front(x, 0)
+    body.push_front(40, 20)  # grow: nothing popped
+    assert len(body) == 4
+    assert [body.count(x, y) for x, y in ((0, 0), (20, 0), (40, 0), (40, 20))] == [1, 1, 1, 1]
+    assert body.pop_back() == (0, 0)
+    assert body.count(0, 0) == 0 and len(body) == 3
+    body.push_front(40, 0)  # onto its own neck: counted twice
+    assert body.count(40, 0) == 2
+    body.pop_back()
+    body.pop_back()
+    assert list(body) == [(40, 0), (40, 20)]
+    assert sum(body.grid) == 2
+
+
+def test_off_board_segments_are_not_counted():
+    body = SnakeBody(100, 100, 20)
+    body.push_front(0, 0)
+    body.push_front(-20, 0)
+    assert len(body) == 2 and body.count(-20, 0) == 0
+    body[0] = [80, 0]  # wrapped back onto the board
+    assert body.count(80, 0) == 1
+    assert sum(body.grid) == 2
+
+
+def test_sparse_body_matches_ring_buffer():
+    ring, sparse = SnakeBody(200, 200, 20), SparseSnakeBody(20)
+    moves = [(0, 0), (20, 0), (40, 0), (40, 20), (20, 20), (20, 0), (20, -20)]
+    for i, (x, y) in enumerate(moves):
+        for body in (ring, sparse):
+            body.push_front(x, y)
+            if i % 3 == 2:
+                body.pop_back()
+    assert list(ring) == list(sparse) == [(20, -20), (20, 0), (20, 20), (40, 20), (40, 0)]
+    assert sparse.count(20, 0) == ring.count(20, 0) == 1
+    # The head is off the ring's board, which doesn't count it; the sparse body has no edges
+    assert ring.count(20, -20) == 0 and sparse.count(20, -20) == 1
+    while len(sparse) > 1:
+        sparse.pop_back()
+    assert sparse.cells == {(20, -20): 1}
@@ -0,0 +1,54 @@
+from collections import OrderedDict
+import pygame
+
+MAX_TEXT_SURFACES = 512
+
+_fonts = {}
+_surfaces = OrderedDict()
+
+
+def get_font(path, size):
+    """Shared pygame Font for (path, size); fonts are only ever built once"""
+    key = (path, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.Font(path, size)
+        _fonts[key] = font
+    return font
+
+
+def render_text(font, text, color, outline_thickness=0, outline_color=(0, 0, 0)):
+    """Rendered (antialiased) text surface, cached in a size-bounded LRU.
+
+    With outline_thickness > 0 the text is stamped in outline_color at every
+    offset within that distance and the main text drawn on top.
+    """
+    key = (font, text, color, outline_thickness, outline_color)
+    surface = _surfaces.get(key)
+    if surface is not None:
+        _surfaces.move_to_end(key)
+        return surface
+
+    base = font.render(text, True, color)
+    if outline_thickness:
+        t = outline_thickness
+        outline = font.render(text, True, outline_color)
+        surface = pygame.Surface((base.get_width() + 2 * t, base.get_height() + 2 * t), pygame.SRCALPHA)
+        for dx in range(-t, t + 1):
+            for dy in range(-t, t + 1):
+                if dx != 0 or dy != 0:
+                    surface.blit(outline, (dx + t, dy + t))
+        surface.blit(base, (t, t))
+    else:
+        surface = base
+
+    _surfaces[key] = surface
+    if len(_surfaces) > MAX_TEXT_SURFACES:
+        _surfaces.popitem(last=False)
+    return surface
+
+
+def clear():
+    """Drop all cached fonts and text surfaces"""
+    _fonts.clear()
+    _surfaces.clear()